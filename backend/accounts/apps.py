@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     name = "accounts"
+
+    def ready(self):
+        # Invalidation du cache d'authentification à l'enregistrement d'un User
+        from . import authentication  # noqa: F401
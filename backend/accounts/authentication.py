@@ -0,0 +1,183 @@
+"""
+Authentification JWT avec caches.
+
+JWTAuthentication de SimpleJWT vérifie la signature du jeton puis lit
+l'utilisateur en base à chaque requête. CachedJWTAuthentication :
+
+- garde les jetons déjà vérifiés dans un LRU borné (JWT_TOKEN_CACHE_SIZE),
+  indexé par le hash du jeton. À chaque réutilisation, verify() est rejoué
+  (expiration, type, liste noire si token_blacklist est installé) : seule la
+  vérification de signature est épargnée ;
+- lit l'utilisateur dans le cache Django (AUTH_USER_CACHE_TIMEOUT secondes) :
+  id, email, is_active, is_staff, is_superuser, role. L'instance renvoyée a
+  ses autres champs différés (chargés à la demande ; save() n'écrit que les
+  champs chargés).
+
+Révocation : l'entrée d'un utilisateur est supprimée à chaque enregistrement
+(User.save : désactivation, changement de rôle...) et à sa suppression, puis
+de nouveau au commit. Seul un QuerySet.update() qui contourne les signaux
+reste visible jusqu'à l'expiration de l'entrée ; appeler invalidate_user().
+
+Cette suppression n'atteint les autres workers que si le cache est partagé
+(fichiers, Redis, Memcached, base) : avec un cache propre au processus
+(LocMemCache, le défaut), l'utilisateur est relu en base à chaque requête.
+AUTH_USER_CACHE = True / False force le choix.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, get_md5_hash_password
+
+DEFAULT_TOKEN_CACHE_SIZE = 1024
+DEFAULT_USER_CACHE_TIMEOUT = 60
+USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser", "role")
+
+
+class TokenCache:
+    """LRU borné et partagé entre threads : hash du jeton -> jeton vérifié."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            token = self.tokens.get(key)
+            if token is not None:
+                self.tokens.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        with self.lock:
+            self.tokens[key] = token
+            self.tokens.move_to_end(key)
+            while len(self.tokens) > self.max_size:
+                self.tokens.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.tokens.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+
+token_cache = TokenCache(getattr(settings, "JWT_TOKEN_CACHE_SIZE", DEFAULT_TOKEN_CACHE_SIZE))
+
+
+def user_cache_key(user_id):
+    # v2 : entrées avec la base lue ("db")
+    return f"auth:user:v2:{user_id}"
+
+
+def user_cache_enabled():
+    """AUTH_USER_CACHE, sinon vrai si le cache par défaut est partagé entre processus."""
+    enabled = getattr(settings, "AUTH_USER_CACHE", None)
+    if enabled is None:
+        enabled = not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+    return enabled
+
+
+def invalidate_user(*user_ids):
+    """Supprime l'utilisateur du cache, maintenant et au commit de la transaction."""
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    # Une requête concurrente a pu remettre l'ancienne version avant le commit
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _invalidate_saved_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        key = hashlib.sha256(raw_token).hexdigest()
+        cached = token_cache.get(key)
+        if cached is not None:
+            token = copy.copy(cached)
+            token.current_time = aware_utcnow()
+            try:
+                token.verify()
+            except TokenError:
+                token_cache.discard(key)
+            else:
+                return token
+        token = super().get_validated_token(raw_token)
+        token_cache.set(key, token)
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if user_cache_enabled():
+            key = user_cache_key(user_id)
+            entry = cache.get(key)
+            if entry is None:
+                entry = self.load_user(user_id)
+                cache.set(
+                    key,
+                    entry,
+                    getattr(settings, "AUTH_USER_CACHE_TIMEOUT", DEFAULT_USER_CACHE_TIMEOUT),
+                )
+        else:
+            entry = self.load_user(user_id)
+        if entry["values"] is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        # from_db attend les valeurs dans l'ordre des champs du modèle
+        fields = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in entry["values"]
+        ]
+        user = self.user_model.from_db(
+            entry["db"], fields, [entry["values"][name] for name in fields]
+        )
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry["revoke"]
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+    def load_user(self, user_id):
+        """
+        Entrée de cache : valeurs de USER_FIELDS par nom (None si absent), base
+        lue et, si CHECK_REVOKE_TOKEN, empreinte du mot de passe attendue dans
+        le jeton.
+        """
+        queryset = self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+        row = queryset.values_list(*USER_FIELDS, "password").first()
+        if row is None:
+            return {"values": None, "db": queryset.db, "revoke": None}
+        *values, password = row
+        revoke = get_md5_hash_password(password) if api_settings.CHECK_REVOKE_TOKEN else None
+        return {"values": dict(zip(USER_FIELDS, values)), "db": queryset.db, "revoke": revoke}
@@ -1,3 +1,86 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .authentication import CachedJWTAuthentication, token_cache, user_cache_enabled
+from .models import User
+
+
+@override_settings(AUTH_USER_CACHE=True)
+class CachedJWTAuthenticationTest(APITestCase):
+    """
+    accounts.authentication.CachedJWTAuthentication :
+    - jeton vérifié une fois, utilisateur lu une fois
+    - désactivation, changement de rôle et expiration pris en compte aussitôt
+    - cache des utilisateurs seulement si partagé entre processus
+    """
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@test.com", password="pass"
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_second_request_uses_caches(self):
+        self.assertEqual(self.client.get("/api/me/").status_code, 200)
+        with mock.patch(
+            "rest_framework_simplejwt.backends.TokenBackend.decode"
+        ) as decode, self.assertNumQueries(0):
+            resp = self.client.get("/api/me/")
+        decode.assert_not_called()
+        self.assertEqual(
+            resp.json(), {"id": self.user.id, "email": "user@test.com", "is_staff": False}
+        )
+
+    def test_user_changes_invalidate_cache(self):
+        self.client.get("/api/me/")
+        self.user.is_staff = True
+        self.user.save()
+        self.assertTrue(self.client.get("/api/me/").json()["is_staff"])
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/me/").status_code, 401)
+
+    def test_expired_token_rejected_from_cache(self):
+        self.client.get("/api/me/")
+        later = aware_utcnow() + timedelta(hours=2)
+        with mock.patch("accounts.authentication.aware_utcnow", return_value=later), \
+                mock.patch("rest_framework_simplejwt.tokens.aware_utcnow", return_value=later):
+            self.assertEqual(self.client.get("/api/me/").status_code, 401)
+
+    def test_other_fields_deferred(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        self.assertIn("username", user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "user")
+
+    @override_settings(AUTH_USER_CACHE=None)
+    def test_process_local_cache_not_used_for_users(self):
+        self.assertFalse(user_cache_enabled())
+        self.client.get("/api/me/")
+        # Désactivé par un autre worker : l'invalidation locale ne l'atteint pas
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get("/api/me/").status_code, 401)
+
+    def test_shared_cache_used_for_users(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+            with override_settings(AUTH_USER_CACHE=None, CACHES=caches):
+                self.assertTrue(user_cache_enabled())
@@ -0,0 +1,196 @@
+"""
+Écriture différée du journal d'activité.
+
+Pendant une requête (ActivityBufferMiddleware) ou une commande de gestion
+(`with activity_buffer():`), log_activity ne fait plus d'INSERT : l'entrée
+est mise en tampon puis écrite avec les autres en un seul bulk_create, suivi
+d'un seul UPDATE de Project.last_activity_at.
+
+Garanties :
+- Project.last_activity_at (validateur des GET conditionnels, core.conditional)
+  est mis à jour dès log_activity, dans la transaction du changement : l'ETag
+  du projet change même si l'écriture différée du lot échoue ;
+- une entrée créée dans une transaction n'est retenue qu'au commit de
+  celle-ci (transaction.on_commit) : un changement annulé, savepoint compris,
+  ne laisse aucune trace dans le journal ;
+- le tampon est borné (ACTIVITY_LOG_BUFFER_SIZE) : plein, il est vidé, et les
+  entrées en attente de commit au-delà de la limite sont écrites tout de
+  suite dans la transaction en cours ; les entrées d'un savepoint annulé ne
+  comptent pas dans la limite ;
+- hors tampon, ou avec ACTIVITY_LOG_SYNC = True, chaque entrée est écrite
+  immédiatement (comportement historique) ;
+- un lot est écrit dans sa propre transaction, après le commit des
+  changements qu'il décrit : en fin de requête (fail_silently), un échec est
+  journalisé et le lot perdu, plutôt que de répondre 500 pour un changement
+  déjà enregistré (qu'un nouvel essai du client dupliquerait).
+"""
+
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .events import publish_activity
+from .models import ActivityLog, Project
+
+DEFAULT_BUFFER_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+_current_buffer = ContextVar("activity_buffer", default=None)
+
+
+def touch_projects(project_ids):
+    """Met Project.last_activity_at à maintenant pour `project_ids`."""
+    Project.objects.filter(pk__in=project_ids).update(last_activity_at=timezone.now())
+
+
+def write_entries(entries, touch=True):
+    """
+    Insère les entrées, met à jour last_activity_at de leurs projets (sauf
+    touch=False : déjà fait par le tampon) et les publie sur le flux temps
+    réel après commit (core.events).
+    """
+    if not entries:
+        return
+    ActivityLog.objects.bulk_create(entries)
+    if touch:
+        touch_projects({entry.project_id for entry in entries})
+    publish_activity(entries)
+
+
+class ActivityBuffer:
+    """
+    Entrées en attente de commit (`pending`, callback on_commit par id
+    d'entrée) et prêtes à écrire (`committed`).
+    """
+
+    def __init__(self, max_size=DEFAULT_BUFFER_SIZE, fail_silently=False):
+        self.max_size = max_size
+        self.fail_silently = fail_silently
+        self.pending = {}
+        self.committed = []
+        self.closed = False
+
+    def add(self, entry):
+        # Validateur du projet mis à jour avec le changement, pas avec le lot
+        touch_projects([entry.project_id])
+        if not transaction.get_connection().in_atomic_block:
+            # Aucune transaction ouverte : ce qui attend encore un commit a été annulé
+            self.pending.clear()
+            self._commit(entry)
+            return
+        if len(self.pending) >= self.max_size:
+            self._discard_rolled_back()
+        if len(self.pending) >= self.max_size:
+            write_entries([entry], touch=False)
+        else:
+            callback = partial(self._on_commit, entry)
+            self.pending[id(entry)] = callback
+            transaction.on_commit(callback)
+
+    def _discard_rolled_back(self):
+        """
+        Retire de `pending` les entrées d'un savepoint annulé : Django a
+        abandonné leur callback on_commit, elles ne seront jamais validées.
+        """
+        live = {id(callback) for _, callback, _ in transaction.get_connection().run_on_commit}
+        self.pending = {
+            key: callback for key, callback in self.pending.items() if id(callback) in live
+        }
+
+    def _on_commit(self, entry):
+        if self.pending.pop(id(entry), None) is not None:
+            self._commit(entry)
+
+    def _commit(self, entry):
+        if self.closed:
+            # Commit survenu après la fin de la requête / commande
+            self._write([entry])
+            return
+        self.committed.append(entry)
+        if len(self.committed) >= self.max_size:
+            self.flush()
+
+    def flush(self):
+        entries, self.committed = self.committed, []
+        self._write(entries)
+
+    def _write(self, entries):
+        """Écrit des entrées dont les changements sont déjà validés."""
+        if not entries:
+            return
+        try:
+            with transaction.atomic():
+                write_entries(entries, touch=False)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            logger.exception("Journal d'activité : %d entrée(s) non écrite(s)", len(entries))
+
+    def close(self):
+        self.closed = True
+        self.flush()
+
+
+def _start_buffer(max_size, fail_silently):
+    """(tampon, jeton) d'un nouveau tampon courant ; jeton None si aucun n'est créé."""
+    current = _current_buffer.get()
+    if current is not None or getattr(settings, "ACTIVITY_LOG_SYNC", False):
+        return current, None
+    if max_size is None:
+        max_size = getattr(settings, "ACTIVITY_LOG_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)
+    buffer = ActivityBuffer(max_size, fail_silently)
+    return buffer, _current_buffer.set(buffer)
+
+
+@contextmanager
+def activity_buffer(max_size=None, fail_silently=False):
+    """
+    Active le tampon pour le bloc ; les entrées validées sont écrites à la sortie.
+
+    Imbriquable : un bloc interne réutilise le tampon englobant.
+    fail_silently : les erreurs d'écriture des entrées validées sont
+    journalisées (logger core.activity) au lieu d'être levées.
+    """
+    buffer, token = _start_buffer(max_size, fail_silently)
+    if token is None:
+        yield buffer
+        return
+    try:
+        yield buffer
+    finally:
+        _current_buffer.reset(token)
+        buffer.close()
+
+
+@asynccontextmanager
+async def async_activity_buffer(max_size=None, fail_silently=False):
+    """
+    activity_buffer pour du code async : les vues synchrones appelées dans le
+    bloc (sync_to_async) partagent le tampon, écrit à la sortie dans le thread
+    des vues synchrones, hors de la boucle d'événements.
+    """
+    buffer, token = _start_buffer(max_size, fail_silently)
+    if token is None:
+        yield buffer
+        return
+    try:
+        yield buffer
+    finally:
+        _current_buffer.reset(token)
+        await sync_to_async(buffer.close)()
+
+
+def record_activity(entry):
+    """Écrit `entry` (ActivityLog non sauvegardé) via le tampon courant, ou tout de suite."""
+    buffer = _current_buffer.get()
+    if buffer is None:
+        write_entries([entry])
+    else:
+        buffer.add(entry)
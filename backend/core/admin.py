@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ActivityLog, Comment, Project, Task
+from .models import ActivityLog, Comment, Project, Task, delete_tasks
 
 
 @admin.register(Project)
@@ -15,6 +15,10 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ("status",)
     search_fields = ("title", "project__title")
 
+    def delete_queryset(self, request, queryset):
+        # Action « supprimer la sélection » : compteurs des projets à jour
+        delete_tasks(queryset)
+
 
 @admin.register(ActivityLog)
 class ActivityLogAdmin(admin.ModelAdmin):
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = "core"
+
+    def ready(self):
+        # Mise à jour incrémentale de l'index de recherche (post_save / post_delete)
+        from . import search  # noqa: F401
@@ -0,0 +1,244 @@
+"""
+Vues asynchrones, à servir par gradely.asgi.
+
+- events_stream : flux Server-Sent Events (core.events)
+- StudentDashboardView, ProjectListView, ProjectBundleView : variantes async
+  des lectures les plus fréquentes, sous /api/async/ (mêmes réponses que les
+  vues DRF correspondantes)
+
+Les lectures indépendantes d'une requête (tableau de bord et demandes en
+attente ; projet et sections du bundle) sont lancées ensemble : chacune dans
+un thread du pool (sync_to_async, thread_sensitive=False), sur sa propre
+connexion, attendues par asyncio.gather. Le thread des vues synchrones de la
+requête les exécuterait l'une après l'autre. Chaque connexion est fermée ou
+rendue au pool en fin de lecture, selon CONN_MAX_AGE.
+
+AsyncAPIView garde le comportement des vues DRF : authentification JWT,
+permission_classes, négociation de contenu (JSON, MessagePack), erreurs ;
+GET conditionnel (core.conditional) pour le bundle.
+
+Authentification : jeton d'accès JWT dans l'en-tête Authorization ; pour le
+flux seulement, StreamToken de courte durée en ?token= (voir core.events).
+"""
+
+import asyncio
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import cached_dashboard
+from .conditional import conditional_response, project_validators
+from .events import StreamToken, broker, format_event, pending_count
+from .models import Project
+from .permissions import IsProjectOwnerOrSupervisor
+from .renderers import ORJSONRenderer
+from .serializers import ProjectSerializer
+from .views import accessible_projects, bundle_data, bundle_limits, bundle_querysets
+
+# Message de get_object_or_404, comme le bundle DRF
+NOT_FOUND = f"No {Project._meta.object_name} matches the given query."
+
+
+def stream_user(request):
+    """Utilisateur actif du StreamToken passé en ?token=, None sinon."""
+    from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+    from accounts.authentication import CachedJWTAuthentication
+
+    raw_token = request.GET.get("token")
+    if not raw_token:
+        return None
+    try:
+        user = CachedJWTAuthentication().get_user(StreamToken(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    return user if user.is_active else None
+
+
+def _json(data, status=200):
+    # Renderer JSON par défaut des vues DRF : mêmes octets que les vues synchrones
+    return HttpResponse(
+        ORJSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+async def in_worker(func, *args):
+    """func(*args) dans un thread du pool, sur la connexion de ce thread."""
+
+    def run():
+        try:
+            return func(*args)
+        finally:
+            # Fermée (CONN_MAX_AGE = 0), rendue au pool ou gardée pour le thread
+            for connection in connections.all(initialized_only=True):
+                connection.close_if_unusable_or_obsolete()
+
+    return await sync_to_async(run, thread_sensitive=False)()
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView dont le handler GET est une coroutine.
+
+    initial() (authentification, permissions, négociation de contenu) et la
+    gestion des exceptions restent ceux de DRF, exécutés dans le thread des
+    vues synchrones ; le rendu est fait par Django comme pour une vue DRF.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), handler)
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class StudentDashboardView(AsyncAPIView):
+    """
+    GET /api/async/dashboard/student : comme /api/dashboard/student, plus
+    pending_supervision_requests (demandes reçues en attente, le compteur de
+    l'en-tête), lu en même temps que le tableau de bord.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        user = request.user
+        data, pending = await asyncio.gather(
+            in_worker(cached_dashboard, user), in_worker(pending_count, user.id)
+        )
+        return Response({**data, "pending_supervision_requests": pending})
+
+
+class ProjectListView(AsyncAPIView):
+    """GET /api/async/projects/ : comme GET /api/projects/ (une requête, dans le pool)."""
+
+    permission_classes = [IsAuthenticated, IsProjectOwnerOrSupervisor]
+
+    async def get(self, request):
+        context = {"request": request, "format": self.format_kwarg, "view": self}
+
+        def load():
+            projects = accessible_projects(request.user)
+            return ProjectSerializer(projects, many=True, context=context).data
+
+        return Response(await in_worker(load))
+
+
+class ProjectBundleView(AsyncAPIView):
+    """
+    GET /api/async/projects/<id>/bundle/ : comme /api/projects/<id>/bundle/.
+
+    Validateurs du GET conditionnel d'abord (une requête, qui vérifie aussi
+    l'accès : 404 ou 304 sans autre lecture, limites validées ensuite pour
+    qu'une 400 ne révèle pas un projet invisible), puis le projet et ses
+    sections en parallèle : deux threads, les quatre sections lues à la
+    suite sur la même connexion.
+    """
+
+    permission_classes = [IsAuthenticated, IsProjectOwnerOrSupervisor]
+
+    async def get(self, request, pk):
+        validators = await in_worker(project_validators, pk, request.user)
+        if validators is None:
+            raise Http404(NOT_FOUND)
+        response, finish = conditional_response(request, validators)
+        if response is not None:
+            return finish(response)
+        limits = bundle_limits(request.query_params)
+
+        def load_project():
+            return accessible_projects(request.user).filter(pk=pk).first()
+
+        def load_sections():
+            # Une ligne de plus que la limite pour savoir s'il reste une page
+            return {
+                section: list(queryset.filter(project_id=pk)[: limits[section] + 1])
+                for section, (_, queryset) in bundle_querysets().items()
+            }
+
+        project, rows = await asyncio.gather(in_worker(load_project), in_worker(load_sections))
+        if project is None:
+            raise Http404(NOT_FOUND)
+        self.check_object_permissions(request, project)
+        context = {"request": request, "format": self.format_kwarg, "view": self}
+        data = await in_worker(bundle_data, project, rows, limits, context)
+        return finish(Response(data))
+
+
+async def events_stream(request):
+    """
+    Flux Server-Sent Events de l'utilisateur (voir core.events).
+    GET /api/events/?token=<jeton de POST /api/events/token/>
+
+    Événements : pending_count {"count"} (superviseurs), activity (entrée du
+    journal d'un de ses projets, avec "project"), reset (recharger).
+    Reprise via Last-Event-ID (ou ?last_event_id=), commentaire de maintien
+    toutes les EVENTS_HEARTBEAT secondes. Sous ASGI uniquement.
+    """
+    if not isinstance(request, ASGIRequest):
+        return _json({"detail": "Flux disponible uniquement sous ASGI."}, status=501)
+    user = await sync_to_async(stream_user)(request)
+    if user is None:
+        return _json({"detail": "Authentification requise."}, status=401)
+
+    heartbeat = getattr(settings, "EVENTS_HEARTBEAT", 15)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    subscription = broker.subscribe(user.id)
+    current_id = f"{broker.boot}-{subscription.start_seq}"
+    backlog = broker.since(last_event_id, user.id) if last_event_id else None
+    count = None
+    if user.is_staff and not backlog:
+        count = await sync_to_async(pending_count)(user.id)
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            if last_event_id and backlog is None:
+                yield format_event(current_id, "reset", {})
+            for event in backlog or ():
+                if event.seq <= subscription.start_seq:
+                    yield format_event(broker.event_id(event), event.kind, event.data)
+            if count is not None:
+                yield format_event(current_id, "pending_count", {"count": count})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    # File débordée : le client recharge
+                    yield format_event(current_id, "reset", {})
+                elif event.seq > subscription.start_seq:
+                    yield format_event(broker.event_id(event), event.kind, event.data)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
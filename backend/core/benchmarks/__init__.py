@@ -0,0 +1,8 @@
+"""
+Benchmarks de l'API core.
+
+Ce ne sont pas des tests unitaires : ils ne sont pas découverts par
+`manage.py test` (motif `bench_*.py`). Lancement :
+
+    python manage.py test core.benchmarks --pattern="bench_*.py"
+"""
@@ -0,0 +1,94 @@
+"""
+Outils communs aux benchmarks : mesure du temps, du nombre de requêtes et
+du pic mémoire.
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import CaptureQueriesContext
+
+
+@dataclass
+class Measure:
+    label: str
+    seconds: float
+    queries: int
+
+    def __str__(self):
+        return f"{self.label:<40} {self.seconds * 1000:>9.1f} ms {self.queries:>6} requêtes"
+
+
+def measure(label, func, repeat=1):
+    """Exécute `func` `repeat` fois ; renvoie le meilleur temps et le nombre de requêtes."""
+    best = None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return Measure(label, best, len(ctx.captured_queries))
+
+
+def report(title, measures):
+    print(f"\n== {title}")
+    for m in measures:
+        print(f"   {m}")
+
+
+class QueryCounter:
+    """execute_wrapper qui compte les requêtes, quel que soit le thread."""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """
+    Compte les requêtes de la connexion courante et de celles ouvertes pendant
+    le bloc (threads de sync_to_async des vues async), contrairement à
+    CaptureQueriesContext limité à la connexion du thread courant.
+    """
+    counter = QueryCounter()
+
+    def install(sender, connection, **kwargs):
+        wrappers = connection.execute_wrappers
+        wrappers[:] = [w for w in wrappers if not isinstance(w, QueryCounter)] + [counter]
+
+    connection_created.connect(install)
+    connection.ensure_connection()
+    connection.execute_wrappers.append(counter)
+    try:
+        yield counter
+    finally:
+        connection_created.disconnect(install)
+        connection.execute_wrappers.remove(counter)
+
+
+@contextmanager
+def peak_memory():
+    """Pic d'allocation Python (octets, tous threads) pendant le bloc : `.peak`."""
+
+    class Result:
+        peak = 0
+
+    result = Result()
+    tracemalloc.start()
+    try:
+        yield result
+        result.peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
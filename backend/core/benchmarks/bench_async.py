@@ -0,0 +1,105 @@
+"""
+Bundle d'un projet sous forte concurrence : vue DRF synchrone (WSGI, un
+thread par requête, pool de WSGI_THREADS) contre vue async (ASGI, une seule
+boucle, projet et sections lus en parallèle dans le pool de threads).
+
+Pour chaque niveau de concurrence : débit (requêtes/s) et latence p99.
+Toutes les réponses doivent être 200 et identiques entre les deux chemins.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.test import AsyncClient, Client
+from rest_framework.test import APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from core.models import ActivityLog, Comment, Project, Task
+
+CONCURRENCY = (50, 200, 1000)
+WSGI_THREADS = 32
+ROWS_PER_SECTION = 60
+
+
+def p99(latencies):
+    return statistics.quantiles(latencies, n=100)[98]
+
+
+def line(label, clients, elapsed, latencies):
+    return (
+        f"{label:<6} {clients:>5} clients {clients / elapsed:>9.1f} req/s "
+        f"p99 {p99(latencies) * 1000:>8.1f} ms"
+    )
+
+
+class AsyncBundleBenchmark(APITransactionTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@bench.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        Task.objects.bulk_create(
+            Task(project=self.project, title=f"Tâche {i}") for i in range(ROWS_PER_SECTION)
+        )
+        Comment.objects.bulk_create(
+            Comment(project=self.project, author=self.owner, content=f"c{i}")
+            for i in range(ROWS_PER_SECTION)
+        )
+        ActivityLog.objects.bulk_create(
+            ActivityLog(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.PROJECT_UPDATED,
+                description=f"Modification {i}",
+            )
+            for i in range(ROWS_PER_SECTION)
+        )
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.owner)}"}
+
+    def run_wsgi(self, clients):
+        url = f"/api/projects/{self.project.id}/bundle/"
+
+        # Latence vue du client : attente d'un thread libre comprise
+        def fetch(_):
+            try:
+                resp = Client().get(url, headers=self.headers)
+            finally:
+                connections.close_all()
+            return resp.status_code, time.perf_counter() - start, resp.content
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(WSGI_THREADS) as pool:
+            results = list(pool.map(fetch, range(clients)))
+        return time.perf_counter() - start, results
+
+    async def run_asgi(self, clients):
+        url = f"/api/async/projects/{self.project.id}/bundle/"
+        client = AsyncClient()
+
+        async def fetch():
+            start = time.perf_counter()
+            resp = await client.get(url, headers=self.headers)
+            return resp.status_code, time.perf_counter() - start, resp.content
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(fetch() for _ in range(clients)))
+        return time.perf_counter() - start, results
+
+    def test_bundle_concurrency(self):
+        lines = []
+        for clients in CONCURRENCY:
+            wsgi_elapsed, wsgi = self.run_wsgi(clients)
+            asgi_elapsed, asgi = asyncio.run(self.run_asgi(clients))
+            for results in (wsgi, asgi):
+                self.assertEqual({status for status, _, _ in results}, {200})
+            self.assertEqual(wsgi[0][2], asgi[0][2])
+            lines.append(line("WSGI", clients, wsgi_elapsed, [t for _, t, _ in wsgi]))
+            lines.append(line("ASGI", clients, asgi_elapsed, [t for _, t, _ in asgi]))
+
+        print(f"\n== Bundle d'un projet ({ROWS_PER_SECTION} lignes par section)")
+        for text in lines:
+            print(f"   {text}")
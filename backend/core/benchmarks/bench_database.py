@@ -0,0 +1,114 @@
+"""
+Débit d'écriture concurrent selon le profil de base (gradely.database).
+
+Chaque thread enchaîne des transactions comme celles des vues : lecture du
+projet, INSERT d'une entrée de journal puis UPDATE de
+Project.last_activity_at. On compte les
+transactions validées par seconde et les échecs "database is locked".
+
+Profils mesurés sur un fichier temporaire : sqlite-basic et sqlite.
+PostgreSQL (connexions persistantes, puis pool) si BENCH_POSTGRES=1, avec
+les variables POSTGRES_* d'une base jetable (ex. conteneur local) :
+
+    docker run --rm -e POSTGRES_PASSWORD=bench -p 5432:5432 postgres
+    BENCH_POSTGRES=1 POSTGRES_USER=postgres POSTGRES_PASSWORD=bench \\
+        python manage.py test core.benchmarks.bench_database --pattern="bench_*.py"
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import ActivityLog, Project
+from gradely.database import database_config
+
+THREADS = 8
+TRANSACTIONS_PER_THREAD = 100
+
+
+# unittest.TestCase : bases créées à part, hors de la base de test et des
+# garde-fous d'accès de Django (connexions ouvertes depuis d'autres threads)
+class DatabaseWriteBenchmark(unittest.TestCase):
+    def run_profile(self, alias, config):
+        configured = connections.configure_settings({"default": config})["default"]
+        connections.settings[alias] = configured
+        try:
+            call_command("migrate", database=alias, verbosity=0)
+            owner = User.objects.db_manager(alias).create_user(
+                username="owner", email="owner@bench.com", password="pass"
+            )
+            projects = [
+                Project.objects.using(alias).create(title=f"Projet {i}", owner=owner)
+                for i in range(THREADS)
+            ]
+            connections[alias].close()
+            return self.write_concurrently(alias, owner, projects)
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def write_concurrently(self, alias, owner, projects):
+        errors = []
+
+        def work(project):
+            try:
+                for i in range(TRANSACTIONS_PER_THREAD):
+                    try:
+                        with transaction.atomic(using=alias):
+                            Project.objects.using(alias).get(pk=project.pk)
+                            ActivityLog.objects.using(alias).create(
+                                project=project,
+                                actor=owner,
+                                action_type=ActivityLog.ActionType.PROJECT_UPDATED,
+                                description=f"Modification {i}",
+                            )
+                            Project.objects.using(alias).filter(pk=project.pk).update(
+                                last_activity_at=timezone.now()
+                            )
+                    except OperationalError as exc:
+                        errors.append(exc)
+            finally:
+                connections[alias].close()
+
+        threads = [threading.Thread(target=work, args=(project,)) for project in projects]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        written = ActivityLog.objects.using(alias).count()
+        return written / elapsed, len(errors), written
+
+    def test_write_throughput(self):
+        lines = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in ("sqlite-basic", "sqlite"):
+                env = {"DB_PROFILE": profile, "SQLITE_PATH": str(Path(directory) / profile)}
+                rate, failures, written = self.run_profile(
+                    f"bench_{profile}", database_config(env)
+                )
+                lines.append((profile, rate, failures))
+                self.assertEqual(written + failures, THREADS * TRANSACTIONS_PER_THREAD)
+                if profile == "sqlite":
+                    self.assertEqual(failures, 0)
+
+        if os.environ.get("BENCH_POSTGRES"):
+            for pool in ("", "1"):
+                env = {**os.environ, "DB_PROFILE": "postgres", "DB_POOL": pool}
+                config = database_config(env)
+                rate, failures, _ = self.run_profile("bench_postgres", config)
+                lines.append(("postgres (pool)" if pool else "postgres", rate, failures))
+
+        print(f"\n== Écritures concurrentes ({THREADS} threads x {TRANSACTIONS_PER_THREAD})")
+        for profile, rate, failures in lines:
+            print(f"   {profile:<18} {rate:>9.1f} transactions/s {failures:>5} verrouillées")
@@ -0,0 +1,322 @@
+"""
+Benchmark de chaque endpoint de core.urls sur un jeu de données core.seed,
+avec budgets de requêtes et détection des régressions de temps.
+
+Pour chaque endpoint : meilleur temps sur REPEAT appels (cache vidé avant
+chaque appel, réponse en flux lue jusqu'au bout), nombre de requêtes SQL
+(threads des vues async compris) et pic mémoire Python (tracemalloc, appel
+séparé pour ne pas fausser le temps). Authentification par jeton JWT, comme
+un vrai client.
+
+Échec si :
+- un endpoint dépasse son budget de requêtes (budgets.json, "queries") ; le
+  budget ne dépend pas de l'échelle : il croît avec les données = N+1 ;
+- un endpoint est plus lent que le temps enregistré pour cette échelle
+  (budgets.json, "seconds") de plus de BENCH_THRESHOLD (défaut 0.5 = +50 %),
+  au-delà d'une marge absolue de SLACK_SECONDS contre le bruit de mesure ;
+- un endpoint n'a pas de budget, ou renvoie une erreur.
+
+Non mesuré : /api/events/ (flux SSE sans fin, ASGI seulement, voir bench_async).
+
+Variables :
+  BENCH_SCALES : échelles de core.seed.SCALES à mesurer (défaut "small"),
+      ex. BENCH_SCALES=small,medium,large
+  BENCH_THRESHOLD : régression de temps tolérée (fraction)
+  BENCH_RECORD=1 : réécrit budgets.json avec les mesures (requêtes : toutes
+      échelles ; temps : échelles mesurées) au lieu de comparer
+
+    BENCH_SCALES=small,medium python manage.py test core.benchmarks.bench_endpoints \\
+        --pattern="bench_*.py"
+
+Les temps enregistrés dépendent de la machine : les réenregistrer
+(BENCH_RECORD=1) sur la machine de référence après un changement voulu.
+"""
+
+import json
+import os
+import time
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from core.models import ActivityLog, Comment, Project, SupervisionRequest, Task
+from core.search import index_objects
+from core.seed import SCALES, seed_scale
+
+from .base import count_queries, peak_memory
+
+BUDGETS_PATH = Path(__file__).with_name("budgets.json")
+REPEAT = 3
+SLACK_SECONDS = 0.005
+
+SCALES_TO_RUN = [s.strip() for s in os.environ.get("BENCH_SCALES", "small").split(",") if s]
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.5"))
+RECORD = os.environ.get("BENCH_RECORD", "").lower() in ("1", "true", "yes", "on")
+
+# Enregistrement : maximum des échelles mesurées dans ce lancement
+recorded_queries = {}
+
+
+@dataclass
+class Endpoint:
+    """
+    Appel mesuré. `path` est un gabarit rempli avec les objets de référence
+    ({project}, {task}...) et ce que renvoie `prepare` (appelé hors mesure
+    avant chaque appel, pour les écritures non rejouables).
+    """
+
+    method: str
+    path: str
+    user: str = "student"
+    data: object = None
+    prepare: object = None
+    multipart: bool = False
+
+    @property
+    def name(self):
+        return f"{self.method} {self.path}"
+
+
+def new_task(refs):
+    return {"new_task": Task.objects.create(project_id=refs["project"], title="À supprimer").pk}
+
+
+def new_project(refs):
+    """Projet à supprimer, aussi chargé qu'un projet de l'échelle (tâches, commentaires, journal)."""
+    volumes = refs["volumes"]
+    project = Project.objects.create(owner_id=refs["student"], title="À supprimer")
+    tasks = Task.objects.bulk_create(
+        Task(project=project, title=f"Tâche {i}") for i in range(volumes["tasks_per_project"])
+    )
+    comments = Comment.objects.bulk_create(
+        Comment(project=project, author_id=refs["student"], content=f"Commentaire {i}")
+        for i in range(volumes["comments_per_project"])
+    )
+    ActivityLog.objects.bulk_create(
+        ActivityLog(
+            project=project,
+            actor_id=refs["student"],
+            task=tasks[i % len(tasks)] if tasks else None,
+            action_type=ActivityLog.ActionType.TASK_UPDATED,
+            description=f"Modification {i}",
+        )
+        for i in range(volumes["activity_per_project"])
+    )
+    index_objects(tasks + comments)
+    return {"new_project": project.pk}
+
+
+def unsupervised_project(refs):
+    return {"free_project": Project.objects.create(owner_id=refs["student"], title="Libre").pk}
+
+
+def pending_request(refs):
+    project = Project.objects.create(owner_id=refs["student"], title="En attente")
+    request = SupervisionRequest.objects.create(
+        project=project, requested_supervisor_id=refs["supervisor"]
+    )
+    return {"pending": request.pk}
+
+
+def import_file(refs):
+    lines = [{"type": "project", "ref": "p", "title": "Import"}] + [
+        {"type": "task", "project_ref": "p", "title": f"Tâche {i}", "priority": i % 5 + 1}
+        for i in range(50)
+    ]
+    content = "\n".join(json.dumps(line) for line in lines).encode()
+    return {"file": SimpleUploadedFile("import.ndjson", content)}
+
+
+def bulk_operations(refs):
+    return {
+        "operations": [
+            {"op": "create", "project": refs["project"], "title": f"Lot {i}"} for i in range(20)
+        ]
+        + [{"op": "priority", "id": task_id, "priority": 2} for task_id in refs["tasks"][:20]]
+    }
+
+
+ENDPOINTS = [
+    Endpoint("GET", "/api/me/"),
+    Endpoint("GET", "/api/users/staff/"),
+    Endpoint("GET", "/api/dashboard/student"),
+    Endpoint("GET", "/api/dashboard/student", user="supervisor"),
+    Endpoint("GET", "/api/async/dashboard/student"),
+    Endpoint("GET", "/api/projects/"),
+    Endpoint("GET", "/api/projects/", user="supervisor"),
+    Endpoint("GET", "/api/async/projects/"),
+    Endpoint("POST", "/api/projects/", data={"title": "Nouveau projet"}),
+    Endpoint("GET", "/api/projects/{project}/"),
+    Endpoint("PATCH", "/api/projects/{project}/", data={"description": "Mise à jour"}),
+    Endpoint("DELETE", "/api/projects/{new_project}/", prepare=new_project),
+    Endpoint("GET", "/api/projects/{project}/bundle/"),
+    Endpoint("GET", "/api/async/projects/{project}/bundle/"),
+    Endpoint("GET", "/api/projects/{project}/activity/"),
+    Endpoint("GET", "/api/projects/{project}/activity/export.ndjson"),
+    Endpoint("GET", "/api/projects/{project}/activity/export.csv"),
+    Endpoint("GET", "/api/projects/{project}/tasks/"),
+    Endpoint("GET", "/api/projects/{project}/tasks/export.ndjson"),
+    Endpoint("GET", "/api/projects/{project}/comments/"),
+    Endpoint("POST", "/api/projects/{project}/comments/", data=lambda refs: {
+        "project": refs["project"], "content": "Nouveau commentaire"
+    }),
+    Endpoint("GET", "/api/projects/{project}/supervision-requests/"),
+    Endpoint(
+        "POST",
+        "/api/projects/{free_project}/supervision-requests/",
+        data=lambda refs: {"requested_supervisor": refs["supervisor"], "message": "Bonjour"},
+        prepare=unsupervised_project,
+    ),
+    Endpoint("GET", "/api/tasks/"),
+    Endpoint("GET", "/api/tasks/?status=blocked&overdue=1"),
+    Endpoint("GET", "/api/tasks/", user="supervisor"),
+    Endpoint("POST", "/api/tasks/", data=lambda refs: {
+        "project": refs["project"], "title": "Nouvelle tâche"
+    }),
+    Endpoint("GET", "/api/tasks/{task}/"),
+    Endpoint("PATCH", "/api/tasks/{task}/", data={"status": "in_progress"}),
+    Endpoint("DELETE", "/api/tasks/{new_task}/", prepare=new_task),
+    Endpoint("GET", "/api/tasks/{task}/history/"),
+    Endpoint("POST", "/api/tasks/bulk/", data=bulk_operations),
+    Endpoint("GET", "/api/supervision-requests/"),
+    Endpoint("GET", "/api/supervision-requests/", user="supervisor"),
+    Endpoint("GET", "/api/supervision-requests/{request}/"),
+    Endpoint(
+        "PATCH",
+        "/api/supervision-requests/{pending}/",
+        user="supervisor",
+        data={"status": "accepted"},
+        prepare=pending_request,
+    ),
+    Endpoint("GET", "/api/supervision-requests/pending-count/", user="supervisor"),
+    Endpoint("GET", "/api/search/?q=relire"),
+    Endpoint("GET", "/api/search/?q=relire", user="supervisor"),
+    Endpoint("POST", "/api/import/", data=import_file, multipart=True),
+]
+
+
+def load_budgets():
+    if BUDGETS_PATH.exists():
+        return json.loads(BUDGETS_PATH.read_text())
+    return {"queries": {}, "seconds": {}}
+
+
+class EndpointBenchmark(APITransactionTestCase):
+    """Une méthode par échelle ; seules celles de BENCH_SCALES sont lancées."""
+
+    def references(self):
+        """Étudiant au projet supervisé le plus chargé, son superviseur, une tâche, une demande."""
+        project = (
+            Project.objects.filter(supervisor__isnull=False, owner__username__startswith="seed-")
+            .order_by("-tasks_total", "pk")
+            .first()
+        )
+        tasks = list(project.tasks.order_by("pk").values_list("pk", flat=True))
+        return {
+            "student": project.owner_id,
+            "supervisor": project.supervisor_id,
+            "project": project.pk,
+            "tasks": tasks,
+            "task": tasks[0],
+            "request": project.supervision_requests.values_list("pk", flat=True).first(),
+        }
+
+    def call(self, endpoint, refs, tokens):
+        values = dict(refs, **(endpoint.prepare(refs) if endpoint.prepare else {}))
+        data = endpoint.data(refs) if callable(endpoint.data) else endpoint.data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[endpoint.user]}")
+        method = getattr(self.client, endpoint.method.lower())
+        url = endpoint.path.format(**values)
+        kwargs = {"format": "multipart" if endpoint.multipart else "json"} if data else {}
+
+        def request():
+            resp = method(url, data, **kwargs)
+            if resp.streaming:
+                for _ in resp.streaming_content:
+                    pass
+            return resp
+
+        return request
+
+    def measure(self, endpoint, refs, tokens):
+        best = None
+        for _ in range(REPEAT):
+            request = self.call(endpoint, refs, tokens)
+            cache.clear()
+            with count_queries() as queries:
+                start = time.perf_counter()
+                resp = request()
+                elapsed = time.perf_counter() - start
+            if resp.status_code >= 400:
+                self.fail(f"{endpoint.name} ({endpoint.user}) : HTTP {resp.status_code}")
+            best = elapsed if best is None else min(best, elapsed)
+        request = self.call(endpoint, refs, tokens)
+        cache.clear()
+        with peak_memory() as memory:
+            request()
+        return best, queries.count, memory.peak
+
+    def run_scale(self, scale):
+        volumes = SCALES[scale]
+        seed_scale(**volumes)
+        refs = dict(self.references(), volumes=volumes)
+        tokens = {
+            role: str(AccessToken.for_user(User.objects.get(pk=refs[role])))
+            for role in ("student", "supervisor")
+        }
+        budgets = load_budgets()
+        seconds_budget = budgets["seconds"].get(scale, {})
+        failures = []
+        print(f"\n== Endpoints, échelle {scale} ({volumes})")
+        print(f"   {'endpoint':<66} {'ms':>8} {'requêtes':>9} {'budget':>7} {'pic Kio':>9}")
+        measured = {}
+        for endpoint in ENDPOINTS:
+            key = f"{endpoint.name} [{endpoint.user}]"
+            seconds, queries, peak = self.measure(endpoint, refs, tokens)
+            measured[key] = (seconds, queries)
+            budget = budgets["queries"].get(key)
+            print(
+                f"   {key:<66} {seconds * 1000:>8.1f} {queries:>9} "
+                f"{budget if budget is not None else '-':>7} {peak / 1024:>9.0f}"
+            )
+            if RECORD:
+                continue
+            if budget is None:
+                failures.append(f"{key} : pas de budget de requêtes (BENCH_RECORD=1)")
+            elif queries > budget:
+                failures.append(f"{key} : {queries} requêtes, budget {budget}")
+            baseline = seconds_budget.get(key)
+            if baseline is not None and seconds > baseline * (1 + THRESHOLD) + SLACK_SECONDS:
+                failures.append(
+                    f"{key} : {seconds * 1000:.1f} ms, référence {baseline * 1000:.1f} ms "
+                    f"(+{THRESHOLD:.0%} toléré)"
+                )
+
+        if RECORD:
+            for key, (_, queries) in measured.items():
+                recorded_queries[key] = max(queries, recorded_queries.get(key, 0))
+                budgets["queries"][key] = recorded_queries[key]
+            budgets["seconds"][scale] = {
+                key: round(seconds, 4) for key, (seconds, _) in measured.items()
+            }
+            BUDGETS_PATH.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+        if failures:
+            self.fail("\n".join(failures))
+
+    @unittest.skipUnless("small" in SCALES_TO_RUN, "BENCH_SCALES")
+    def test_small(self):
+        self.run_scale("small")
+
+    @unittest.skipUnless("medium" in SCALES_TO_RUN, "BENCH_SCALES")
+    def test_medium(self):
+        self.run_scale("medium")
+
+    @unittest.skipUnless("large" in SCALES_TO_RUN, "BENCH_SCALES")
+    def test_large(self):
+        self.run_scale("large")
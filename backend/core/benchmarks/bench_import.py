@@ -0,0 +1,74 @@
+"""
+Import en flux (core.importer) : 100 000 tâches.
+
+Le fichier NDJSON est produit ligne à ligne par un générateur : le pic
+mémoire mesuré (tracemalloc, hors capture des requêtes) est celui de
+l'import, pas du fichier. Il doit rester du même ordre à 10 000 et à
+40 000 tâches.
+"""
+
+import json
+import tracemalloc
+
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from core.importer import ProjectImporter, read_rows
+from core.models import ActivityLog, Project, Task
+
+from .base import measure, report
+
+TASKS_PER_PROJECT = 1000
+
+
+def ndjson_lines(projects, prefix):
+    statuses = [choice for choice, _ in Task.Status.choices]
+    for p in range(projects):
+        ref = f"{prefix}{p}"
+        yield json.dumps({"type": "project", "ref": ref, "title": f"Projet {ref}"}) + "\n"
+        for t in range(TASKS_PER_PROJECT):
+            yield json.dumps(
+                {
+                    "type": "task",
+                    "project_ref": ref,
+                    "title": f"Tâche {t}",
+                    "status": statuses[t % len(statuses)],
+                    "priority": t % 5 + 1,
+                }
+            ) + "\n"
+
+
+class ImportBenchmark(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            username="owner", email="owner@bench.com", password="pass"
+        )
+
+    def _import(self, projects, prefix):
+        ProjectImporter(self.owner).run(read_rows(ndjson_lines(projects, prefix), "ndjson"))
+
+    def _peak_memory(self, projects, prefix):
+        tracemalloc.start()
+        try:
+            self._import(projects, prefix)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_import(self):
+        result = measure("100 000 tâches", lambda: self._import(100, "a"))
+        report("Import NDJSON (lots de 1000 lignes)", [result])
+        small_peak = self._peak_memory(10, "b")
+        large_peak = self._peak_memory(40, "c")
+        print(
+            f"   pic mémoire : {small_peak / 2**20:.1f} Mo (10k), "
+            f"{large_peak / 2**20:.1f} Mo (40k)"
+        )
+
+        self.assertEqual(Task.objects.count(), 150 * TASKS_PER_PROJECT)
+        self.assertEqual(Project.objects.filter(tasks_total=TASKS_PER_PROJECT).count(), 150)
+        # Une entrée de journal par projet, pas par tâche
+        self.assertEqual(ActivityLog.objects.count(), 150)
+        # Mémoire bornée par la taille des lots, pas par celle du fichier
+        self.assertLess(large_peak, small_peak * 1.5)
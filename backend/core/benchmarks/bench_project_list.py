@@ -0,0 +1,64 @@
+"""
+GET /api/projects/ : coût de progress_percent.
+
+Compare :
+- l'ancien calcul (deux COUNT par projet),
+- les compteurs stockés sur Project, sérialisés seuls puis par l'API
+  (chemin utilisé par ProjectViewSet).
+"""
+
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from core.models import Project, Task
+from core.serializers import ProjectSerializer
+from core.services import reconcile_project_counters
+
+from .base import measure, report
+
+PROJECTS = 200
+TASKS_PER_PROJECT = 10
+
+
+class ProjectListBenchmark(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            username="owner", email="owner@bench.com", password="pass"
+        )
+        projects = Project.objects.bulk_create(
+            Project(title=f"Projet {i}", owner=cls.owner) for i in range(PROJECTS)
+        )
+        statuses = [choice for choice, _ in Task.Status.choices]
+        Task.objects.bulk_create(
+            Task(project=p, title=f"Tâche {j}", status=statuses[j % len(statuses)])
+            for p in projects
+            for j in range(TASKS_PER_PROJECT)
+        )
+        # bulk_create ne passe pas par Task.save : compteurs recalculés en bloc
+        reconcile_project_counters()
+
+    def test_project_list(self):
+        self.client.force_authenticate(user=self.owner)
+
+        def per_row_counts():
+            for project in Project.objects.filter(owner=self.owner):
+                total = project.tasks.count()
+                done = project.tasks.filter(status=Task.Status.DONE).count()
+                _ = int(done / total * 100) if total else 0
+
+        def stored_counters():
+            ProjectSerializer(Project.objects.filter(owner=self.owner), many=True).data
+
+        def api_list():
+            resp = self.client.get("/api/projects/")
+            assert len(resp.json()) == PROJECTS
+
+        results = [
+            measure("COUNT par projet (ancien)", per_row_counts, repeat=3),
+            measure("compteurs stockés", stored_counters, repeat=3),
+            measure("GET /api/projects/ (compteurs stockés)", api_list, repeat=3),
+        ]
+        report(f"Liste de {PROJECTS} projets x {TASKS_PER_PROJECT} tâches", results)
+        self.assertEqual(results[0].queries, 1 + 2 * PROJECTS)
+        self.assertEqual(results[2].queries, 1)
@@ -0,0 +1,75 @@
+"""
+Encodage des réponses : JSONRenderer de DRF, ORJSONRenderer et
+MessagePackRenderer (si msgpack est installé) — temps d'encodage et taille.
+
+Deux charges :
+- 5 000 tâches sérialisées (TaskSerializer : dates déjà en chaînes),
+- 5 000 lignes values() du journal (datetimes, dict metadata) comme celles
+  du tableau de bord.
+"""
+
+from importlib.util import find_spec
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from core.models import ActivityLog, Project, Task
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.serializers import TaskSerializer
+
+from .base import measure
+
+ROWS = 5_000
+
+
+class RendererBenchmark(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(
+            username="owner", email="owner@bench.com", password="pass"
+        )
+        cls.project = Project.objects.create(title="Projet", owner=owner)
+        now = timezone.now()
+        Task.objects.bulk_create(
+            Task(
+                project=cls.project,
+                title=f"Tâche {i}",
+                description="Rédiger la section « méthodes »",
+                due_date=now.date(),
+            )
+            for i in range(ROWS)
+        )
+        ActivityLog.objects.bulk_create(
+            ActivityLog(
+                project=cls.project,
+                actor=owner,
+                action_type=ActivityLog.ActionType.TASK_UPDATED,
+                description=f"Tâche {i} modifiée",
+                metadata={"task_id": i},
+                created_at=now,
+            )
+            for i in range(ROWS)
+        )
+
+    def test_encode(self):
+        payloads = {
+            "tâches": TaskSerializer(Task.objects.all(), many=True).data,
+            "journal": list(ActivityLog.objects.values()),
+        }
+        renderers = [("DRF JSON", JSONRenderer()), ("orjson", ORJSONRenderer())]
+        if find_spec("msgpack"):
+            renderers.append(("MessagePack", MessagePackRenderer()))
+
+        print(f"\n== Encodage de {ROWS} lignes")
+        for label, data in payloads.items():
+            for name, renderer in renderers:
+                sizes = []
+                result = measure(
+                    f"{label} : {name}",
+                    lambda: sizes.append(len(renderer.render(data))),
+                    repeat=5,
+                )
+                print(f"   {result}  {sizes[-1] / 1024:>8.1f} Kio")
+            self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,108 @@
+"""
+Sérialisation de listes de 10 000 lignes : serializers DRF (instances de
+modèle + champs DRF) contre core.rows (values_list + dict), rendu JSON compris.
+
+Journal d'activité, commentaires et demandes de supervision d'un même projet.
+"""
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accounts.models import User
+from core.models import ActivityLog, Comment, Project, SupervisionRequest
+from core.rows import ActivityLogRows, CommentRows, SupervisionRequestRows
+from core.serializers import (
+    ActivityLogSerializer,
+    CommentSerializer,
+    SupervisionRequestSerializer,
+)
+
+from .base import measure, report
+
+ROWS = 10_000
+
+
+class RowSerializationBenchmark(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            username="owner", email="owner@bench.com", password="pass"
+        )
+        supervisor = User.objects.create_user(
+            username="prof", email="prof@bench.com", password="pass", is_staff=True
+        )
+        cls.project = Project.objects.create(title="Projet", owner=cls.owner)
+        now = timezone.now()
+        ActivityLog.objects.bulk_create(
+            ActivityLog(
+                project=cls.project,
+                actor=cls.owner,
+                action_type=ActivityLog.ActionType.TASK_UPDATED,
+                description=f"Tâche {i} modifiée",
+                metadata={"task_id": i},
+                created_at=now,
+            )
+            for i in range(ROWS)
+        )
+        Comment.objects.bulk_create(
+            Comment(project=cls.project, author=cls.owner, content=f"Commentaire {i}")
+            for i in range(ROWS)
+        )
+        SupervisionRequest.objects.bulk_create(
+            # Une seule demande en attente par projet et superviseur
+            SupervisionRequest(
+                project=cls.project,
+                requested_supervisor=supervisor,
+                message=f"Demande {i}",
+                status=SupervisionRequest.Status.DECLINED,
+                responded_at=now if i % 2 else None,
+            )
+            for i in range(ROWS)
+        )
+
+    def test_list_serialization(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.owner
+        context = {"request": request}
+        renderer = JSONRenderer()
+        cases = [
+            (
+                "journal",
+                ActivityLog.objects.filter(project=self.project).select_related("actor"),
+                ActivityLogSerializer,
+                ActivityLogRows,
+            ),
+            (
+                "commentaires",
+                Comment.objects.filter(project=self.project).select_related("author"),
+                CommentSerializer,
+                CommentRows,
+            ),
+            (
+                "demandes",
+                SupervisionRequest.objects.filter(project=self.project).select_related(
+                    "project", "project__owner", "requested_supervisor"
+                ),
+                SupervisionRequestSerializer,
+                SupervisionRequestRows,
+            ),
+        ]
+        results = []
+        for label, queryset, serializer_class, rows_class in cases:
+            queryset = queryset.order_by("-created_at", "-id")
+            outputs = {}
+
+            def drf():
+                data = serializer_class(queryset.all(), many=True, context=context).data
+                outputs["drf"] = renderer.render(data)
+
+            def rows():
+                serializer = rows_class(context=context)
+                outputs["rows"] = renderer.render(serializer.data(serializer.rows(queryset)))
+
+            results.append(measure(f"{label} : serializer DRF", drf, repeat=3))
+            results.append(measure(f"{label} : core.rows", rows, repeat=3))
+            self.assertEqual(outputs["drf"], outputs["rows"])
+            self.assertEqual(results[-1].queries, 1)
+        report(f"Sérialisation de {ROWS} lignes", results)
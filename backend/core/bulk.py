@@ -0,0 +1,185 @@
+"""
+Opérations en lot sur les tâches (POST /api/tasks/bulk/).
+
+Corps de requête :
+    {"operations": [
+        {"op": "create", "project": 1, "title": "...", "status": "todo", ...},
+        {"op": "status", "id": 12, "status": "done"},
+        {"op": "priority", "id": 13, "priority": 1},
+        {"op": "delete", "id": 14}
+    ]}
+
+Tout est validé avant d'écrire : si une opération est invalide, aucune n'est
+appliquée et les erreurs sont renvoyées par élément. Sinon tout est écrit
+dans une transaction, avec un nombre de requêtes qui ne dépend pas du nombre
+d'opérations :
+- 1 requête pour charger (et verrouiller) les tâches visées, 1 pour l'accès aux projets
+  (une fois par projet distinct, pas par tâche)
+- bulk_create / bulk_update / delete des tâches (+ index de recherche des
+  tâches créées, bulk_create n'émet pas post_save)
+- 1 UPDATE des compteurs par projet (update_task_counters_many)
+- le journal d'activité en un seul bulk_create
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from .activity import write_entries
+from .cache import bump_dashboard_version
+from .membership import ProjectMembership
+from .models import ActivityLog, Task, update_task_counters_many
+from .search import index_objects
+from .serializers import BulkTaskCreateSerializer, BulkTaskOperationSerializer
+
+MAX_OPERATIONS = 500
+
+# Champs modifiables par les opérations status / priority
+UPDATED_FIELDS = ["status", "blocked_since", "priority", "updated_at"]
+
+
+class BulkOperationError(Exception):
+    """Au moins une opération invalide : `errors` = [{"index": i, "errors": {...}}]."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _parse(operations):
+    """Valide chaque opération avec les serializers ; renvoie (opérations, erreurs)."""
+    parsed, errors = [], {}
+    for index, item in enumerate(operations):
+        if not isinstance(item, dict):
+            errors[index] = {"non_field_errors": ["Objet attendu."]}
+            continue
+        serializer = BulkTaskOperationSerializer(data=item)
+        if not serializer.is_valid():
+            errors[index] = serializer.errors
+            continue
+        attrs = dict(serializer.validated_data)
+        if attrs["op"] == "create":
+            create = BulkTaskCreateSerializer(
+                data={key: value for key, value in item.items() if key != "op"}
+            )
+            if not create.is_valid():
+                errors[index] = create.errors
+                continue
+            attrs = {"op": "create", **create.validated_data}
+        parsed.append((index, attrs))
+    return parsed, errors
+
+
+def apply_task_operations(user, operations, membership=None):
+    """
+    Applique `operations` pour `user` (owner ou superviseur des projets visés).
+    `membership` : ProjectMembership de `user` à réutiliser (celle de la requête).
+
+    Returns:
+        [{"index": i, "op": op, "id": task_id}, ...] dans l'ordre des opérations
+
+    Raises:
+        BulkOperationError si une opération est invalide (rien n'est écrit)
+    """
+    parsed, errors = _parse(operations)
+    with transaction.atomic():
+        return _apply(user, parsed, errors, membership)
+
+
+def _apply(user, parsed, errors, membership):
+    """
+    Corps de apply_task_operations, dans sa transaction : les tâches visées
+    sont verrouillées (select_for_update) jusqu'au COMMIT, leurs statuts lus
+    servent aux deltas des compteurs.
+    """
+    tasks = Task.objects.select_for_update().in_bulk(
+        {attrs["id"] for _, attrs in parsed if attrs["op"] != "create"}
+    )
+    project_ids = {task.project_id for task in tasks.values()} | {
+        attrs["project"] for _, attrs in parsed if attrs["op"] == "create"
+    }
+    membership = membership or ProjectMembership(user)
+    members = membership.member_projects(project_ids)
+
+    deleted_ids = set()
+    for index, attrs in parsed:
+        if attrs["op"] == "create":
+            if attrs["project"] not in members:
+                errors[index] = {"project": ["Projet introuvable ou accès refusé."]}
+            continue
+        task = tasks.get(attrs["id"])
+        if task is None or task.project_id not in members:
+            errors[index] = {"id": ["Tâche introuvable."]}
+        elif task.pk in deleted_ids:
+            errors[index] = {"id": ["Tâche supprimée par une opération précédente."]}
+        elif attrs["op"] == "delete":
+            deleted_ids.add(task.pk)
+    if errors:
+        raise BulkOperationError(
+            [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+        )
+
+    now = timezone.now()
+    counted = {pk: (task.project_id, task.status) for pk, task in tasks.items()}
+    created, updated, deleted = [], {}, {}
+    applied = []  # (index, op, tâche)
+    for index, attrs in parsed:
+        op = attrs.pop("op")
+        if op == "create":
+            status = attrs.pop("status", Task.Status.TODO)
+            task = Task(project_id=attrs.pop("project"), **attrs)
+            # Même règle que Task.set_status (blocked_since)
+            task.set_status(status, save=False)
+            created.append(task)
+        else:
+            task = tasks[attrs["id"]]
+            if op == "delete":
+                deleted[task.pk] = task
+                updated.pop(task.pk, None)
+            else:
+                if op == "status":
+                    task.set_status(attrs["status"], save=False)
+                else:
+                    task.priority = attrs["priority"]
+                task.updated_at = now
+                updated[task.pk] = task
+        applied.append((index, op, task))
+
+    Task.objects.bulk_create(created)
+    index_objects(created)
+    if updated:
+        Task.objects.bulk_update(updated.values(), UPDATED_FIELDS)
+    if deleted:
+        Task.objects.filter(pk__in=deleted).delete()
+    update_task_counters_many(
+        [(None, (task.project_id, task.status)) for task in created]
+        + [(counted[pk], (task.project_id, task.status)) for pk, task in updated.items()]
+        + [(counted[pk], None) for pk in deleted]
+    )
+    # Même journal que TaskViewSet : création / modification, rien à la suppression
+    write_entries(
+        [
+            ActivityLog(
+                project_id=task.project_id,
+                actor=user,
+                task=task,
+                action_type=(
+                    ActivityLog.ActionType.TASK_CREATED
+                    if op == "create"
+                    else ActivityLog.ActionType.TASK_UPDATED
+                ),
+                description=(
+                    f"Tâche « {task.title} » {'créée' if op == 'create' else 'modifiée'}"
+                ),
+                metadata={"task_id": task.pk},
+            )
+            for _, op, task in applied
+            # Rien non plus pour une tâche supprimée plus loin dans le lot
+            if task.pk not in deleted
+        ]
+    )
+    touched = {task.project_id for _, _, task in applied}
+    bump_dashboard_version(
+        *(user_id for pk in touched for user_id in membership.members(pk))
+    )
+
+    return [{"index": index, "op": op, "id": task.pk} for index, op, task in applied]
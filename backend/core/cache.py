@@ -0,0 +1,110 @@
+"""
+Cache du tableau de bord, par utilisateur.
+
+La réponse de /api/dashboard/student est mise en cache sous une clé
+versionnée : dashboard:<user_id>:<version>:<date>. La version est un jeton
+aléatoire remplacé (bump_dashboard_version) à chaque écriture visible par
+l'utilisateur — log_activity le fait pour le propriétaire et le superviseur
+du projet. L'ancienne entrée n'est jamais relue ; elle expire d'elle-même.
+
+Une copie périmée (dashboard:<user_id>:stale) est gardée plus longtemps :
+- si un rafraîchissement est déjà en cours pour cet utilisateur, elle est
+  servie au lieu de relancer le calcul ;
+- si la base est lente ou verrouillée (OperationalError), elle est servie
+  au lieu d'une erreur.
+
+N'utilise que get / set / add / delete : fonctionne avec les backends
+mémoire locale et fichiers de Django, sans Redis.
+"""
+
+from datetime import date
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, transaction
+
+from .dashboard import build_dashboard
+
+# Durées par défaut (secondes), surchargées par les settings du même nom
+DASHBOARD_CACHE_TIMEOUT = 300
+DASHBOARD_STALE_TIMEOUT = 3600
+DASHBOARD_REFRESH_LOCK_TIMEOUT = 30
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _version_key(user_id):
+    return f"dashboard:{user_id}:version"
+
+
+def _stale_key(user_id):
+    return f"dashboard:{user_id}:stale"
+
+
+def _lock_key(user_id):
+    return f"dashboard:{user_id}:refresh"
+
+
+def dashboard_version(user_id):
+    """Version courante du tableau de bord de l'utilisateur (créée si absente)."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), uuid4().hex, timeout=None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def bump_dashboard_version(*user_ids):
+    """
+    Invalide le tableau de bord des utilisateurs donnés.
+
+    Appliqué au commit de la transaction en cours (immédiatement hors
+    transaction) : un calcul concurrent ne peut pas remettre en cache l'état
+    d'avant sous la nouvelle version, et un rollback n'invalide rien.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+
+    def bump():
+        cache.set_many({_version_key(user_id): uuid4().hex for user_id in user_ids}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def cached_dashboard(user, today=None):
+    """build_dashboard(user) mis en cache, avec repli sur la copie périmée."""
+    today = today or date.today()
+    key = f"dashboard:{user.id}:{dashboard_version(user.id)}:{today.isoformat()}"
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    stale = cache.get(_stale_key(user.id))
+    if stale is not None:
+        lock_timeout = _setting("DASHBOARD_REFRESH_LOCK_TIMEOUT", DASHBOARD_REFRESH_LOCK_TIMEOUT)
+        if not cache.add(_lock_key(user.id), True, timeout=lock_timeout):
+            # Rafraîchissement déjà lancé par une autre requête
+            return stale
+
+    try:
+        data = build_dashboard(user, today)
+    except OperationalError:
+        # Base verrouillée ou indisponible : mieux vaut des chiffres un peu anciens
+        if stale is None:
+            raise
+        return stale
+    finally:
+        if stale is not None:
+            cache.delete(_lock_key(user.id))
+
+    cache.set(key, data, timeout=_setting("DASHBOARD_CACHE_TIMEOUT", DASHBOARD_CACHE_TIMEOUT))
+    cache.set(
+        _stale_key(user.id),
+        data,
+        timeout=_setting("DASHBOARD_STALE_TIMEOUT", DASHBOARD_STALE_TIMEOUT),
+    )
+    return data
@@ -0,0 +1,112 @@
+"""
+GET conditionnels (ETag / Last-Modified) sur les lectures liées à un projet.
+
+Les validateurs d'un projet sont lus en une seule requête indexée :
+- Project.updated_at (modification du projet)
+- Project.last_activity_at (tâches créées / modifiées / supprimées, activité)
+- MAX(ActivityLog.id) du projet (commentaires, demandes de supervision...)
+- MAX(Task.updated_at) du projet
+
+Si If-None-Match / If-Modified-Since correspondent, la vue renvoie 304 sans
+rien charger ni sérialiser. L'ETag fait foi : Last-Modified n'a qu'une
+précision à la seconde et n'est évalué qu'en l'absence d'If-None-Match.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.db.models import Max, OuterRef, Q, Subquery
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import ActivityLog, Project, Task
+
+
+def project_validators(project_id, user):
+    """
+    (updated_at, last_activity_at, max activity id, max task updated_at)
+    du projet, ou None si le projet n'existe pas ou n'est pas accessible à `user`.
+    """
+
+    def latest(model, field):
+        return Subquery(
+            model.objects.filter(project=OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(latest=Max(field))
+            .values("latest")
+        )
+
+    return (
+        Project.objects.filter(pk=project_id)
+        .filter(Q(owner=user) | Q(supervisor=user))
+        .values_list(
+            "updated_at",
+            "last_activity_at",
+            latest(ActivityLog, "id"),
+            latest(Task, "updated_at"),
+        )
+        .first()
+    )
+
+
+def make_etag(request, validators):
+    """ETag propre à l'utilisateur, à l'URL (filtres, curseur) et au format demandé."""
+    key = "|".join(
+        str(part)
+        for part in (
+            request.user.id,
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            *validators,
+        )
+    )
+    return '"%s"' % hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_response(request, validators):
+    """
+    (réponse 304 ou None, finish) pour les validateurs d'un projet ;
+    finish(response) ajoute ETag, Last-Modified et Vary aux réponses 200 / 304.
+    """
+    etag = make_etag(request, validators)
+    timestamps = [value for value in (validators[0], validators[1], validators[3]) if value]
+    last_modified = timegm(max(timestamps).utctimetuple())
+
+    def finish(response):
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            response.headers["Cache-Control"] = "private, no-cache"
+            patch_vary_headers(response, ["Authorization", "Accept"])
+        return response
+
+    return get_conditional_response(request, etag=etag, last_modified=last_modified), finish
+
+
+class ProjectConditionalGetMixin:
+    """
+    Ajoute ETag / Last-Modified aux lectures d'un ViewSet lié à un projet.
+
+    `conditional_project_kwarg` désigne le kwarg d'URL portant l'id du projet ;
+    get_conditional_project_id() peut être surchargée (ex. ?project=).
+    """
+
+    conditional_project_kwarg = "project_pk"
+
+    def get_conditional_project_id(self):
+        return self.kwargs.get(self.conditional_project_kwarg)
+
+    def conditional_get(self, request, handler, *args, **kwargs):
+        project_id = self.get_conditional_project_id()
+        validators = None
+        if project_id is not None:
+            validators = project_validators(project_id, request.user)
+        if validators is None:
+            # Projet introuvable ou inaccessible : la vue gère la réponse
+            return handler(request, *args, **kwargs)
+
+        response, finish = conditional_response(request, validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return finish(response)
@@ -0,0 +1,198 @@
+"""
+Agrégation du tableau de bord.
+
+Toutes les statistiques (résumé, compteurs par projet, progression, nudges)
+sont calculées à partir d'une seule requête groupée sur les projets de
+l'utilisateur : les compteurs stockés sur Project (tasks_total, tasks_done...)
+sont lus tels quels, seuls les compteurs dépendant de la date (retard,
+blocage ancien) sont des agrégats conditionnels sur les tâches.
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, compute_progress
+
+# Constantes pour le dashboard (évite les typos)
+PROJECT_ACTIVE = "active"
+TASK_TODO = "todo"
+TASK_DONE = "done"
+TASK_BLOCKED = "blocked"
+
+# Compteurs par projet sommés pour obtenir le résumé global
+SUMMED_COUNTERS = (
+    "tasks_total",
+    "tasks_overdue",
+    "tasks_blocked",
+    "tasks_blocked_stale",
+    "tasks_in_progress",
+    "tasks_high_priority_todo",
+)
+
+
+def project_task_stats(user, today, blocked_before):
+    """
+    Projets accessibles (owner ou superviseur) avec leurs compteurs de tâches.
+
+    Une seule requête : LEFT JOIN sur les tâches + GROUP BY projet pour les
+    compteurs dépendant de la date, les autres sont des colonnes de Project.
+    Les projets ne sont pas dupliqués car le filtre d'accès ne joint aucune table.
+    """
+    return (
+        Project.objects.filter(Q(owner=user) | Q(supervisor=user))
+        .annotate(
+            tasks_overdue=Count(
+                "tasks",
+                filter=Q(tasks__due_date__lt=today) & ~Q(tasks__status=TASK_DONE),
+            ),
+            tasks_blocked_stale=Count(
+                "tasks",
+                filter=Q(
+                    tasks__status=TASK_BLOCKED,
+                    tasks__blocked_since__isnull=False,
+                    tasks__blocked_since__lte=blocked_before,
+                ),
+            ),
+            tasks_high_priority_todo=Count(
+                "tasks", filter=Q(tasks__status=TASK_TODO, tasks__priority__lte=2)
+            ),
+        )
+        .values(
+            "id",
+            "title",
+            "status",
+            "start_date",
+            "end_date",
+            "updated_at",
+            "last_activity_at",
+            *SUMMED_COUNTERS,
+            "tasks_done",
+        )
+        .order_by("-updated_at")
+    )
+
+
+def last_activity(row):
+    """Dernière activité : modification du projet ou de ses tâches / activité journalisée."""
+    if row["last_activity_at"] is None:
+        return row["updated_at"]
+    return max(row["updated_at"], row["last_activity_at"])
+
+
+def build_dashboard(user, today=None):
+    """
+    Construit la réponse de /api/dashboard/student pour `user`.
+
+    Le nombre de requêtes ne dépend pas du nombre de projets.
+    """
+    today = today or date.today()
+    five_days_ago = timezone.now() - timedelta(days=5)
+
+    rows = list(project_task_stats(user, today, five_days_ago))
+    totals = {name: sum(row[name] for row in rows) for name in SUMMED_COUNTERS}
+    for row in rows:
+        row["progress"] = compute_progress(row["tasks_total"], row["tasks_done"])
+
+    total_tasks = totals["tasks_total"]
+    overdue_tasks = totals["tasks_overdue"]
+    blocked_tasks = totals["tasks_blocked"]
+    in_progress_count = totals["tasks_in_progress"]
+    high_priority_todo = totals["tasks_high_priority_todo"]
+
+    # Nudges : suggestions d'action pour l'étudiant
+    nudges = []
+
+    # Nudge 1 : tâches bloquées depuis >= 5 jours
+    blocked_old = totals["tasks_blocked_stale"]
+    if blocked_old > 0:
+        nudges.append(
+            {
+                "type": "blocked_stale",
+                "title": "Tâches bloquées trop longtemps",
+                "message": f"{blocked_old} tâche(s) bloquée(s) depuis 5+ jours.",
+                "severity": "warning",
+            }
+        )
+
+    # Nudge 2 : tâches en retard
+    if overdue_tasks > 0:
+        nudges.append(
+            {
+                "type": "overdue",
+                "title": "Tâches en retard",
+                "message": f"{overdue_tasks} tâche(s) en retard.",
+                "severity": "danger",
+            }
+        )
+
+    # Nudge 3 : trop de tâches en parallèle
+    if in_progress_count >= 4:
+        nudges.append(
+            {
+                "type": "too_many_in_progress",
+                "title": "Trop de tâches en parallèle",
+                "message": f"{in_progress_count} tâches en cours.",
+                "severity": "warning",
+            }
+        )
+
+    # Nudge 4 : priorités élevées non commencées
+    if high_priority_todo > 0:
+        nudges.append(
+            {
+                "type": "high_priority_todo",
+                "title": "Priorités élevées non commencées",
+                "message": f"{high_priority_todo} tâche(s) prioritaire(s) non commencée(s).",
+                "severity": "danger",
+            }
+        )
+
+    # Nudge 5 : risque de retard (deadline proche + progression faible)
+    urgent_projects = []
+    for row in rows:
+        if row["end_date"]:
+            days_left = (row["end_date"] - today).days
+            if 0 <= days_left <= 10 and row["progress"] < 60:
+                urgent_projects.append((row["id"], row["title"], days_left, row["progress"]))
+    if urgent_projects:
+        urgent_projects = urgent_projects[:3]
+        msg_parts = [f"{t} ({d} j, {pr}%)" for (_, t, d, pr) in urgent_projects]
+        nudges.append(
+            {
+                "type": "deadline_risk",
+                "title": "Risque de retard sur échéance",
+                "message": "Projets à risque: " + " | ".join(msg_parts),
+                "severity": "danger",
+            }
+        )
+
+    return {
+        "summary": {
+            "total_projects": len(rows),
+            "active_projects": sum(1 for row in rows if row["status"] == PROJECT_ACTIVE),
+            "total_tasks": total_tasks,
+            "overdue_tasks": overdue_tasks,
+            "blocked_tasks": blocked_tasks,
+            "in_progress_tasks": in_progress_count,
+            "high_priority_todo": high_priority_todo,
+        },
+        "projects": [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "status": row["status"],
+                "start_date": row["start_date"],
+                "end_date": row["end_date"],
+                "progress": row["progress"],
+                "tasks_total": row["tasks_total"],
+                "tasks_done": row["tasks_done"],
+                "tasks_overdue": row["tasks_overdue"],
+                "tasks_blocked": row["tasks_blocked"],
+                "last_activity_at": last_activity(row),
+            }
+            for row in rows
+        ],
+        "nudges": nudges,
+    }
@@ -0,0 +1,205 @@
+"""
+Événements temps réel (Server-Sent Events) : nombre de demandes de supervision
+en attente et nouvelles entrées du journal d'activité.
+
+Une seule source par processus (`broker`) :
+- alimentée par core.activity.write_entries (donc log_activity, opérations en
+  lot, import) et par les vues qui changent une demande de supervision ;
+- chaque événement est adressé à des utilisateurs (propriétaire et
+  superviseur du projet, superviseur sollicité) et distribué aux seules
+  connexions ouvertes de ces utilisateurs, sans aucune requête par client ;
+- les derniers événements sont gardés en mémoire (EVENTS_BACKLOG) pour la
+  reprise après coupure (en-tête Last-Event-ID).
+
+Les identifiants sont "<démarrage>-<numéro>" : après un redémarrage, un
+Last-Event-ID d'une autre instance déclenche un événement `reset` (le client
+recharge ses données) au lieu de trous silencieux. Même chose si le client
+est resté déconnecté plus longtemps que la mémoire tampon.
+
+Un processus = un broker : avec plusieurs workers, chaque connexion ne voit
+que les écritures faites par son worker. Servi uniquement sous ASGI
+(gradely.asgi) ; sous WSGI l'endpoint répond 501.
+
+Authentification : EventSource ne peut pas envoyer d'en-tête, le jeton passe
+donc dans l'URL (journaux d'accès, proxys, historique). Ce n'est jamais le
+jeton d'accès, mais un StreamToken dédié, accepté par ce seul endpoint et
+valable EVENTS_TOKEN_LIFETIME (une minute par défaut), obtenu par
+POST /api/events/token/. Il suffit pour ouvrir le flux : une connexion
+ouverte n'expire pas ; après une coupure, le client en redemande un.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework_simplejwt.tokens import Token
+
+DEFAULT_BACKLOG = 1000
+SUBSCRIBER_QUEUE_SIZE = 200
+DEFAULT_TOKEN_LIFETIME = timedelta(minutes=1)
+
+
+class StreamToken(Token):
+    """Jeton court d'ouverture du flux (?token=), refusé comme jeton d'accès."""
+
+    token_type = "stream"
+    lifetime = getattr(settings, "EVENTS_TOKEN_LIFETIME", DEFAULT_TOKEN_LIFETIME)
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int
+    kind: str
+    user_ids: frozenset
+    data: dict
+
+
+class Subscription:
+    """Connexion SSE d'un utilisateur : file asyncio remplie depuis n'importe quel thread."""
+
+    def __init__(self, user_id, loop):
+        self.user_id = user_id
+        self.loop = loop
+        self.start_seq = 0
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Boucle fermée : la connexion est en train de se terminer
+            pass
+
+    def _deliver(self, event):
+        if self.queue.full():
+            # Client trop lent : on vide et on lui demande de tout recharger
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = None
+        self.queue.put_nowait(event)
+
+
+class EventBroker:
+    def __init__(self, backlog=DEFAULT_BACKLOG):
+        self.boot = uuid4().hex[:8]
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.backlog = deque(maxlen=backlog)
+        self.subscribers = {}  # user_id -> set(Subscription)
+
+    def event_id(self, event):
+        return f"{self.boot}-{event.seq}"
+
+    def publish(self, kind, data, user_ids):
+        """Diffuse `data` aux connexions de `user_ids` (appelable depuis tout thread)."""
+        user_ids = frozenset(user_id for user_id in user_ids if user_id)
+        if not user_ids:
+            return None
+        with self.lock:
+            self.seq += 1
+            event = Event(self.seq, kind, user_ids, data)
+            self.backlog.append(event)
+            targets = [
+                subscription
+                for user_id in user_ids
+                for subscription in self.subscribers.get(user_id, ())
+            ]
+        for subscription in targets:
+            subscription.push(event)
+        return event
+
+    def publish_on_commit(self, kind, data, user_ids):
+        """publish() après le commit de la transaction en cours (jamais si rollback)."""
+        transaction.on_commit(lambda: self.publish(kind, data, user_ids))
+
+    def subscribe(self, user_id):
+        """Nouvelle connexion ; `start_seq` = dernier événement déjà émis à cet instant."""
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self.lock:
+            subscription.start_seq = self.seq
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscribers.pop(subscription.user_id, None)
+
+    def since(self, last_event_id, user_id):
+        """
+        Événements de `user_id` postérieurs à `last_event_id`.
+
+        None si la reprise est impossible (autre démarrage, ou événements
+        sortis de la mémoire tampon) : le client doit recharger.
+        """
+        boot, _, seq = (last_event_id or "").partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        with self.lock:
+            events = list(self.backlog)
+        if seq > self.seq or (events and events[0].seq > seq + 1):
+            return None
+        return [event for event in events if event.seq > seq and user_id in event.user_ids]
+
+
+broker = EventBroker(getattr(settings, "EVENTS_BACKLOG", DEFAULT_BACKLOG))
+
+
+def format_event(event_id, kind, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n"
+
+
+def publish_activity(entries):
+    """
+    Publie les entrées de journal écrites (appelé par write_entries).
+
+    Destinataires : propriétaire et superviseur du projet, lus sur l'instance
+    Project déjà chargée quand log_activity en fournit une, sinon en une
+    requête pour tout le lot.
+    """
+    from .models import ActivityLog, Project
+    from .serializers import ActivityLogSerializer
+
+    members = {}
+    missing = set()
+    for entry in entries:
+        if ActivityLog.project.is_cached(entry):
+            members[entry.project_id] = (entry.project.owner_id, entry.project.supervisor_id)
+        else:
+            missing.add(entry.project_id)
+    missing -= members.keys()
+    if missing:
+        for pk, owner_id, supervisor_id in Project.objects.filter(pk__in=missing).values_list(
+            "pk", "owner_id", "supervisor_id"
+        ):
+            members[pk] = (owner_id, supervisor_id)
+
+    for entry, data in zip(entries, ActivityLogSerializer(entries, many=True).data):
+        broker.publish_on_commit(
+            "activity", {"project": entry.project_id, **data}, members.get(entry.project_id, ())
+        )
+
+
+def pending_count(user_id):
+    from .models import SupervisionRequest
+
+    return SupervisionRequest.objects.filter(
+        requested_supervisor_id=user_id,
+        status=SupervisionRequest.Status.PENDING,
+    ).count()
+
+
+def publish_pending_count(user_id):
+    """Publie le nouveau nombre de demandes en attente du superviseur (une requête)."""
+    broker.publish_on_commit("pending_count", {"count": pending_count(user_id)}, [user_id])
@@ -0,0 +1,135 @@
+"""
+Export en flux du journal d'activité et des tâches d'un projet (NDJSON ou CSV).
+
+Les lignes sont lues avec values().iterator(chunk_size) — ni instance de
+modèle ni serializer — et encodées au fil de l'eau : la mémoire reste
+constante quel que soit le nombre de lignes du projet.
+
+Sous ASGI, Django lit un itérateur synchrone jusqu'au bout avant d'envoyer
+quoi que ce soit : la réponse y porte un itérateur asynchrone qui produit
+chaque morceau dans le thread des vues synchrones (sync_to_async), sur la
+connexion de la requête.
+"""
+
+import csv
+import json
+from itertools import chain
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import ActivityLog, ArchivedActivityLog, Task
+
+FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+CHUNK_SIZE = 2000
+# Lignes encodées regroupées par morceau envoyé au client
+ROWS_PER_WRITE = 500
+
+ACTIVITY_FIELDS = (
+    "id",
+    "created_at",
+    "actor_id",
+    "actor__email",
+    "action_type",
+    "description",
+    "metadata",
+)
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "blocked_since",
+    "created_at",
+    "updated_at",
+)
+
+
+def activity_rows(project_id):
+    """Entrées archivées (les plus anciennes, core.retention) puis entrées récentes."""
+    return chain.from_iterable(
+        model.objects.filter(project_id=project_id)
+        .order_by("created_at", "id")
+        .values(*ACTIVITY_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+        for model in (ArchivedActivityLog, ActivityLog)
+    )
+
+
+def task_rows(project_id):
+    return (
+        Task.objects.filter(project_id=project_id)
+        .order_by("id")
+        .values(*TASK_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+class _Line:
+    """Pseudo-fichier pour csv.writer : writerow() renvoie la ligne encodée."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows, fields):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def encode_csv(rows, fields):
+    writer = csv.writer(_Line())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_cell(row[field]) for field in fields])
+
+
+def _grouped(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= ROWS_PER_WRITE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+async def _async_chunks(chunks):
+    # Même thread pour chaque morceau : le curseur de iterator() y reste valide
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+def streaming_export(rows, fields, fmt, filename, asynchronous=False):
+    """
+    StreamingHttpResponse encodant `rows` (itérateur de dicts) au format `fmt`.
+    `asynchronous` : flux asynchrone, pour une requête servie sous ASGI.
+    """
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+    chunks = _grouped(encode(rows, fields))
+    if asynchronous:
+        chunks = _async_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
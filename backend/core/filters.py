@@ -0,0 +1,120 @@
+"""
+Filtres de requête pour l'API.
+
+Chaque paramètre est traduit en clause SQL (aucun filtrage en Python) et
+s'appuie sur un index de core.Task (vérifié par QueryPlanIndexTest) :
+- project, status, due_after / due_before, priority
+                    → task_project_updated_idx (project, updated_at, id) ;
+                      les autres critères filtrent les tâches du projet, déjà
+                      lues dans l'ordre -updated_at
+- overdue           → task_open_due_idx, partiel (status != done)
+- blocked_for_days  → task_blocked_since_idx, partiel (status = blocked)
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Task
+
+# Bornes des paramètres entiers : au-delà, la base (entier 32 bits) ou
+# timedelta lèveraient OverflowError, soit une 500 sur une saisie utilisateur
+MAX_INT = 2**31 - 1
+MAX_BLOCKED_DAYS = 36500
+
+
+def _int_value(name, value, minimum, maximum):
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValidationError({name: "Entier attendu."})
+    if not minimum <= number <= maximum:
+        raise ValidationError({name: f"Entier entre {minimum} et {maximum} attendu."})
+    return number
+
+
+def _int_param(params, name, minimum=-MAX_INT - 1, maximum=MAX_INT):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    return _int_value(name, value, minimum, maximum)
+
+
+def _list_param(params, name):
+    """Valeurs répétées (?status=a&status=b) ou séparées par des virgules."""
+    values = []
+    for raw in params.getlist(name):
+        values.extend(v for v in raw.split(",") if v)
+    return values
+
+
+def _date_param(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Date attendue au format AAAA-MM-JJ."})
+    return parsed
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filtres de /api/tasks/ et /api/projects/<id>/tasks/.
+
+    ?project=<id>
+    ?status=todo,in_progress    (un ou plusieurs statuts)
+    ?priority=1,2               (une ou plusieurs priorités)
+    ?due_after=2025-01-01       (due_date >= , inclus)
+    ?due_before=2025-01-31      (due_date <= , inclus)
+    ?overdue=1                  (échéance dépassée et non terminée)
+    ?blocked_for_days=5         (bloquée depuis au moins N jours)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        project_id = _int_param(params, "project", minimum=1)
+        if project_id is not None:
+            queryset = queryset.filter(project_id=project_id)
+
+        statuses = _list_param(params, "status")
+        if statuses:
+            unknown = set(statuses) - set(Task.Status.values)
+            if unknown:
+                raise ValidationError(
+                    {"status": f"Statut(s) inconnu(s) : {', '.join(sorted(unknown))}."}
+                )
+            queryset = queryset.filter(status__in=statuses)
+
+        priorities = _list_param(params, "priority")
+        if priorities:
+            values = [_int_value("priority", p, -MAX_INT - 1, MAX_INT) for p in priorities]
+            queryset = queryset.filter(priority__in=values)
+
+        due_after = _date_param(params, "due_after")
+        if due_after is not None:
+            queryset = queryset.filter(due_date__gte=due_after)
+        due_before = _date_param(params, "due_before")
+        if due_before is not None:
+            queryset = queryset.filter(due_date__lte=due_before)
+
+        # Même prédicat que l'index partiel task_open_due_idx
+        if params.get("overdue") in ("1", "true"):
+            queryset = queryset.filter(Q(due_date__lt=date.today()) & ~Q(status=Task.Status.DONE))
+
+        blocked_days = _int_param(params, "blocked_for_days", minimum=0, maximum=MAX_BLOCKED_DAYS)
+        if blocked_days is not None:
+            queryset = queryset.filter(
+                status=Task.Status.BLOCKED,
+                blocked_since__lte=timezone.now() - timedelta(days=blocked_days),
+            )
+
+        return queryset
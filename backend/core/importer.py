@@ -0,0 +1,273 @@
+"""
+Import en flux de projets et de tâches (CSV ou NDJSON).
+
+Une ligne = un projet ou une tâche, selon la colonne `type` :
+
+    {"type": "project", "ref": "p1", "title": "Mémoire", "end_date": "2026-06-30"}
+    {"type": "task", "project_ref": "p1", "title": "Plan", "priority": 1}
+    {"type": "task", "project": 42, "title": "Relecture", "status": "todo"}
+
+En CSV, mêmes noms de colonnes (une cellule vide = champ absent).
+- `ref` : identifiant libre d'un projet du fichier, repris par `project_ref`
+- `project` : id d'un projet existant dont l'utilisateur est membre
+
+Les lignes sont validées avec les règles de ProjectSerializer / TaskSerializer
+et insérées par lots (bulk_create de `chunk_size` lignes). Les compteurs de
+tâches sont mis à jour une fois par projet et par lot, et le journal reçoit
+une entrée récapitulative par projet et par lot de récapitulatif.
+
+La mémoire ne dépend pas de la taille du fichier :
+- lignes en attente d'insertion : au plus `chunk_size` projets et tâches ;
+- récapitulatif (projets touchés, nombre de tâches) : écrit dans le journal
+  dès `chunk_size` projets, un projet dont les lignes s'étendent sur
+  plusieurs lots reçoit une entrée par lot ;
+- références `ref` : les `ref_window` (REF_WINDOW) dernières seulement, avec
+  l'id de leur projet ; une tâche ne peut viser qu'un projet de cette
+  fenêtre, et une `ref` n'est unique qu'à l'intérieur de celle-ci ;
+- projets existants visés (ProjectMembership) : au plus les projets dont
+  l'utilisateur est membre, plus MAX_ERRORS ids refusés.
+
+L'import est tout ou rien : à la première ligne invalide plus rien n'est
+inséré, la validation continue pour signaler jusqu'à MAX_ERRORS erreurs,
+puis la transaction est annulée.
+"""
+
+import csv
+import json
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .activity import write_entries
+from .cache import bump_dashboard_version
+from .membership import ProjectMembership
+from .models import ActivityLog, Project, Task, update_task_counters_many
+from .search import index_objects
+from .serializers import BulkTaskCreateSerializer, ProjectSerializer
+
+FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 1000
+MAX_ERRORS = 50
+REF_WINDOW = 10000
+
+# Colonnes de routage, retirées avant validation
+ROUTING_FIELDS = ("type", "ref", "project_ref")
+
+
+class ImportFailed(Exception):
+    """Import annulé : `errors` = [{"line": n, "errors": {...}}]."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def read_rows(stream, fmt):
+    """Itère sur (numéro de ligne, dict) d'un flux texte CSV ou NDJSON."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {
+                key: value for key, value in row.items() if value not in ("", None)
+            }
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row
+    else:
+        raise ValueError(f"Format inconnu : {fmt}")
+
+
+def guess_format(filename):
+    """csv / ndjson d'après l'extension, None si inconnue."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    return None
+
+
+class ProjectImporter:
+    """
+    Importe les lignes de read_rows() pour `owner` (propriétaire des projets
+    créés, membre requis des projets existants visés).
+    """
+
+    def __init__(self, owner, chunk_size=DEFAULT_CHUNK_SIZE, request=None, ref_window=REF_WINDOW):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.ref_window = ref_window
+        # Validateurs réutilisés d'une ligne à l'autre (champs construits une fois)
+        self.project_validator = ProjectSerializer(
+            context={"request": request, "owner": owner}
+        )
+        self.task_validator = BulkTaskCreateSerializer()
+        # ref -> id du projet (ou None tant qu'il n'est pas inséré), dans
+        # l'ordre du fichier : les plus anciennes sortent au-delà de ref_window
+        self.refs = {}
+        self.membership = ProjectMembership(owner)  # projets existants référencés
+        self.pending_projects = []  # (ref, Project)
+        self.pending_tasks = []
+        # Récapitulatif pas encore journalisé : id de projet -> [titre si créé
+        # par l'import sinon None, nombre de tâches]
+        self.summary = {}
+        self.projects_created = 0
+        self.tasks_created = 0
+        self.errors = []
+
+    def run(self, rows):
+        """Importe tout `rows` ; renvoie le récapitulatif ou lève ImportFailed."""
+        with transaction.atomic():
+            for line, row in rows:
+                try:
+                    self.import_row(row)
+                except ValidationError as exc:
+                    self.errors.append({"line": line, "errors": exc.detail})
+                    if len(self.errors) >= MAX_ERRORS:
+                        break
+            if self.errors:
+                raise ImportFailed(self.errors)
+            self.flush_projects()
+            self.flush_tasks()
+            self.write_summary()
+        return {"projects_created": self.projects_created, "tasks_created": self.tasks_created}
+
+    def import_row(self, row):
+        if not isinstance(row, dict):
+            raise ValidationError({"non_field_errors": ["Objet JSON attendu."]})
+        kind = row.get("type")
+        data = {key: value for key, value in row.items() if key not in ROUTING_FIELDS}
+        if kind == "project":
+            self.add_project(row.get("ref"), data)
+        elif kind == "task":
+            data["project"] = self.resolve_project(row)
+            self.add_task(data)
+        else:
+            raise ValidationError({"type": ["« project » ou « task » attendu."]})
+
+    def add_project(self, ref, data):
+        if ref is not None and ref in self.refs:
+            raise ValidationError({"ref": [f"Référence « {ref} » déjà utilisée."]})
+        validated = self.project_validator.run_validation(data)
+        if ref is not None:
+            self.refs[ref] = None
+            if len(self.refs) > self.ref_window:
+                del self.refs[next(iter(self.refs))]
+        if self.errors:
+            return
+        self.pending_projects.append((ref, Project(owner=self.owner, **validated)))
+        if len(self.pending_projects) >= self.chunk_size:
+            self.flush_projects()
+
+    def resolve_project(self, row):
+        """Id du projet de la tâche : référence du fichier ou projet existant accessible."""
+        ref = row.get("project_ref")
+        if ref is not None:
+            if ref not in self.refs:
+                raise ValidationError(
+                    {
+                        "project_ref": [
+                            f"Projet « {ref} » absent des {self.ref_window} derniers "
+                            "projets du fichier."
+                        ]
+                    }
+                )
+            if self.refs[ref] is None and not self.errors:
+                # Projet encore en attente : inséré maintenant pour connaître son id
+                self.flush_projects()
+            return self.refs[ref] or 0
+        try:
+            project_id = int(row.get("project"))
+        except (TypeError, ValueError):
+            raise ValidationError({"project": ["Id de projet ou project_ref requis."]})
+        if not self.membership.is_member(project_id):
+            raise ValidationError({"project": ["Projet introuvable ou accès refusé."]})
+        return project_id
+
+    def add_task(self, data):
+        validated = self.task_validator.run_validation(data)
+        if self.errors:
+            return
+        status = validated.pop("status", Task.Status.TODO)
+        task = Task(project_id=validated.pop("project"), **validated)
+        # Même règle que Task.set_status (blocked_since)
+        task.set_status(status, save=False)
+        self.pending_tasks.append(task)
+        if len(self.pending_tasks) >= self.chunk_size:
+            self.flush_tasks()
+
+    def flush_projects(self):
+        if not self.pending_projects:
+            return
+        # Projets précédents, tâches en attente comprises : récapitulatif complet
+        if len(self.summary) >= self.chunk_size and not self.pending_tasks:
+            self.write_summary()
+        Project.objects.bulk_create(project for _, project in self.pending_projects)
+        index_objects(project for _, project in self.pending_projects)
+        for ref, project in self.pending_projects:
+            if ref in self.refs:
+                self.refs[ref] = project.pk
+            self.summary[project.pk] = [project.title, 0]
+        self.projects_created += len(self.pending_projects)
+        self.pending_projects = []
+
+    def flush_tasks(self):
+        if not self.pending_tasks:
+            return
+        Task.objects.bulk_create(self.pending_tasks)
+        index_objects(self.pending_tasks)
+        # bulk_create ne passe pas par Task.save : compteurs en un UPDATE par projet
+        update_task_counters_many(
+            [(None, (task.project_id, task.status)) for task in self.pending_tasks]
+        )
+        for task in self.pending_tasks:
+            self.summary.setdefault(task.project_id, [None, 0])[1] += 1
+        self.tasks_created += len(self.pending_tasks)
+        self.pending_tasks = []
+        if len(self.summary) >= self.chunk_size:
+            self.write_summary()
+
+    def write_summary(self):
+        """
+        Une entrée de journal par projet créé ou complété depuis le dernier
+        récapitulatif, en un seul INSERT, puis récapitulatif vidé.
+        """
+        if not self.summary:
+            return
+        entries = []
+        for project_id, (title, count) in self.summary.items():
+            if title is not None:
+                action_type = ActivityLog.ActionType.PROJECT_CREATED
+                description = f"Projet « {title} » importé ({count} tâche(s))"
+            else:
+                action_type = ActivityLog.ActionType.TASK_CREATED
+                description = f"{count} tâche(s) importée(s)"
+            entries.append(
+                ActivityLog(
+                    project_id=project_id,
+                    actor=self.owner,
+                    action_type=action_type,
+                    description=description,
+                    metadata={"imported_tasks": count},
+                )
+            )
+        write_entries(entries)
+        # Projets créés (même sans tâche, leur superviseur doit les voir) ou complétés
+        members = Project.objects.filter(pk__in=self.summary).values_list(
+            "owner_id", "supervisor_id"
+        )
+        bump_dashboard_version(self.owner.id, *(user_id for pair in members for user_id in pair))
+        self.summary = {}
+
+
+def import_projects(stream, fmt, owner, chunk_size=DEFAULT_CHUNK_SIZE, request=None):
+    """Raccourci : read_rows() + ProjectImporter.run()."""
+    return ProjectImporter(owner, chunk_size=chunk_size, request=request).run(
+        read_rows(stream, fmt)
+    )
@@ -0,0 +1,49 @@
+"""
+Archive les entrées anciennes du journal d'activité (voir core.retention).
+
+Usage :
+    python manage.py archive_activity
+    python manage.py archive_activity --days 180 --chunk-size 5000
+
+À planifier, par exemple chaque nuit :
+    30 3 * * * cd /srv/gradely/backend && python manage.py archive_activity
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.retention import DEFAULT_CHUNK_SIZE, archive_activity, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Déplace les entrées du journal plus anciennes que la rétention vers l'archive, par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Âge minimum des entrées archivées (défaut : ACTIVITY_LOG_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Entrées déplacées par transaction (défaut : {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--max-chunks",
+            type=int,
+            help="Nombre de lots maximum pour ce passage (défaut : tout).",
+        )
+
+    def handle(self, *args, days=None, chunk_size=DEFAULT_CHUNK_SIZE, max_chunks=None, **options):
+        if days is not None and days < 0:
+            raise CommandError("--days doit être positif.")
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size doit être strictement positif.")
+        before = retention_cutoff(days)
+        archived = archive_activity(before, chunk_size=chunk_size, max_chunks=max_chunks)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{archived} entrée(s) antérieure(s) au {before:%Y-%m-%d} archivée(s)."
+            )
+        )
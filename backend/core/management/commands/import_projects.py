@@ -0,0 +1,63 @@
+"""
+Importe des projets et des tâches depuis un fichier CSV ou NDJSON (voir core.importer).
+
+Usage :
+    python manage.py import_projects projets.ndjson --owner prof@ecole.fr
+    python manage.py import_projects - --format csv --owner prof@ecole.fr < projets.csv
+"""
+
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import DEFAULT_CHUNK_SIZE, FORMATS, ImportFailed, guess_format, import_projects
+
+
+class Command(BaseCommand):
+    help = "Importe en flux des projets et des tâches (CSV ou NDJSON), par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier à importer (- pour l'entrée standard).")
+        parser.add_argument(
+            "--owner",
+            required=True,
+            help="Email du propriétaire des projets créés.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format du fichier (défaut : d'après l'extension).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Lignes insérées par bulk_create (défaut : {DEFAULT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, path, owner, format=None, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+        User = get_user_model()
+        user = User.objects.filter(email=owner).first()
+        if user is None:
+            raise CommandError(f"Utilisateur introuvable : {owner}")
+        fmt = format or guess_format(path)
+        if fmt is None:
+            raise CommandError("Format indéterminé : utiliser --format csv|ndjson.")
+
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+        try:
+            summary = import_projects(stream, fmt, user, chunk_size=chunk_size)
+        except ImportFailed as exc:
+            for error in exc.errors:
+                self.stderr.write(f"ligne {error['line']} : {error['errors']}")
+            raise CommandError("Import annulé, aucune ligne enregistrée.")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{summary['projects_created']} projet(s) et "
+                f"{summary['tasks_created']} tâche(s) importé(s)."
+            )
+        )
@@ -0,0 +1,37 @@
+"""
+Reconstruit l'index de recherche plein texte (voir core.search).
+
+Usage :
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --chunk-size 5000
+
+L'index est tenu à jour à chaque écriture ; à lancer après une restauration,
+un chargement de données en SQL brut (loaddata, dump) ou un changement de
+configuration de l'index.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.search import REBUILD_CHUNK_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Vide et reconstruit l'index de recherche des projets, tâches et commentaires."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help=f"Lignes insérées par lot (défaut : {REBUILD_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, chunk_size=REBUILD_CHUNK_SIZE, **options):
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size doit être strictement positif.")
+        # Une seule transaction : les recherches concurrentes voient l'ancien
+        # index jusqu'au bout
+        with transaction.atomic():
+            indexed = rebuild_index(chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"{indexed} document(s) indexé(s)."))
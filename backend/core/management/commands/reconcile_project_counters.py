@@ -0,0 +1,37 @@
+"""
+Resynchronise les compteurs de tâches dénormalisés de Project et last_activity_at.
+
+Usage :
+    python manage.py reconcile_project_counters
+    python manage.py reconcile_project_counters --project 3 --project 7
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.services import reconcile_project_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule tasks_total / tasks_done / tasks_blocked / tasks_in_progress depuis "
+        "les tâches, et last_activity_at s'il est en retard sur le journal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="project_ids",
+            help="Limiter à ce projet (option répétable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Nombre de projets vérifiés par requête (défaut : 500).",
+        )
+
+    def handle(self, *args, project_ids=None, batch_size=500, **options):
+        fixed = reconcile_project_counters(project_ids, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{fixed} projet(s) corrigé(s)."))
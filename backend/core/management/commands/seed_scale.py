@@ -0,0 +1,65 @@
+"""
+Génère un jeu de données synthétique à grande échelle (voir core.seed).
+
+Usage :
+    python manage.py seed_scale
+    python manage.py seed_scale --scale large
+    python manage.py seed_scale --scale medium --students 500 --seed 3 --prefix run2
+
+À lancer sur une base de développement ou de benchmark, jamais en production.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from core.seed import DEFAULT_BATCH_SIZE, SCALES, seed_scale
+
+
+class Command(BaseCommand):
+    help = (
+        "Crée étudiants, superviseurs, projets, tâches, commentaires, journal "
+        "et demandes de supervision en masse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=list(SCALES),
+            default="small",
+            help="Volumes de référence (défaut : small), ajustables par les options suivantes.",
+        )
+        for name in SCALES["small"]:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name)
+        parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire (défaut : 0).")
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Préfixe des comptes créés (<prefix>-student-<n>@example.com).",
+        )
+        parser.add_argument("--password", default="password", help="Mot de passe des comptes.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Lignes par INSERT (défaut : {DEFAULT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, scale, seed, prefix, password, batch_size, **options):
+        volumes = dict(SCALES[scale])
+        for name in volumes:
+            if options.get(name) is not None:
+                volumes[name] = options[name]
+        if any(value < 0 for value in volumes.values()) or batch_size <= 0:
+            raise CommandError(
+                "Les volumes doivent être positifs et --batch-size strictement positif."
+            )
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(
+                f"Des comptes « {prefix}-… » existent déjà : choisir un autre --prefix."
+            )
+        created = seed_scale(
+            **volumes, seed=seed, prefix=prefix, password=password, batch_size=batch_size
+        )
+        self.stdout.write(
+            self.style.SUCCESS(", ".join(f"{count} {name}" for name, count in created.items()))
+        )
@@ -0,0 +1,90 @@
+"""
+Appartenance aux projets : l'utilisateur peut-il lire / écrire le projet ?
+
+- membre (owner ou superviseur) : lecture du projet, tâches et commentaires
+- owner : écriture sur le projet lui-même (modification, suppression,
+  demandes de supervision)
+
+ProjectMembership répond à partir de (owner_id, supervisor_id), lus en une
+requête par lot de projets encore inconnus et mémorisés ; une instance
+Project déjà chargée peut être fournie avec remember() (aucune requête).
+request_membership() en donne une par requête HTTP : vues, permissions et
+opérations en lot partagent les mêmes réponses.
+"""
+
+from .models import Project
+
+OWNER = "owner"
+SUPERVISOR = "supervisor"
+
+
+def _pk(project_id):
+    return int(project_id)
+
+
+class ProjectMembership:
+    def __init__(self, user):
+        self.user_id = user.id
+        # project_id -> (owner_id, supervisor_id), None si le projet n'existe pas
+        self.projects = {}
+
+    def remember(self, *projects):
+        """Mémorise des instances Project déjà chargées."""
+        for project in projects:
+            self.projects[project.pk] = (project.owner_id, project.supervisor_id)
+        return self
+
+    def load(self, project_ids):
+        """Charge en une requête les projets de `project_ids` pas encore connus."""
+        missing = {_pk(project_id) for project_id in project_ids} - self.projects.keys()
+        if not missing:
+            return self
+        for pk, owner_id, supervisor_id in Project.objects.filter(pk__in=missing).values_list(
+            "pk", "owner_id", "supervisor_id"
+        ):
+            self.projects[pk] = (owner_id, supervisor_id)
+            missing.discard(pk)
+        self.projects.update(dict.fromkeys(missing))
+        return self
+
+    def members(self, project_id):
+        """(owner_id, supervisor_id) du projet, None s'il n'existe pas."""
+        project_id = _pk(project_id)
+        if project_id not in self.projects:
+            self.load([project_id])
+        return self.projects[project_id]
+
+    def exists(self, project_id):
+        return self.members(project_id) is not None
+
+    def role(self, project_id):
+        """OWNER, SUPERVISOR, ou None si l'utilisateur n'est pas membre."""
+        members = self.members(project_id)
+        if members is None:
+            return None
+        owner_id, supervisor_id = members
+        if owner_id == self.user_id:
+            return OWNER
+        if supervisor_id is not None and supervisor_id == self.user_id:
+            return SUPERVISOR
+        return None
+
+    def is_member(self, project_id):
+        return self.role(project_id) is not None
+
+    def is_owner(self, project_id):
+        return self.role(project_id) == OWNER
+
+    def member_projects(self, project_ids):
+        """Sous-ensemble de `project_ids` dont l'utilisateur est membre (une requête au plus)."""
+        self.load(project_ids)
+        return {_pk(project_id) for project_id in project_ids if self.is_member(project_id)}
+
+
+def request_membership(request):
+    """ProjectMembership de l'utilisateur courant, mémorisée sur la requête."""
+    membership = getattr(request, "_project_membership", None)
+    if membership is None or membership.user_id != request.user.id:
+        membership = ProjectMembership(request.user)
+        request._project_membership = membership
+    return membership
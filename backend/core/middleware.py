@@ -0,0 +1,191 @@
+"""
+Middlewares du module core.
+"""
+
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .activity import activity_buffer, async_activity_buffer
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli optionnel
+    brotli = None
+
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+# Qualité 4-5 : l'essentiel du gain de brotli pour un coût proche de gzip
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/javascript",
+    "application/xml",
+}
+
+
+class ActivityBufferMiddleware:
+    """
+    Journal d'activité écrit en un lot par requête (voir core.activity).
+
+    Les changements de la requête sont déjà validés quand le lot est écrit :
+    un échec est journalisé, la réponse reste celle de la vue.
+
+    Synchrone et asynchrone : sous ASGI, la chaîne n'est pas adaptée et les
+    vues async ne passent pas par un thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with activity_buffer(fail_silently=True):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with async_activity_buffer(fail_silently=True):
+            return await self.get_response(request)
+
+
+def accepted_encodings(header):
+    """Encodages acceptés d'après Accept-Encoding (q=0 exclus)."""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(header):
+    """"br" si brotli est installé et accepté, sinon "gzip" si accepté, sinon None."""
+    accepted = accepted_encodings(header)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compressor(encoding):
+    """(compresser, vider le tampon, terminer) pour `encoding`."""
+    if encoding == "br":
+        stream = brotli.Compressor(quality=BROTLI_QUALITY)
+        return stream.process, stream.flush, stream.finish
+    # wbits 16 + 15 : en-tête et somme de contrôle gzip
+    stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return stream.compress, lambda: stream.flush(zlib.Z_SYNC_FLUSH), stream.flush
+
+
+def compress(encoding, data):
+    write, _, finish = compressor(encoding)
+    return write(data) + finish()
+
+
+def compress_stream(encoding, chunks):
+    # Chaque morceau est vidé tel quel : le client le reçoit sans attendre le suivant
+    write, flush, finish = compressor(encoding)
+    for chunk in chunks:
+        data = write(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_stream(encoding, chunks):
+    write, flush, finish = compressor(encoding)
+    async for chunk in chunks:
+        data = write(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compression des réponses (brotli si installé, sinon gzip) selon
+    Accept-Encoding.
+
+    - Réponses complètes : à partir de COMPRESSION_MIN_SIZE octets, et
+      seulement si le corps compressé est plus petit.
+    - Réponses en flux (exports) : compressées morceau par morceau. Les flux
+      Server-Sent Events ne sont pas compressés (événements à livrer tout
+      de suite, sans tampon des proxys).
+    - Vary: Accept-Encoding sur tout type compressible, quelle que soit la
+      taille, et sur les 304.
+    - Dès qu'un encodage est accepté, l'ETag fort devient faible (W/), corps
+      compressé ou non et 304 compris : la 200 et la 304 portent le même
+      validateur, que les GET conditionnels (core.conditional) comparent en
+      comparaison faible.
+
+    Seuls les types texte, JSON, NDJSON et MessagePack sont compressés, sauf
+    le HTML (admin, API navigable) : ces pages portent un jeton CSRF et ce
+    chemin n'ajoute pas le bourrage aléatoire de GZipMiddleware contre BREACH.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+
+    def compressible(self, response):
+        content_type = response.get("Content-Type", "").partition(";")[0].strip().lower()
+        if content_type in ("text/event-stream", "text/html"):
+            return False
+        return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        # 304 : sans Content-Type ni corps, mais mêmes Vary / ETag que la 200
+        not_modified = response.status_code == 304
+        if not not_modified and not self.compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        if not_modified or (not response.streaming and len(response.content) < self.min_size):
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(
+                    encoding, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_stream(encoding, response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            body = compress(encoding, response.content)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response.headers["Content-Length"] = str(len(body))
+
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,83 @@
+# Compteurs de tâches dénormalisés sur Project + last_activity_at
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("core", "Project")
+    Task = apps.get_model("core", "Task")
+    ActivityLog = apps.get_model("core", "ActivityLog")
+
+    def task_count(**filters):
+        return Coalesce(
+            Subquery(
+                Task.objects.filter(project=OuterRef("pk"), **filters)
+                .order_by()
+                .values("project")
+                .annotate(c=Count("pk"))
+                .values("c")
+            ),
+            0,
+        )
+
+    def latest(model, field):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(project=OuterRef("pk"))
+                .order_by()
+                .values("project")
+                .annotate(m=Max(field))
+                .values("m")
+            ),
+            F("updated_at"),
+        )
+
+    Project.objects.using(schema_editor.connection.alias).update(
+        tasks_total=task_count(),
+        tasks_done=task_count(status="done"),
+        tasks_blocked=task_count(status="blocked"),
+        tasks_in_progress=task_count(status="in_progress"),
+        last_activity_at=Greatest(
+            F("updated_at"),
+            latest(Task, "updated_at"),
+            latest(ActivityLog, "created_at"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_align_with_progress_report"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="tasks_total",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="tasks_done",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="tasks_blocked",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="tasks_in_progress",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
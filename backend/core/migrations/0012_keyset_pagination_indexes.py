@@ -0,0 +1,40 @@
+# Index composites (filtre, champ de tri, id) pour la pagination keyset
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_project_task_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["project", "updated_at", "id"], name="task_project_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["project", "created_at", "id"], name="activity_project_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["project", "created_at", "id"], name="comment_project_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supervisionrequest",
+            index=models.Index(
+                fields=["requested_supervisor", "created_at", "id"],
+                name="supreq_supervisor_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Index partiels : tâches ouvertes par échéance, tâches bloquées, demandes en attente
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_task_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "done"), _negated=True),
+                fields=["project", "due_date"],
+                name="task_open_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "blocked")),
+                fields=["project", "blocked_since"],
+                name="task_blocked_since_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supervisionrequest",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["requested_supervisor", "created_at"],
+                name="supreq_pending_idx",
+            ),
+        ),
+    ]
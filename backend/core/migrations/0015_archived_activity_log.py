@@ -0,0 +1,75 @@
+# Table d'archive du journal d'activité (core.retention)
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedActivityLog",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action_type",
+                    models.CharField(
+                        choices=[
+                            ("project_created", "Projet créé"),
+                            ("project_updated", "Projet modifié"),
+                            ("task_created", "Tâche créée"),
+                            ("task_updated", "Tâche modifiée"),
+                            ("comment_added", "Commentaire ajouté"),
+                            ("supervision_request_sent", "Demande de supervision envoyée"),
+                            ("supervision_request_accepted", "Demande de supervision acceptée"),
+                            ("supervision_request_declined", "Demande de supervision refusée"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("description", models.TextField()),
+                ("metadata", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_activity_logs",
+                        to="core.project",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["project", "created_at", "id"],
+                        name="archived_project_created_idx",
+                    )
+                ],
+            },
+        ),
+    ]
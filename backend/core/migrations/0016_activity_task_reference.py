@@ -0,0 +1,130 @@
+# Références typées tâche / demande de supervision sur le journal d'activité,
+# renseignées par lots à partir de metadata (task_id, supervision_request_id)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def backfill_references(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Task = apps.get_model("core", "Task")
+    SupervisionRequest = apps.get_model("core", "SupervisionRequest")
+
+    for model_name in ("ActivityLog", "ArchivedActivityLog"):
+        Model = apps.get_model("core", model_name)
+        last_pk = 0
+        while True:
+            rows = list(
+                Model.objects.using(alias)
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "metadata")[:BATCH_SIZE]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            refs = {}
+            for pk, metadata in rows:
+                if isinstance(metadata, dict):
+                    refs[pk] = (
+                        _int(metadata.get("task_id")),
+                        _int(metadata.get("supervision_request_id")),
+                    )
+            # Seules les lignes encore existantes peuvent être référencées
+            tasks = set(
+                Task.objects.using(alias)
+                .filter(pk__in={task_id for task_id, _ in refs.values() if task_id})
+                .values_list("pk", flat=True)
+            )
+            requests = set(
+                SupervisionRequest.objects.using(alias)
+                .filter(pk__in={req_id for _, req_id in refs.values() if req_id})
+                .values_list("pk", flat=True)
+            )
+            updated = []
+            for pk, (task_id, req_id) in refs.items():
+                task_id = task_id if task_id in tasks else None
+                req_id = req_id if req_id in requests else None
+                if task_id or req_id:
+                    updated.append(Model(pk=pk, task_id=task_id, supervision_request_id=req_id))
+            Model.objects.using(alias).bulk_update(
+                updated, ["task", "supervision_request"], batch_size=500
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_archived_activity_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activitylog",
+            name="task",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="activity_logs",
+                to="core.task",
+            ),
+        ),
+        migrations.AddField(
+            model_name="activitylog",
+            name="supervision_request",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="activity_logs",
+                to="core.supervisionrequest",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedactivitylog",
+            name="task",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_activity_logs",
+                to="core.task",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedactivitylog",
+            name="supervision_request",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_activity_logs",
+                to="core.supervisionrequest",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["task", "created_at", "id"], name="activity_task_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedactivitylog",
+            index=models.Index(
+                fields=["task", "created_at", "id"], name="archived_task_created_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Index plein texte core_search (voir core.search) : FTS5 sous SQLite,
+# tsvector + GIN sous PostgreSQL, rempli avec les lignes existantes
+
+from django.db import migrations
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE core_search USING fts5(
+        title, body,
+        kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE core_search (
+        id bigint PRIMARY KEY,
+        kind varchar(10) NOT NULL,
+        object_id integer NOT NULL,
+        project_id integer NOT NULL,
+        title text NOT NULL DEFAULT '',
+        body text NOT NULL DEFAULT '',
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('french', title), 'A')
+            || setweight(to_tsvector('french', body), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX core_search_document_idx ON core_search USING GIN (document)",
+    "CREATE INDEX core_search_project_idx ON core_search (project_id)",
+]
+
+FILL = """
+    INSERT INTO core_search ({id}, kind, object_id, project_id, title, body)
+    SELECT id * 4 + 1, 'project', id, id, title, COALESCE(description, '') FROM core_project
+    UNION ALL
+    SELECT id * 4 + 2, 'task', id, project_id, title, COALESCE(description, '') FROM core_task
+    UNION ALL
+    SELECT id * 4 + 3, 'comment', id, project_id, '', content FROM core_comment
+"""
+
+
+def create_index(apps, schema_editor):
+    sqlite = schema_editor.connection.vendor == "sqlite"
+    for statement in SQLITE_CREATE if sqlite else POSTGRES_CREATE:
+        schema_editor.execute(statement)
+    schema_editor.execute(FILL.format(id="rowid" if sqlite else "id"))
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute("DROP TABLE core_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_activity_task_reference"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,17 @@
+# Index (created_at, id) du journal d'activité : lots d'archivage de core.retention
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(fields=["created_at", "id"], name="activity_created_idx"),
+        ),
+    ]
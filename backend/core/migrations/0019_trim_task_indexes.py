@@ -0,0 +1,29 @@
+# Index de core.Task réduits à ceux que choisit le planificateur :
+# task_project_updated_idx couvre project et les filtres status / due_* /
+# priority ; les index partiels restent pour overdue et blocked_for_days
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_activity_created_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(model_name="task", name="task_project_status_idx"),
+        migrations.RemoveIndex(model_name="task", name="task_project_due_idx"),
+        migrations.RemoveIndex(model_name="task", name="task_project_priority_idx"),
+        migrations.AlterField(
+            model_name="task",
+            name="project",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to="core.project",
+            ),
+        ),
+    ]
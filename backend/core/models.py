@@ -1,9 +1,58 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Q
 from django.utils import timezone
 
 
-class Project(models.Model):
+def compute_progress(total, done) -> int:
+    """Pourcentage de tâches terminées (0 si aucune tâche)."""
+    if total == 0:
+        return 0
+    return int((done / total) * 100)
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_task_counts(self):
+        """
+        Annote chaque projet avec le nombre exact de tâches et de tâches terminées,
+        calculés depuis Task dans la même requête (LEFT JOIN + GROUP BY).
+        Recomptage réservé à reconcile_project_counters : les lectures de l'API
+        servent les compteurs stockés.
+        """
+        return self.annotate(
+            annotated_tasks_total=Count("tasks"),
+            annotated_tasks_done=Count("tasks", filter=Q(tasks__status=Task.Status.DONE)),
+        )
+
+
+class SearchIndexedMixin:
+    """
+    Modèle indexé par core.search : garde les valeurs des champs indexés
+    (SEARCH_FIELDS) telles que chargées, pour qu'un save qui ne les change pas
+    (statut, priorité...) ne réindexe rien.
+    """
+
+    SEARCH_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._search_values = instance.search_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Rechargement partiel : d'autres champs peuvent différer de la base
+        self._search_values = self.search_values() if fields is None else None
+
+    def search_values(self):
+        """Valeurs des champs indexés, None si l'un d'eux est différé."""
+        if any(name not in self.__dict__ for name in self.SEARCH_FIELDS):
+            return None
+        return tuple(self.__dict__[name] for name in self.SEARCH_FIELDS)
+
+
+class Project(SearchIndexedMixin, models.Model):
     """
     Projet universitaire.
     - owner : étudiant propriétaire (crée le projet, accès complet)
@@ -40,19 +89,57 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Compteurs dénormalisés, maintenus par Task.save / Task.delete
+    # (resynchronisables avec `manage.py reconcile_project_counters`)
+    tasks_total = models.PositiveIntegerField(default=0, editable=False)
+    tasks_done = models.PositiveIntegerField(default=0, editable=False)
+    tasks_blocked = models.PositiveIntegerField(default=0, editable=False)
+    tasks_in_progress = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Tenus à jour par des UPDATE F() concurrents : jamais réécrits par save()
+    DENORMALIZED_FIELDS = (
+        "tasks_total",
+        "tasks_done",
+        "tasks_blocked",
+        "tasks_in_progress",
+        "last_activity_at",
+    )
+    SEARCH_FIELDS = ("title", "description")
+
+    objects = ProjectQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        """
+        Une mise à jour complète n'écrit pas les champs dénormalisés : les
+        valeurs chargées en début de requête écraseraient les changements de
+        compteurs faits entre-temps (création, modification ou suppression de
+        tâche concurrente).
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def progress_percent(self) -> int:
-        total = self.tasks.count()
-        if total == 0:
-            return 0
-        done = self.tasks.filter(status=Task.Status.DONE).count()
-        return int((done / total) * 100)
+        return compute_progress(self.tasks_total, self.tasks_done)
 
     def __str__(self):
         return self.title
 
 
-class Task(models.Model):
+class Task(SearchIndexedMixin, models.Model):
     """
     Tâche rattachée à un projet.
     Les statuts permettent de suivre l'avancement (TODO -> IN_PROGRESS -> DONE).
@@ -64,7 +151,10 @@ class Task(models.Model):
         BLOCKED = "blocked", "Blocked"
         DONE = "done", "Done"
 
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
+    # Pas d'index propre : task_project_updated_idx commence par project
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="tasks", db_index=False
+    )
 
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -78,6 +168,64 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    SEARCH_FIELDS = ("project_id", "title", "description")
+
+    class Meta:
+        indexes = [
+            # Tâches d'un projet : pagination keyset (-updated_at, -id), filtres
+            # status / due_* / priority de /api/tasks/, cascade et tableau de bord
+            models.Index(fields=["project", "updated_at", "id"], name="task_project_updated_idx"),
+            # Index partiels : tâches en retard (non terminées) et blocages anciens
+            models.Index(
+                fields=["project", "due_date"],
+                condition=~Q(status="done"),
+                name="task_open_due_idx",
+            ),
+            models.Index(
+                fields=["project", "blocked_since"],
+                condition=Q(status="blocked"),
+                name="task_blocked_since_idx",
+            ),
+        ]
+
+    def _counted_state(self):
+        """
+        (project_id, status) tels que comptés dans Project.tasks_*, relus sous
+        verrou (select_for_update) dans la transaction de save / delete : deux
+        modifications concurrentes de la même tâche ne partent pas du même état.
+        """
+        if self._state.adding:
+            return None
+        return (
+            Task.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list("project_id", "status")
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        """Enregistre la tâche et met à jour les compteurs du projet dans la même transaction."""
+        with transaction.atomic():
+            previous = self._counted_state()
+            current = (self.project_id, self.status)
+            update_fields = kwargs.get("update_fields")
+            if previous is not None and update_fields is not None:
+                # Seuls les champs enregistrés comptent
+                update_fields = set(update_fields)
+                current = (
+                    current[0] if update_fields & {"project", "project_id"} else previous[0],
+                    current[1] if "status" in update_fields else previous[1],
+                )
+            super().save(*args, **kwargs)
+            update_task_counters(previous, current)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = self._counted_state()
+            result = super().delete(*args, **kwargs)
+            update_task_counters(previous, None)
+        return result
+
     def set_status(self, new_status: str, save: bool = True):
         if new_status == self.Status.BLOCKED and self.blocked_since is None:
             self.blocked_since = timezone.now()
@@ -91,6 +239,66 @@ class Task(models.Model):
         return self.title
 
 
+# Statut de tâche -> compteur dénormalisé correspondant sur Project
+TASK_STATUS_COUNTERS = {
+    Task.Status.DONE: "tasks_done",
+    Task.Status.BLOCKED: "tasks_blocked",
+    Task.Status.IN_PROGRESS: "tasks_in_progress",
+}
+
+
+def update_task_counters(previous, current):
+    """
+    Répercute le passage d'une tâche de `previous` à `current` sur les compteurs.
+
+    `previous` / `current` sont des couples (project_id, status) tels que comptés
+    en base, ou None (tâche pas encore créée / supprimée).
+    """
+    update_task_counters_many([(previous, current)])
+
+
+def update_task_counters_many(transitions):
+    """
+    Variante groupée de update_task_counters pour une liste de (previous, current).
+
+    Un UPDATE par projet concerné avec des expressions F() : pas de lecture préalable.
+    last_activity_at est mis à jour même si aucun compteur ne change.
+    Les projets sont mis à jour par id croissant : deux transactions qui
+    touchent les mêmes projets prennent leurs verrous dans le même ordre.
+    """
+    deltas = {}
+    for previous, current in transitions:
+        for counted, sign in ((previous, -1), (current, +1)):
+            if counted is None:
+                continue
+            project_id, status = counted
+            project_deltas = deltas.setdefault(project_id, {})
+            for counter in ("tasks_total", TASK_STATUS_COUNTERS.get(status)):
+                if counter:
+                    project_deltas[counter] = project_deltas.get(counter, 0) + sign
+
+    now = timezone.now()
+    for project_id, project_deltas in sorted(deltas.items()):
+        changes = {
+            counter: F(counter) + delta
+            for counter, delta in project_deltas.items()
+            if delta
+        }
+        Project.objects.filter(pk=project_id).update(last_activity_at=now, **changes)
+
+
+def delete_tasks(queryset):
+    """
+    Supprime les tâches de `queryset` et met à jour les compteurs de leurs
+    projets (QuerySet.delete ne passe pas par Task.delete).
+    """
+    with transaction.atomic():
+        counted = list(queryset.select_for_update().values_list("project_id", "status"))
+        result = queryset.delete()
+        update_task_counters_many([(previous, None) for previous in counted])
+    return result
+
+
 class ActivityLog(models.Model):
     """
     Journal d'activité par projet.
@@ -115,6 +323,22 @@ class ActivityLog(models.Model):
         on_delete=models.CASCADE,
         related_name="activity_logs",
     )
+    # Tâche / demande de supervision concernée (aussi dans metadata pour les clients existants)
+    task = models.ForeignKey(
+        "Task",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="activity_logs",
+        db_index=False,  # couvert par activity_task_created_idx
+    )
+    supervision_request = models.ForeignKey(
+        "SupervisionRequest",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="activity_logs",
+    )
     action_type = models.CharField(max_length=50, choices=ActionType.choices)
     description = models.TextField()
     metadata = models.JSONField(default=dict, blank=True)
@@ -122,12 +346,67 @@ class ActivityLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Pagination keyset du journal d'un projet (-created_at, -id)
+            models.Index(fields=["project", "created_at", "id"], name="activity_project_created_idx"),
+            # Historique d'une tâche (/api/tasks/<id>/history/)
+            models.Index(fields=["task", "created_at", "id"], name="activity_task_created_idx"),
+            # Archivage (core.retention) : plus anciennes entrées, par lots
+            models.Index(fields=["created_at", "id"], name="activity_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.action_type} - {self.project.title}"
 
 
-class Comment(models.Model):
+class ArchivedActivityLog(models.Model):
+    """
+    Entrée du journal d'activité archivée (core.retention) : mêmes champs et
+    même id que l'entrée d'origine, hors de la table ActivityLog.
+    Relue par la liste paginée du journal au-delà des entrées récentes.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="archived_activity_logs"
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    task = models.ForeignKey(
+        "Task",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_activity_logs",
+        db_index=False,  # couvert par archived_task_created_idx
+    )
+    supervision_request = models.ForeignKey(
+        "SupervisionRequest",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_activity_logs",
+    )
+    action_type = models.CharField(max_length=50, choices=ActivityLog.ActionType.choices)
+    description = models.TextField()
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "created_at", "id"], name="archived_project_created_idx"),
+            models.Index(fields=["task", "created_at", "id"], name="archived_task_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action_type} - {self.project.title} (archivé)"
+
+
+class Comment(SearchIndexedMixin, models.Model):
     """
     Commentaire sur un projet.
     Owner et superviseur peuvent commenter.
@@ -144,8 +423,13 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    SEARCH_FIELDS = ("project_id", "content")
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "created_at", "id"], name="comment_project_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.author} - {self.project.title}"
@@ -189,6 +473,19 @@ class SupervisionRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Demandes reçues par un superviseur, plus récentes d'abord
+            models.Index(
+                fields=["requested_supervisor", "created_at", "id"],
+                name="supreq_supervisor_created_idx",
+            ),
+            # Demandes en attente d'un superviseur (pending-count)
+            models.Index(
+                fields=["requested_supervisor", "created_at"],
+                condition=models.Q(status="pending"),
+                name="supreq_pending_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["project", "requested_supervisor"],
@@ -0,0 +1,188 @@
+"""
+Pagination par curseur (keyset) pour les listes de l'API.
+
+Le curseur est opaque pour le client : c'est la position (valeur du champ de
+tri, id) de la dernière ligne renvoyée, encodée en base64. La page suivante
+est filtrée par `(champ, id) < position` au lieu d'un OFFSET : chaque page
+est un parcours d'intervalle sur l'index (champ, id), quelle que soit sa
+profondeur.
+
+Format de réponse :
+    {"next": "<url ou null>", "results": [...]}
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination keyset sur un champ DateTime, avec l'id comme départage.
+
+    Les sous-classes fixent `ordering` ("-champ" pour un tri décroissant).
+    """
+
+    ordering = "-created_at"
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Curseur invalide."
+
+    def __init__(self):
+        self.request = None
+        self.next_position = None
+
+    @property
+    def field(self):
+        return self.ordering.lstrip("-")
+
+    @property
+    def descending(self):
+        return self.ordering.startswith("-")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = self.fetch(queryset, self.decode_cursor(request), page_size + 1)
+        return self.page(rows, page_size)
+
+    def fetch(self, queryset, position, limit):
+        """Au plus `limit` lignes de `queryset` après `position`, dans l'ordre de tri."""
+        tie_breaker = "-pk" if self.descending else "pk"
+        queryset = queryset.order_by(self.ordering, tie_breaker)
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(*position))
+        return list(queryset[:limit])
+
+    def page(self, rows, page_size):
+        """Garde `page_size` lignes ; une ligne de plus signale une page suivante."""
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = self.get_position(rows[-1])
+        else:
+            self.next_position = None
+        return rows
+
+    def position_filter(self, value, pk):
+        """
+        Lignes strictement après `(value, pk)` dans l'ordre de tri.
+
+        Forme `champ <= v AND (champ < v OR id < pk)` : le premier terme borne
+        le parcours d'index, le second départage les ex æquo.
+        """
+        if self.descending:
+            bound, strict, after_pk = "lte", "lt", "lt"
+        else:
+            bound, strict, after_pk = "gte", "gt", "gt"
+        return Q(**{f"{self.field}__{bound}": value}) & (
+            Q(**{f"{self.field}__{strict}": value}) | Q(**{f"pk__{after_pk}": pk})
+        )
+
+    def get_position(self, row):
+        """(valeur du champ de tri, id) d'une ligne (instance ou ligne values())."""
+        if isinstance(row, dict):
+            return row[self.field], row["id"]
+        return getattr(row, self.field), row.id
+
+    def encode_cursor(self, position):
+        value, pk = position
+        payload = json.dumps([value.isoformat(), pk], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            raw_value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value = parse_datetime(raw_value)
+            if value is None or not isinstance(pk, int):
+                raise ValueError(encoded)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    """Plus récents d'abord (journal d'activité, commentaires, demandes)."""
+
+    ordering = "-created_at"
+
+
+class UpdatedAtKeysetPagination(KeysetPagination):
+    """Dernières modifications d'abord (tâches)."""
+
+    ordering = "-updated_at"
+
+
+class ActivityKeysetPagination(CreatedAtKeysetPagination):
+    """
+    Journal d'activité : une fois les entrées récentes épuisées, la page est
+    complétée par les entrées archivées (core.retention), toutes plus
+    anciennes ; le curseur (date, id) reste valable d'une table à l'autre.
+
+    Archive : `archive_queryset` si fourni, sinon view.get_archive_queryset().
+    """
+
+    def __init__(self, archive_queryset=None):
+        super().__init__()
+        self.archive_queryset = archive_queryset
+
+    def get_archive_queryset(self, view):
+        if self.archive_queryset is not None:
+            return self.archive_queryset
+        if hasattr(view, "get_archive_queryset"):
+            return view.get_archive_queryset()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        rows = self.fetch(queryset, position, page_size + 1)
+        if len(rows) <= page_size:
+            archive = self.get_archive_queryset(view)
+            if archive is not None:
+                if rows:
+                    position = self.get_position(rows[-1])
+                rows += self.fetch(archive, position, page_size + 1 - len(rows))
+        return self.page(rows, page_size)
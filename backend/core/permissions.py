@@ -8,6 +8,8 @@ Règles métier :
 
 from rest_framework import permissions
 
+from .membership import request_membership
+
 
 class IsProjectOwnerOrSupervisor(permissions.BasePermission):
     """
@@ -25,12 +27,13 @@ class IsProjectOwnerOrSupervisor(permissions.BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
+        membership = request_membership(request).remember(obj)
         # Méthodes sûres (GET, HEAD, OPTIONS) : owner ou supervisor
         if request.method in permissions.SAFE_METHODS:
-            return obj.owner_id == request.user.id or obj.supervisor_id == request.user.id
+            return membership.is_member(obj.pk)
 
         # Méthodes d'écriture : uniquement l'owner
-        return obj.owner_id == request.user.id
+        return membership.is_owner(obj.pk)
 
 
 class IsProjectMember(permissions.BasePermission):
@@ -45,7 +48,7 @@ class IsProjectMember(permissions.BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
-        project = obj.project
-        return (
-            project.owner_id == request.user.id or project.supervisor_id == request.user.id
-        )
+        membership = request_membership(request)
+        if type(obj).project.is_cached(obj):
+            membership.remember(obj.project)
+        return membership.is_member(obj.project_id)
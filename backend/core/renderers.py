@@ -0,0 +1,109 @@
+"""
+Renderers et parsers de l'API (REST_FRAMEWORK dans gradely.settings).
+
+- ORJSONRenderer / ORJSONParser : JSON encodé et décodé par orjson, en
+  remplacement direct de JSONRenderer / JSONParser de DRF : mêmes octets
+  (compact, UTF-8 non échappé, U+2028 / U+2029 échappés, dates au format du
+  JSONEncoder de DRF). Sans orjson installé, ce sont ceux de DRF.
+- MessagePackRenderer / MessagePackParser : application/msgpack, choisi par
+  l'en-tête Accept (ou ?format=msgpack), si msgpack est installé. Les
+  datetimes avec fuseau sont des Timestamp MessagePack natifs ; dates,
+  datetimes sans fuseau, Decimal et le reste passent par le JSONEncoder de DRF.
+
+Dépendances optionnelles : orjson, msgpack.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson optionnel
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack optionnel
+    msgpack = None
+
+# Types non natifs (Decimal, UUID, chaînes paresseuses, querysets...) : même
+# conversion que JSONRenderer
+_encode_default = JSONEncoder().default
+
+if orjson is not None:
+    # Dates passées à _encode_default : DRF tronque à la milliseconde et écrit
+    # "Z" pour UTC, orjson garde les microsecondes
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encodé par orjson. Indentation demandée (API navigable) ou
+    réglages COMPACT_JSON / UNICODE_JSON modifiés : JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_encode_default, option=ORJSON_OPTIONS)
+        # Séparateurs de ligne valides en JSON mais pas en JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser décodé par orjson (NaN et Infinity refusés, comme JSONParser en STRICT_JSON)."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read() if stream is not None else b""
+        try:
+            if encoding.lower().replace("-", "") != "utf8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (orjson.JSONDecodeError, UnicodeDecodeError, LookupError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Réponse application/msgpack (Accept ou ?format=msgpack)."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_encode_default, datetime=True, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Corps application/msgpack ; les Timestamp sont relus en datetime UTC."""
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        body = stream.read() if stream is not None else b""
+        try:
+            return msgpack.unpackb(body, raw=False, timestamp=3)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,83 @@
+"""
+Rétention du journal d'activité.
+
+Les entrées plus anciennes que ACTIVITY_LOG_RETENTION_DAYS sont déplacées de
+ActivityLog vers ArchivedActivityLog (même id, mêmes champs), par lots bornés :
+chaque lot est une transaction courte (INSERT ... puis DELETE par id), donc
+l'archivage peut tourner pendant que l'API écrit.
+
+La table chaude reste petite ; l'historique reste lisible :
+- la liste paginée du journal continue dans l'archive une fois les entrées
+  récentes épuisées (ActivityKeysetPagination),
+- l'export du journal parcourt l'archive puis la table chaude.
+
+Lancement : commande `archive_activity`, à planifier (cron, timer systemd...).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ActivityLog, ArchivedActivityLog
+
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_CHUNK_SIZE = 1000
+
+ARCHIVED_FIELDS = (
+    "id",
+    "project_id",
+    "actor_id",
+    "task_id",
+    "supervision_request_id",
+    "action_type",
+    "description",
+    "metadata",
+    "created_at",
+)
+
+
+def retention_cutoff(days=None, now=None):
+    if days is None:
+        days = getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def archive_chunk(before, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Archive les `chunk_size` plus anciennes entrées antérieures à `before` ; renvoie leur nombre."""
+    with transaction.atomic():
+        # Parcours de l'index activity_created_idx (created_at, id) : seules
+        # les lignes du lot sont lues, et aucune quand il n'en reste plus
+        rows = list(
+            ActivityLog.objects.filter(created_at__lt=before)
+            .order_by("created_at", "id")
+            .values(*ARCHIVED_FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return 0
+        ArchivedActivityLog.objects.bulk_create(ArchivedActivityLog(**row) for row in rows)
+        ActivityLog.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_activity(before=None, chunk_size=DEFAULT_CHUNK_SIZE, max_chunks=None):
+    """
+    Archive toutes les entrées antérieures à `before` (défaut : retention_cutoff()).
+
+    Args:
+        chunk_size: entrées déplacées par transaction
+        max_chunks: nombre de lots maximum (None : jusqu'au bout)
+
+    Returns:
+        nombre d'entrées archivées
+    """
+    before = before or retention_cutoff()
+    total = chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        moved = archive_chunk(before, chunk_size)
+        if not moved:
+            break
+        total += moved
+        chunks += 1
+    return total
@@ -0,0 +1,133 @@
+"""
+Sérialisation rapide des listes en lecture seule (journal, commentaires,
+demandes de supervision).
+
+Les lignes sont lues avec values_list(named=True) — colonnes jointes
+(emails, titre du projet) comprises, sans instance de modèle — et converties
+en dict directement, sans la machinerie de champs DRF ligne par ligne.
+
+Chaque RowSerializer reproduit exactement la sortie (clés, ordre, formats)
+du serializer DRF correspondant de core.serializers, qui reste utilisé pour
+les créations, modifications et détails. Les lignes nommées exposent `id` et
+le champ de tri : la pagination keyset s'applique telle quelle.
+"""
+
+from operator import itemgetter
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+class RowSerializer:
+    """
+    fields : (clé de sortie, colonne values()) dans l'ordre des champs du
+    serializer DRF équivalent ; une colonne peut alimenter plusieurs clés.
+    datetime_fields : clés formatées comme serializers.DateTimeField.
+    """
+
+    fields = ()
+    datetime_fields = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.columns = list(dict.fromkeys(column for _, column in self.fields))
+        self.keys = [key for key, _ in self.fields]
+        self.values = itemgetter(*(self.columns.index(column) for _, column in self.fields))
+        self.format_datetime = serializers.DateTimeField().to_representation
+
+    def rows(self, queryset):
+        """Queryset de lignes nommées (tri et filtres de `queryset` conservés)."""
+        return queryset.values_list(*self.columns, named=True)
+
+    def to_representation(self, row):
+        data = dict(zip(self.keys, self.values(row)))
+        for key in self.datetime_fields:
+            if data[key] is not None:
+                data[key] = self.format_datetime(data[key])
+        return data
+
+    def data(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class ActivityLogRows(RowSerializer):
+    """Sortie de ActivityLogSerializer (ActivityLog et ArchivedActivityLog)."""
+
+    fields = (
+        ("id", "id"),
+        ("actor", "actor_id"),
+        ("actor_email", "actor__email"),
+        ("task", "task_id"),
+        ("supervision_request", "supervision_request_id"),
+        ("action_type", "action_type"),
+        ("description", "description"),
+        ("metadata", "metadata"),
+        ("created_at", "created_at"),
+    )
+    datetime_fields = ("created_at",)
+
+
+class CommentRows(RowSerializer):
+    """Sortie de CommentSerializer."""
+
+    fields = (
+        ("id", "id"),
+        ("project", "project_id"),
+        ("author", "author_id"),
+        ("author_email", "author__email"),
+        ("content", "content"),
+        ("created_at", "created_at"),
+    )
+    datetime_fields = ("created_at",)
+
+
+class SupervisionRequestRows(RowSerializer):
+    """Sortie de SupervisionRequestSerializer, direction comprise."""
+
+    fields = (
+        ("id", "id"),
+        ("project", "project_id"),
+        ("project_id", "project_id"),
+        ("project_title", "project__title"),
+        ("requested_supervisor", "requested_supervisor_id"),
+        ("requested_supervisor_email", "requested_supervisor__email"),
+        ("owner_email", "project__owner__email"),
+        ("status", "status"),
+        ("message", "message"),
+        ("response_message", "response_message"),
+        ("created_at", "created_at"),
+        ("responded_at", "responded_at"),
+    )
+    datetime_fields = ("created_at", "responded_at")
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        request = self.context.get("request")
+        self.user_id = request.user.id if request else None
+        self.supervisor_index = self.columns.index("requested_supervisor_id")
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        received = self.user_id is not None and row[self.supervisor_index] == self.user_id
+        data["direction"] = "received" if received else "sent"
+        return data
+
+
+class RowListMixin:
+    """
+    list() en lecture rapide pour un GenericViewSet : get_queryset() lu par
+    `row_serializer_class`, paginé par pagination_class s'il y en a une.
+    """
+
+    row_serializer_class = None
+
+    def get_row_serializer(self):
+        return self.row_serializer_class(context=self.get_serializer_context())
+
+    def list_rows(self, request, *args, **kwargs):
+        serializer = self.get_row_serializer()
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(serializer.data(rows))
+        return self.get_paginated_response(serializer.data(page))
@@ -0,0 +1,236 @@
+"""
+Recherche plein texte dans les projets, tâches et commentaires.
+
+Index `core_search` (migration 0017) : une ligne par objet (titre, texte,
+projet), identifiée par object_id * 4 + code du type :
+- SQLite : table virtuelle FTS5 (tokenizer unicode61 sans accents, tri bm25),
+  la ligne est le rowid ;
+- PostgreSQL : table avec une colonne tsvector générée (config "french",
+  titre pondéré A, texte B) et un index GIN.
+
+Mise à jour incrémentale dans la transaction de l'écriture :
+- post_save de Project, Task et Comment : réindexe seulement si les champs
+  indexés (SEARCH_FIELDS) diffèrent des valeurs chargées (SearchIndexedMixin),
+  un changement de statut ne coûte donc rien ;
+- post_delete : une ligne par objet supprimé, sauf en cascade depuis la
+  suppression d'un projet, dont toutes les lignes partent en un DELETE ;
+- index_objects() pour les bulk_create (opérations en lot, import).
+
+search() filtre les projets accessibles (owner ou superviseur) dans la même
+requête que la recherche. rebuild_index() (commande rebuild_search_index)
+reconstruit tout l'index.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Project, Task
+
+TABLE = "core_search"
+MAX_TERMS = 8
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+REBUILD_CHUNK_SIZE = 2000
+
+# type -> (code, modèle, champs indexés (titre, texte), champ du projet)
+KINDS = {
+    "project": (1, Project, ("title", "description"), "id"),
+    "task": (2, Task, ("title", "description"), "project_id"),
+    "comment": (3, Comment, (None, "content"), "project_id"),
+}
+MODEL_KINDS = {model: kind for kind, (_, model, _, _) in KINDS.items()}
+
+SQLITE_SEARCH = f"""
+    SELECT s.kind, s.object_id, s.project_id, s.title,
+           snippet({TABLE}, 1, '', '', '…', 16)
+    FROM {TABLE} s
+    JOIN core_project p ON p.id = s.project_id
+    WHERE {TABLE} MATCH %s AND (p.owner_id = %s OR p.supervisor_id = %s) {{kind}}
+    ORDER BY bm25({TABLE}, 2.0, 1.0)
+    LIMIT %s
+"""
+
+POSTGRES_SEARCH = f"""
+    SELECT s.kind, s.object_id, s.project_id, s.title,
+           ts_headline('french', s.body, q, 'StartSel="",StopSel="",MaxWords=24,MinWords=8')
+    FROM {TABLE} s
+    JOIN core_project p ON p.id = s.project_id,
+         to_tsquery('french', %s) q
+    WHERE s.document @@ q AND (p.owner_id = %s OR p.supervisor_id = %s) {{kind}}
+    ORDER BY ts_rank(s.document, q) DESC
+    LIMIT %s
+"""
+
+
+def document_id(kind, object_id):
+    return object_id * 4 + KINDS[kind][0]
+
+
+def _id_column():
+    return "rowid" if connection.vendor == "sqlite" else "id"
+
+
+def _row(kind, obj):
+    _, _, (title_field, body_field), project_field = KINDS[kind]
+    title = getattr(obj, title_field) if title_field else ""
+    return (
+        document_id(kind, obj.pk),
+        kind,
+        obj.pk,
+        getattr(obj, project_field),
+        title or "",
+        getattr(obj, body_field) or "",
+    )
+
+
+def _insert(rows):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TABLE} ({_id_column()}, kind, object_id, project_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def _delete(document_ids):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {TABLE} WHERE {_id_column()} = %s",
+            [(document_id,) for document_id in document_ids],
+        )
+
+
+def index_objects(objects):
+    """(Ré)indexe des instances Project, Task ou Comment (ex. après bulk_create)."""
+    rows = [_row(MODEL_KINDS[type(obj)], obj) for obj in objects]
+    if rows:
+        _delete([row[0] for row in rows])
+        _insert(rows)
+
+
+def unindex_objects(objects):
+    _delete([document_id(MODEL_KINDS[type(obj)], obj.pk) for obj in objects])
+
+
+def unindex_project(project_id):
+    """Retire le projet, ses tâches et ses commentaires de l'index, en une requête."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # FTS5 : suppression par rowid, project_id n'étant pas indexé
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN "
+                f"(SELECT rowid FROM {TABLE} WHERE project_id = %s)",
+                [project_id],
+            )
+        else:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE project_id = %s", [project_id])
+
+
+def _indexed_fields(model):
+    names = set(model.SEARCH_FIELDS)
+    if "project_id" in names:
+        names.add("project")
+    return names
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+def _index_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not _indexed_fields(sender) & set(update_fields):
+        return
+    values = instance.search_values()
+    if not created and values is not None and values == getattr(instance, "_search_values", None):
+        return
+    index_objects([instance])
+    instance._search_values = values
+
+
+def _deleting_projects(origin):
+    """Suppression partie d'un projet (ou d'un queryset de projets) : cascade."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is Project
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Comment)
+def _unindex_deleted(sender, instance, origin=None, **kwargs):
+    if sender is Project:
+        unindex_project(instance.pk)
+    elif not _deleting_projects(origin):
+        unindex_objects([instance])
+
+
+def match_query(text):
+    """Requête du moteur à partir de la saisie (mots préfixés, tous requis), None si vide."""
+    terms = re.findall(r"\w+", text)[:MAX_TERMS]
+    if not terms:
+        return None
+    if connection.vendor == "sqlite":
+        return " ".join(f'"{term}"*' for term in terms)
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def search(user, text, kind=None, limit=DEFAULT_LIMIT):
+    """
+    Résultats les plus pertinents parmi les projets accessibles à `user`.
+
+    Returns:
+        [{"type", "id", "project", "title", "snippet"}, ...]
+    """
+    query = match_query(text)
+    if query is None:
+        return []
+    sql = SQLITE_SEARCH if connection.vendor == "sqlite" else POSTGRES_SEARCH
+    params = [query, user.id, user.id]
+    if kind is not None:
+        sql = sql.format(kind="AND s.kind = %s")
+        params.append(kind)
+    else:
+        sql = sql.format(kind="")
+    params.append(min(limit, MAX_LIMIT))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {"type": kind, "id": object_id, "project": project_id, "title": title, "snippet": snippet}
+            for kind, object_id, project_id, title, snippet in cursor.fetchall()
+        ]
+
+
+def rebuild_index(chunk_size=REBUILD_CHUNK_SIZE):
+    """Vide puis reconstruit l'index, par lots ; renvoie le nombre de lignes indexées."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+    total = 0
+    for kind, (_, model, fields, project_field) in KINDS.items():
+        names = ["pk", project_field, *(name for name in fields if name)]
+        rows = []
+        for values in model.objects.order_by("pk").values(*names).iterator(chunk_size):
+            title_field, body_field = fields
+            rows.append(
+                (
+                    document_id(kind, values["pk"]),
+                    kind,
+                    values["pk"],
+                    values[project_field],
+                    (values[title_field] if title_field else "") or "",
+                    values[body_field] or "",
+                )
+            )
+            if len(rows) >= chunk_size:
+                _insert(rows)
+                total += len(rows)
+                rows = []
+        _insert(rows)
+        total += len(rows)
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+    return total
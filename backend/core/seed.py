@@ -0,0 +1,322 @@
+"""
+Jeu de données synthétique à grande échelle (commande `seed_scale`, benchmarks).
+
+Étudiants et superviseurs, projets (supervisés ou non), tâches dans tous les
+statuts, commentaires, journal d'activité et demandes de supervision, tous
+insérés par bulk_create en lots. Les dates sont réparties sur les
+HISTORY_DAYS derniers jours : bulk_create imposant maintenant aux champs
+auto_now / auto_now_add, elles sont réécrites ensuite (UPDATE par id).
+
+Puis, comme après un import : compteurs de tâches recalculés
+(reconcile_project_counters) et index de recherche reconstruit.
+
+Génération déterministe pour une même graine.
+"""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+
+from .models import ActivityLog, Comment, Project, SupervisionRequest, Task
+from .search import rebuild_index
+from .services import reconcile_project_counters
+
+DEFAULT_BATCH_SIZE = 1000
+HISTORY_DAYS = 180
+
+# Volumes de référence (benchmarks : core/benchmarks/bench_endpoints.py)
+SCALES = {
+    "small": {
+        "students": 20,
+        "supervisors": 4,
+        "projects_per_student": 2,
+        "tasks_per_project": 20,
+        "comments_per_project": 5,
+        "activity_per_project": 20,
+    },
+    "medium": {
+        "students": 200,
+        "supervisors": 20,
+        "projects_per_student": 3,
+        "tasks_per_project": 50,
+        "comments_per_project": 10,
+        "activity_per_project": 50,
+    },
+    "large": {
+        "students": 1000,
+        "supervisors": 50,
+        "projects_per_student": 4,
+        "tasks_per_project": 100,
+        "comments_per_project": 20,
+        "activity_per_project": 100,
+    },
+}
+
+# Répartition des statuts de tâche (tous représentés)
+TASK_STATUS_WEIGHTS = {
+    Task.Status.TODO: 4,
+    Task.Status.IN_PROGRESS: 3,
+    Task.Status.BLOCKED: 1,
+    Task.Status.DONE: 4,
+}
+PROJECT_STATUS_WEIGHTS = {
+    Project.Status.ACTIVE: 8,
+    Project.Status.COMPLETED: 1,
+    Project.Status.ARCHIVED: 1,
+}
+SUBJECTS = (
+    "Mémoire de master",
+    "Analyse de données",
+    "Application mobile",
+    "Étude de cas",
+    "Rapport de stage",
+    "Prototype embarqué",
+)
+TASK_TITLES = (
+    "Rédiger l'introduction",
+    "Relire le plan",
+    "Collecter les données",
+    "Préparer la soutenance",
+    "Corriger la bibliographie",
+    "Écrire les tests",
+    "Mettre en forme les annexes",
+)
+COMMENTS = (
+    "Bonne progression, continuer ainsi.",
+    "Penser à citer les sources de la partie 2.",
+    "Le planning me semble serré.",
+    "Merci pour le retour, je corrige.",
+)
+
+
+def _choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _set_dates(model, objects, dates):
+    """
+    Réécrit les dates de `objects` déjà insérés, en un UPDATE par ligne
+    exécuté par executemany (bulk_update construit des CASE bien plus lents).
+    `dates` : pour chaque objet, {champ: valeur}, mêmes champs pour tous.
+    """
+    if not objects:
+        return
+    fields = [model._meta.get_field(name) for name in dates[0]]
+    quote = connection.ops.quote_name
+    sql = "UPDATE {} SET {} WHERE {} = %s".format(
+        quote(model._meta.db_table),
+        ", ".join(f"{quote(field.column)} = %s" for field in fields),
+        quote(model._meta.pk.column),
+    )
+    rows = [
+        [field.get_db_prep_value(values[field.name], connection) for field in fields] + [obj.pk]
+        for obj, values in zip(objects, dates)
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _create(model, objects, dates, batch_size):
+    model.objects.bulk_create(objects, batch_size=batch_size)
+    _set_dates(model, objects, dates)
+
+
+def seed_scale(
+    students,
+    supervisors,
+    projects_per_student,
+    tasks_per_project,
+    comments_per_project,
+    activity_per_project,
+    seed=0,
+    prefix="seed",
+    password="password",
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Génère le jeu de données dans une transaction.
+
+    Les comptes sont <prefix>-student-<n>@example.com et
+    <prefix>-supervisor-<n>@example.com, tous avec le même mot de passe.
+
+    Returns:
+        nombre de lignes créées par clé : users, projects, tasks, comments,
+        activity, supervision_requests
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    def past(max_days=HISTORY_DAYS):
+        return now - timedelta(seconds=rng.randrange(max_days * 86400))
+
+    with transaction.atomic():
+        hashed = make_password(password)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}-{kind}-{index}",
+                    email=f"{prefix}-{kind}-{index}@example.com",
+                    password=hashed,
+                    is_staff=kind == "supervisor",
+                    role=User.Role.SUPERVISOR if kind == "supervisor" else User.Role.STUDENT,
+                )
+                for kind, count in (("student", students), ("supervisor", supervisors))
+                for index in range(count)
+            ],
+            batch_size=batch_size,
+        )
+        student_users, supervisor_users = users[:students], users[students:]
+
+        # Deux projets sur trois supervisés (si des superviseurs existent)
+        projects, project_dates = [], []
+        for student in student_users:
+            for index in range(projects_per_student):
+                created = past()
+                start = created.date()
+                projects.append(
+                    Project(
+                        owner=student,
+                        supervisor=(
+                            rng.choice(supervisor_users)
+                            if supervisor_users and rng.random() < 2 / 3
+                            else None
+                        ),
+                        title=f"{rng.choice(SUBJECTS)} {index + 1}",
+                        description=f"Projet de {student.username}",
+                        status=_choice(rng, PROJECT_STATUS_WEIGHTS),
+                        start_date=start,
+                        end_date=start + timedelta(days=rng.randrange(60, 300)),
+                    )
+                )
+                project_dates.append(created)
+        Project.objects.bulk_create(projects, batch_size=batch_size)
+
+        # Demande acceptée pour les projets supervisés ; en attente ou refusée sinon
+        requests, request_dates = [], []
+        for project, created in zip(projects, project_dates):
+            if project.supervisor is not None:
+                supervisor, status = project.supervisor, SupervisionRequest.Status.ACCEPTED
+            elif supervisor_users:
+                supervisor = rng.choice(supervisor_users)
+                status = rng.choice(
+                    [SupervisionRequest.Status.PENDING, SupervisionRequest.Status.DECLINED]
+                )
+            else:
+                continue
+            sent = created + (now - created) * rng.random() / 2
+            requests.append(
+                SupervisionRequest(
+                    project=project,
+                    requested_supervisor=supervisor,
+                    status=status,
+                    message="Pourriez-vous superviser ce projet ?",
+                    responded_at=(
+                        None
+                        if status == SupervisionRequest.Status.PENDING
+                        else sent + (now - sent) * rng.random()
+                    ),
+                )
+            )
+            request_dates.append({"created_at": sent})
+        _create(SupervisionRequest, requests, request_dates, batch_size)
+
+        tasks, task_dates = [], []
+        for project, created in zip(projects, project_dates):
+            for _ in range(tasks_per_project):
+                task_created = created + (now - created) * rng.random()
+                updated = task_created + (now - task_created) * rng.random()
+                status = _choice(rng, TASK_STATUS_WEIGHTS)
+                tasks.append(
+                    Task(
+                        project=project,
+                        title=rng.choice(TASK_TITLES),
+                        description="Détails de la tâche",
+                        status=status,
+                        priority=rng.randint(1, 5),
+                        due_date=(
+                            (now + timedelta(days=rng.randrange(-30, 90))).date()
+                            if rng.random() < 0.7
+                            else None
+                        ),
+                        blocked_since=updated if status == Task.Status.BLOCKED else None,
+                    )
+                )
+                task_dates.append({"created_at": task_created, "updated_at": updated})
+        _create(Task, tasks, task_dates, batch_size)
+
+        comments, comment_dates = [], []
+        for project, created in zip(projects, project_dates):
+            authors = [project.owner] + ([project.supervisor] if project.supervisor else [])
+            for _ in range(comments_per_project):
+                comments.append(
+                    Comment(
+                        project=project, author=rng.choice(authors), content=rng.choice(COMMENTS)
+                    )
+                )
+                comment_dates.append({"created_at": created + (now - created) * rng.random()})
+        _create(Comment, comments, comment_dates, batch_size)
+
+        project_tasks = {}
+        for task in tasks:
+            project_tasks.setdefault(task.project_id, []).append(task)
+        last_activity = {}
+        entries, entry_dates = [], []
+        for project, created in zip(projects, project_dates):
+            candidates = project_tasks.get(project.pk, [])
+            for _ in range(activity_per_project):
+                at = created + (now - created) * rng.random()
+                task = rng.choice(candidates) if candidates and rng.random() < 0.8 else None
+                if task is not None:
+                    action = rng.choice(
+                        [ActivityLog.ActionType.TASK_CREATED, ActivityLog.ActionType.TASK_UPDATED]
+                    )
+                    verb = "créée" if action == ActivityLog.ActionType.TASK_CREATED else "modifiée"
+                    description = f"Tâche « {task.title} » {verb}"
+                    metadata = {"task_id": task.pk}
+                else:
+                    action = ActivityLog.ActionType.PROJECT_UPDATED
+                    description = f"Projet « {project.title} » modifié"
+                    metadata = {}
+                entries.append(
+                    ActivityLog(
+                        project=project,
+                        actor=project.owner,
+                        task=task,
+                        action_type=action,
+                        description=description,
+                        metadata=metadata,
+                    )
+                )
+                entry_dates.append({"created_at": at})
+                last_activity[project.pk] = max(at, last_activity.get(project.pk, at))
+        _create(ActivityLog, entries, entry_dates, batch_size)
+
+        _set_dates(
+            Project,
+            projects,
+            [
+                {
+                    "created_at": created,
+                    "updated_at": created + (now - created) * rng.random(),
+                    "last_activity_at": last_activity.get(project.pk),
+                }
+                for project, created in zip(projects, project_dates)
+            ],
+        )
+
+        reconcile_project_counters([project.pk for project in projects])
+        rebuild_index()
+
+    return {
+        "users": len(users),
+        "projects": len(projects),
+        "tasks": len(tasks),
+        "comments": len(comments),
+        "activity": len(entries),
+        "supervision_requests": len(requests),
+    }
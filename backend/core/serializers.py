@@ -34,13 +34,43 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "blocked_since", "created_at", "updated_at"]
 
 
+class BulkTaskCreateSerializer(TaskSerializer):
+    """
+    Création en lot (POST /api/tasks/bulk/) : mêmes règles que TaskSerializer,
+    mais le projet est un simple id, vérifié une fois par projet par core.bulk
+    au lieu d'une requête par tâche.
+    """
+
+    project = serializers.IntegerField()
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    """Une opération de POST /api/tasks/bulk/ (hors champs de création)."""
+
+    OPERATIONS = ("create", "status", "priority", "delete")
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    priority = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op != "create" and "id" not in attrs:
+            raise serializers.ValidationError({"id": "Requis pour cette opération."})
+        if op in ("status", "priority") and op not in attrs:
+            raise serializers.ValidationError({op: "Requis pour cette opération."})
+        return attrs
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     """
     Sérialiseur pour les projets.
 
     - owner : défini automatiquement côté serveur (request.user), en lecture seule
     - supervisor : optionnel, assignable uniquement par l'owner ; doit être is_staff
-    - progress_percent : calculé à partir des tâches, en lecture seule
+    - progress_percent : calculé à partir des compteurs de tâches stockés sur
+      le projet, en lecture seule
     """
 
     progress_percent = serializers.IntegerField(read_only=True)
@@ -77,9 +107,13 @@ class ProjectSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, attrs):
-        """Interdit supervisor = owner (cross-field validation)."""
+        """
+        Interdit supervisor = owner (cross-field validation).
+        Owner : celui du projet modifié, sinon context["owner"] (import hors
+        requête), sinon request.user.
+        """
         supervisor = attrs.get("supervisor")
-        owner = self.instance.owner if self.instance else None
+        owner = self.instance.owner if self.instance else self.context.get("owner")
         if owner is None:
             request = self.context.get("request")
             owner = request.user if request else None
@@ -97,7 +131,17 @@ class ActivityLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ActivityLog
-        fields = ["id", "actor", "actor_email", "action_type", "description", "metadata", "created_at"]
+        fields = [
+            "id",
+            "actor",
+            "actor_email",
+            "task",
+            "supervision_request",
+            "action_type",
+            "description",
+            "metadata",
+            "created_at",
+        ]
         read_only_fields = fields
 
 
@@ -2,24 +2,128 @@
 Services métier pour le module core.
 """
 
-from .models import ActivityLog
+from django.db.models import Count, Max, OuterRef, Q, Subquery
 
+from .activity import record_activity
+from .cache import bump_dashboard_version
+from .models import TASK_STATUS_COUNTERS, ActivityLog, ArchivedActivityLog, Project, Task
 
-def log_activity(project, actor, action_type, description, metadata=None):
+# Champs dénormalisés recalculés par reconcile_project_counters
+PROJECT_COUNTER_FIELDS = ("tasks_total", *TASK_STATUS_COUNTERS.values())
+
+
+def log_activity(
+    project, actor, action_type, description, metadata=None, task=None, supervision_request=None
+):
     """
-    Crée une entrée dans le journal d'activité du projet.
+    Crée une entrée dans le journal d'activité du projet et invalide le
+    tableau de bord en cache du propriétaire et du superviseur.
+
+    L'entrée passe par le tampon de core.activity : écrite en lot au commit,
+    jamais si la transaction est annulée.
 
     Args:
         project: instance Project
         actor: instance User (auteur de l'action)
         action_type: valeur de ActivityLog.ActionType
         description: texte descriptif
-        metadata: dict optionnel (ex: {"task_id": 1, "field": "status"})
+        metadata: dict optionnel (ex: {"field": "status"})
+        task, supervision_request: objet concerné (référence indexée, reprise
+            aussi dans metadata sous task_id / supervision_request_id)
     """
-    ActivityLog.objects.create(
-        project=project,
-        actor=actor,
-        action_type=action_type,
-        description=description,
-        metadata=metadata or {},
+    metadata = dict(metadata or {})
+    if task is not None:
+        metadata.setdefault("task_id", task.pk)
+    if supervision_request is not None:
+        metadata.setdefault("supervision_request_id", supervision_request.pk)
+    record_activity(
+        ActivityLog(
+            project=project,
+            actor=actor,
+            task=task,
+            supervision_request=supervision_request,
+            action_type=action_type,
+            description=description,
+            metadata=metadata,
+        )
     )
+    bump_dashboard_version(project.owner_id, project.supervisor_id)
+
+
+def reconcile_project_counters(project_ids=None, batch_size=500):
+    """
+    Recalcule les compteurs de tâches dénormalisés à partir des lignes Task,
+    et last_activity_at à partir du journal (archives comprises) et de la
+    dernière modification de tâche.
+
+    Une requête groupée par lot de projets ; seuls les projets dont les
+    compteurs ont dérivé sont réécrits (bulk_update). last_activity_at n'est
+    corrigé que s'il est antérieur à la dernière activité connue (mise à jour
+    perdue) : il est normalement posé un peu après created_at / updated_at.
+
+    Args:
+        project_ids: ids à vérifier (tous les projets si None)
+        batch_size: nombre de projets traités par requête
+
+    Returns:
+        nombre de projets corrigés
+    """
+    annotations = {
+        f"annotated_{field}": Count("tasks", filter=Q(tasks__status=status))
+        for status, field in TASK_STATUS_COUNTERS.items()
+        if field != "tasks_done"
+    }
+    # Dernière activité connue : un max par source (sous-requêtes corrélées)
+    latest_sources = {
+        "latest_activity": (ActivityLog, "created_at"),
+        "latest_archived_activity": (ArchivedActivityLog, "created_at"),
+        "latest_task_update": (Task, "updated_at"),
+    }
+    for name, (model, field) in latest_sources.items():
+        annotations[name] = Subquery(
+            model.objects.filter(project=OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(latest=Max(field))
+            .values("latest")
+        )
+
+    queryset = Project.objects.order_by("pk")
+    if project_ids is not None:
+        queryset = queryset.filter(pk__in=list(project_ids))
+
+    fixed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk)
+            .with_task_counts()
+            .annotate(**annotations)
+            .only("pk", "last_activity_at", *PROJECT_COUNTER_FIELDS)[:batch_size]
+        )
+        if not batch:
+            return fixed
+        drifted = []
+        for project in batch:
+            changed = False
+            for field in PROJECT_COUNTER_FIELDS:
+                actual = getattr(project, f"annotated_{field}")
+                if getattr(project, field) != actual:
+                    setattr(project, field, actual)
+                    changed = True
+            latest = max(
+                (getattr(project, name) for name in latest_sources if getattr(project, name)),
+                default=None,
+            )
+            if latest is not None and (
+                project.last_activity_at is None or project.last_activity_at < latest
+            ):
+                project.last_activity_at = latest
+                changed = True
+            if changed:
+                drifted.append(project)
+        if drifted:
+            Project.objects.bulk_update(drifted, (*PROJECT_COUNTER_FIELDS, "last_activity_at"))
+            fixed += len(drifted)
+        last_pk = batch[-1].pk
+
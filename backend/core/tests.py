@@ -2,11 +2,53 @@
 Tests pour l'API core (projets, tâches).
 """
 
+import asyncio
+import csv
+import importlib
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from importlib.util import find_spec
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
 from accounts.models import User
-from core.models import Project
+from core.activity import activity_buffer
+from core.events import EventBroker, StreamToken, broker
+from core.importer import ImportFailed, ProjectImporter
+from core.membership import ProjectMembership
+from core.models import (
+    ActivityLog,
+    ArchivedActivityLog,
+    Comment,
+    Project,
+    SupervisionRequest,
+    Task,
+)
+from core.search import index_objects
+from core.serializers import (
+    ActivityLogSerializer,
+    CommentSerializer,
+    ProjectSerializer,
+    SupervisionRequestSerializer,
+)
+from core.services import log_activity, reconcile_project_counters
+from gradely.database import database_config
 
 
 class ProjectSupervisorAssignmentTest(APITestCase):
@@ -98,3 +140,2184 @@ class ProjectSupervisorAssignmentTest(APITestCase):
         self.assertIn("supervisor", resp.json())
         self.project.refresh_from_db()
         self.assertIsNone(self.project.supervisor_id)
+
+
+class StudentDashboardTest(APITestCase):
+    """
+    Tests du tableau de bord agrégé.
+    - compteurs et nudges corrects
+    - nombre de requêtes constant quel que soit le nombre de projets
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+
+    def _create_project(self, index, supervisor=None):
+        today = date.today()
+        project = Project.objects.create(
+            title=f"Projet {index}",
+            owner=self.owner,
+            supervisor=supervisor,
+            end_date=today + timedelta(days=5),
+        )
+        Task.objects.create(project=project, title="Faite", status=Task.Status.DONE)
+        Task.objects.create(
+            project=project,
+            title="En retard",
+            status=Task.Status.TODO,
+            priority=1,
+            due_date=today - timedelta(days=1),
+        )
+        Task.objects.create(project=project, title="Bloquée", status=Task.Status.BLOCKED)
+        return project
+
+    def test_counts_and_nudges(self):
+        project = self._create_project(1, supervisor=self.staff_user)
+        self.client.force_authenticate(user=self.staff_user)
+        resp = self.client.get("/api/dashboard/student")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(
+            data["summary"],
+            {
+                "total_projects": 1,
+                "active_projects": 1,
+                "total_tasks": 3,
+                "overdue_tasks": 1,
+                "blocked_tasks": 1,
+                "in_progress_tasks": 0,
+                "high_priority_todo": 1,
+            },
+        )
+        [row] = data["projects"]
+        self.assertEqual(row["id"], project.id)
+        self.assertEqual(row["progress"], 33)
+        self.assertEqual(
+            (row["tasks_total"], row["tasks_done"], row["tasks_overdue"], row["tasks_blocked"]),
+            (3, 1, 1, 1),
+        )
+        self.assertEqual(
+            [n["type"] for n in data["nudges"]],
+            ["overdue", "high_priority_todo", "deadline_risk"],
+        )
+
+    def test_query_count_independent_of_project_count(self):
+        self.client.force_authenticate(user=self.owner)
+        self._create_project(0)
+        with self.assertNumQueries(1):
+            self.client.get("/api/dashboard/student")
+        for index in range(1, 20):
+            self._create_project(index)
+        cache.clear()
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/dashboard/student")
+        self.assertEqual(resp.json()["summary"]["total_projects"], 20)
+
+
+class ProjectTaskCountersTest(APITestCase):
+    """
+    Compteurs de tâches dénormalisés sur Project.
+    - maintenus par création / changement de statut / déplacement / suppression
+    - resynchronisés par la commande reconcile_project_counters
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+
+    def assertCounters(self, project, total, done, blocked, in_progress):
+        project.refresh_from_db()
+        self.assertEqual(
+            (
+                project.tasks_total,
+                project.tasks_done,
+                project.tasks_blocked,
+                project.tasks_in_progress,
+            ),
+            (total, done, blocked, in_progress),
+        )
+
+    def test_counters_follow_task_lifecycle(self):
+        self.client.force_authenticate(user=self.owner)
+        resp = self.client.post(
+            "/api/tasks/", {"project": self.project.id, "title": "T1"}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        task_id = resp.json()["id"]
+        self.assertCounters(self.project, 1, 0, 0, 0)
+        self.assertIsNotNone(self.project.last_activity_at)
+
+        self.client.patch(f"/api/tasks/{task_id}/", {"status": "in_progress"}, format="json")
+        self.assertCounters(self.project, 1, 0, 0, 1)
+
+        task = Task.objects.get(pk=task_id)
+        task.set_status(Task.Status.BLOCKED)
+        self.assertCounters(self.project, 1, 0, 1, 0)
+
+        task.set_status(Task.Status.DONE)
+        self.assertCounters(self.project, 1, 1, 0, 0)
+        self.assertEqual(self.project.progress_percent, 100)
+
+        other = Project.objects.create(title="Autre", owner=self.owner)
+        self.client.patch(f"/api/tasks/{task_id}/", {"project": other.id}, format="json")
+        self.assertCounters(self.project, 0, 0, 0, 0)
+        self.assertCounters(other, 1, 1, 0, 0)
+
+        self.client.delete(f"/api/tasks/{task_id}/")
+        self.assertCounters(other, 0, 0, 0, 0)
+
+    def test_update_fields_only_counts_saved_status(self):
+        task = Task.objects.create(project=self.project, title="T")
+        task.status = Task.Status.DONE
+        task.save(update_fields=["title", "updated_at"])
+        self.assertCounters(self.project, 1, 0, 0, 0)
+
+    def test_stale_instances_do_not_double_count(self):
+        task = Task.objects.create(project=self.project, title="T")
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        # Deux requêtes concurrentes ont chargé la tâche avant d'écrire
+        first.set_status(Task.Status.DONE)
+        second.set_status(Task.Status.DONE)
+        self.assertCounters(self.project, 1, 1, 0, 0)
+        second.set_status(Task.Status.BLOCKED)
+        first.delete()
+        self.assertCounters(self.project, 0, 0, 0, 0)
+        # Déjà supprimée : rien à décompter
+        second.delete()
+        self.assertCounters(self.project, 0, 0, 0, 0)
+
+    def test_admin_delete_selected_updates_counters(self):
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@test.com", password="pass"
+        )
+        tasks = [
+            Task.objects.create(project=self.project, title="A", status=Task.Status.DONE),
+            Task.objects.create(project=self.project, title="B", status=Task.Status.BLOCKED),
+            Task.objects.create(project=self.project, title="C"),
+        ]
+        self.client.force_login(admin)
+        resp = self.client.post(
+            "/admin/core/task/",
+            {
+                "action": "delete_selected",
+                "_selected_action": [tasks[0].pk, tasks[1].pk],
+                "post": "yes",
+            },
+        )
+        self.assertEqual(resp.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(list(Task.objects.values_list("pk", flat=True)), [tasks[2].pk])
+        self.assertCounters(self.project, 1, 0, 0, 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        Task.objects.create(project=self.project, title="A", status=Task.Status.DONE)
+        Task.objects.create(project=self.project, title="B", status=Task.Status.BLOCKED)
+        Project.objects.filter(pk=self.project.pk).update(
+            tasks_total=10, tasks_done=0, tasks_blocked=5, tasks_in_progress=2
+        )
+        call_command("reconcile_project_counters", stdout=StringIO())
+        self.assertCounters(self.project, 2, 1, 1, 0)
+
+    def test_project_save_keeps_concurrent_counter_changes(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        # Tâche créée pendant qu'une autre requête modifie le projet
+        Task.objects.create(project=self.project, title="A", status=Task.Status.DONE)
+        stale.title = "Renommé"
+        stale.save()
+        self.assertCounters(self.project, 1, 1, 0, 0)
+        self.assertEqual(self.project.title, "Renommé")
+        self.assertIsNotNone(self.project.last_activity_at)
+
+        self.client.force_authenticate(user=self.owner)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(f"/api/projects/{self.project.id}/", {"title": "API"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        updates = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "core_project"')
+        ]
+        self.assertTrue(updates)
+        self.assertFalse([sql for sql in updates if "tasks_total" in sql])
+
+    def test_reconcile_fixes_lost_last_activity(self):
+        task = Task.objects.create(project=self.project, title="A")
+        log_activity(self.project, self.owner, ActivityLog.ActionType.PROJECT_UPDATED, "Modifié")
+        latest = ActivityLog.objects.get().created_at
+        Project.objects.filter(pk=self.project.pk).update(last_activity_at=None)
+        call_command("reconcile_project_counters", stdout=StringIO())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.last_activity_at, max(latest, task.updated_at))
+
+        # Déjà à jour (posé après la dernière activité) : pas réécrit
+        self.assertEqual(reconcile_project_counters([self.project.pk]), 0)
+
+
+class ProjectListQueryTest(APITestCase):
+    """La liste des projets calcule progress_percent sans requête par projet."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+
+    def test_list_is_single_query_with_progress(self):
+        for index in range(5):
+            project = Project.objects.create(title=f"Projet {index}", owner=self.owner)
+            Task.objects.create(project=project, title="A", status=Task.Status.DONE)
+            Task.objects.create(project=project, title="B")
+        self.client.force_authenticate(user=self.owner)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/projects/")
+        self.assertEqual([p["progress_percent"] for p in resp.json()], [50] * 5)
+        # Compteurs stockés : ni jointure sur les tâches ni GROUP BY
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertNotIn("core_task", sql)
+        self.assertNotIn("GROUP BY", sql)
+
+
+class KeysetPaginationTest(APITestCase):
+    """
+    Pagination par curseur des listes (activité, commentaires, tâches).
+    - parcours complet sans doublon ni trou, même avec des dates identiques
+    - curseur invalide → 404
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def _walk(self, url):
+        ids = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            data = resp.json()
+            ids.extend(item["id"] for item in data["results"])
+            url = data["next"]
+        return ids
+
+    def test_activity_pages_with_identical_timestamps(self):
+        for index in range(7):
+            ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.PROJECT_UPDATED,
+                description=f"Entrée {index}",
+            )
+        # Trois entrées partagent la même date : l'id départage
+        same = timezone.now()
+        ActivityLog.objects.filter(
+            pk__in=ActivityLog.objects.order_by("id").values("pk")[2:5]
+        ).update(created_at=same)
+        expected = list(
+            ActivityLog.objects.filter(project=self.project)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        ids = self._walk(f"/api/projects/{self.project.id}/activity/?page_size=2")
+        self.assertEqual(ids, expected)
+
+    def test_comments_and_tasks_are_paginated(self):
+        for index in range(3):
+            Comment.objects.create(project=self.project, author=self.owner, content=f"C{index}")
+            Task.objects.create(project=self.project, title=f"T{index}")
+        resp = self.client.get(f"/api/projects/{self.project.id}/comments/?page_size=2")
+        self.assertEqual(len(resp.json()["results"]), 2)
+        self.assertEqual(len(self._walk(f"/api/projects/{self.project.id}/comments/?page_size=2")), 3)
+        self.assertEqual(len(self._walk("/api/tasks/?page_size=2")), 3)
+
+    def test_invalid_cursor_returns_404(self):
+        resp = self.client.get(f"/api/projects/{self.project.id}/activity/?cursor=nope")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskFilterTest(APITestCase):
+    """
+    Filtres SQL de /api/tasks/ et route imbriquée /api/projects/<id>/tasks/.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        self.second = Project.objects.create(title="Second", owner=self.owner)
+        self.foreign = Project.objects.create(title="Étranger", owner=self.other)
+        today = date.today()
+        self.todo = Task.objects.create(
+            project=self.project, title="A", priority=1, due_date=today
+        )
+        self.done = Task.objects.create(
+            project=self.project,
+            title="B",
+            status=Task.Status.DONE,
+            priority=3,
+            due_date=today + timedelta(days=10),
+        )
+        self.elsewhere = Task.objects.create(project=self.second, title="C")
+        Task.objects.create(project=self.foreign, title="D")
+        self.client.force_authenticate(user=self.owner)
+
+    def _ids(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return {t["id"] for t in resp.json()["results"]}
+
+    def test_filters(self):
+        today = date.today()
+        self.assertEqual(
+            self._ids(f"/api/tasks/?project={self.project.id}"), {self.todo.id, self.done.id}
+        )
+        self.assertEqual(self._ids("/api/tasks/?status=done"), {self.done.id})
+        self.assertEqual(
+            self._ids("/api/tasks/?status=todo,done"),
+            {self.todo.id, self.done.id, self.elsewhere.id},
+        )
+        self.assertEqual(self._ids("/api/tasks/?priority=1"), {self.todo.id})
+        self.assertEqual(
+            self._ids(f"/api/tasks/?due_after={today + timedelta(days=1)}"), {self.done.id}
+        )
+        self.assertEqual(self._ids(f"/api/tasks/?due_before={today}"), {self.todo.id})
+
+    def test_nested_route_and_access(self):
+        self.assertEqual(
+            self._ids(f"/api/projects/{self.project.id}/tasks/?status=todo"), {self.todo.id}
+        )
+        self.assertEqual(self._ids(f"/api/projects/{self.foreign.id}/tasks/"), set())
+
+    def test_invalid_values_return_400(self):
+        for query in ("status=nope", "priority=x", "due_after=2025-13-01", "project=abc"):
+            resp = self.client.get(f"/api/tasks/?{query}")
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_out_of_range_values_return_400(self):
+        for query in (
+            "blocked_for_days=1000000",
+            "blocked_for_days=1000000000",
+            "blocked_for_days=-1",
+            "project=0",
+            "project=99999999999999999999",
+            "priority=99999999999999999999",
+        ):
+            resp = self.client.get(f"/api/tasks/?{query}")
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, query)
+        self.assertEqual(self._ids("/api/tasks/?blocked_for_days=36500"), set())
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN est propre à SQLite")
+class QueryPlanIndexTest(APITestCase):
+    """
+    Chaque requête de lecture du dashboard et des listes doit passer par un index :
+    aucun « SCAN <table> » sans index dans EXPLAIN QUERY PLAN.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.user)
+        Task.objects.create(project=self.project, title="Tâche")
+        self.client.force_authenticate(user=self.user)
+
+    def _plans(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, url)
+        for query in ctx.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                yield query["sql"], [row[3] for row in cursor.fetchall()]
+
+    def test_read_queries_use_indexes(self):
+        pk = self.project.id
+        urls = [
+            "/api/dashboard/student",
+            "/api/projects/",
+            f"/api/projects/{pk}/",
+            "/api/tasks/",
+            f"/api/tasks/?project={pk}&status=todo",
+            f"/api/tasks/?project={pk}&due_after=2024-01-01&due_before=2024-12-31",
+            f"/api/tasks/?project={pk}&priority=1",
+            "/api/tasks/?overdue=1",
+            "/api/tasks/?blocked_for_days=5",
+            f"/api/projects/{pk}/tasks/",
+            f"/api/projects/{pk}/activity/",
+            f"/api/projects/{pk}/comments/",
+            f"/api/projects/{pk}/supervision-requests/",
+            "/api/supervision-requests/",
+            "/api/supervision-requests/pending-count/",
+        ]
+        for url in urls:
+            for sql, plan in self._plans(url):
+                scans = [step for step in plan if step.startswith("SCAN ") and " USING " not in step]
+                self.assertEqual(scans, [], f"{url}\n{sql}\n{plan}")
+
+    def test_partial_indexes_are_used(self):
+        expected = {
+            "/api/tasks/?overdue=1": "task_open_due_idx",
+            "/api/tasks/?blocked_for_days=5": "task_blocked_since_idx",
+            "/api/supervision-requests/pending-count/": "supreq_pending_idx",
+        }
+        for url, index in expected.items():
+            plans = [" ".join(plan) for _, plan in self._plans(url)]
+            self.assertTrue(any(index in plan for plan in plans), f"{url}: {plans}")
+
+    def test_task_filters_use_project_index(self):
+        # Un seul index (project, updated_at, id) sert la liste d'un projet et
+        # ses filtres : pas d'index dédié par critère à maintenir à chaque écriture
+        pk = self.project.id
+        urls = [
+            f"/api/tasks/?project={pk}",
+            f"/api/tasks/?project={pk}&status=todo",
+            f"/api/tasks/?project={pk}&due_after=2024-01-01&due_before=2024-12-31",
+            f"/api/tasks/?project={pk}&priority=1",
+            f"/api/projects/{pk}/tasks/",
+        ]
+        for url in urls:
+            plans = [" ".join(plan) for sql, plan in self._plans(url) if '"core_task"' in sql]
+            self.assertTrue(
+                any("task_project_updated_idx" in plan for plan in plans), f"{url}: {plans}"
+            )
+        with connection.cursor() as cursor:
+            indexes = {
+                name
+                for name, info in connection.introspection.get_constraints(
+                    cursor, Task._meta.db_table
+                ).items()
+                if info["index"] and not info["primary_key"]
+            }
+        self.assertEqual(
+            indexes, {"task_project_updated_idx", "task_open_due_idx", "task_blocked_since_idx"}
+        )
+
+
+class ProjectBundleTest(APITestCase):
+    """
+    GET /api/projects/<id>/bundle/ : toute la page projet en une réponse,
+    en un nombre de requêtes borné.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+
+    def _populate(self, count):
+        for index in range(count):
+            Task.objects.create(project=self.project, title=f"T{index}")
+            Comment.objects.create(project=self.project, author=self.owner, content=f"C{index}")
+            ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.COMMENT_ADDED,
+                description=f"A{index}",
+            )
+
+    def test_bundle_sections_and_limits(self):
+        self._populate(5)
+        SupervisionRequest.objects.create(project=self.project, requested_supervisor=self.staff_user)
+        self.client.force_authenticate(user=self.owner)
+        resp = self.client.get(
+            f"/api/projects/{self.project.id}/bundle/?comments_limit=2&activity_limit=3"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(data["project"]["id"], self.project.id)
+        self.assertEqual(len(data["tasks"]), 5)
+        self.assertIsNone(data["tasks_cursor"])
+        self.assertEqual(len(data["comments"]), 2)
+        self.assertEqual(len(data["activity"]), 3)
+        self.assertEqual(data["supervision_requests"][0]["direction"], "sent")
+
+        # Le curseur du bundle continue la liste paginée sans doublon
+        rest = self.client.get(
+            f"/api/projects/{self.project.id}/comments/?cursor={data['comments_cursor']}"
+        ).json()["results"]
+        ids = [c["id"] for c in data["comments"] + rest]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+
+    def test_bundle_query_count_is_bounded(self):
+        self.client.force_authenticate(user=self.owner)
+        self._populate(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(f"/api/projects/{self.project.id}/bundle/")
+        self._populate(30)
+        # 5 sections + validateurs ETag
+        self.assertEqual(len(small.captured_queries), 6)
+        with self.assertNumQueries(6):
+            self.client.get(f"/api/projects/{self.project.id}/bundle/")
+
+    def test_bundle_requires_membership(self):
+        self.client.force_authenticate(user=self.outsider)
+        resp = self.client.get(f"/api/projects/{self.project.id}/bundle/")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalGetTest(APITestCase):
+    """ETag / Last-Modified sur les lectures d'un projet : 304 en une requête."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(
+            title="Projet", owner=self.owner, supervisor=self.staff_user
+        )
+        self.task = Task.objects.create(project=self.project, title="T")
+        self.urls = [
+            f"/api/projects/{self.project.id}/",
+            f"/api/projects/{self.project.id}/bundle/",
+            f"/api/projects/{self.project.id}/tasks/",
+            f"/api/tasks/?project={self.project.id}",
+            f"/api/projects/{self.project.id}/comments/",
+            f"/api/projects/{self.project.id}/activity/",
+        ]
+        self.client.force_authenticate(user=self.owner)
+
+    def test_not_modified_in_one_query(self):
+        for url in self.urls:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, url)
+            self.assertIn("Last-Modified", resp.headers)
+            with self.assertNumQueries(1):
+                cached = self.client.get(url, HTTP_IF_NONE_MATCH=resp.headers["ETag"])
+            self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(cached.headers["ETag"], resp.headers["ETag"])
+            # Comparaison faible : un ETag W/ (ex. après compression) correspond aussi
+            weak = self.client.get(url, HTTP_IF_NONE_MATCH="W/" + resp.headers["ETag"])
+            self.assertEqual(weak.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp.headers["Last-Modified"])
+            self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED, url)
+
+    def test_changes_invalidate_etag(self):
+        etags = {url: self.client.get(url).headers["ETag"] for url in self.urls}
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                f"/api/projects/{self.project.id}/comments/",
+                {"project": self.project.id, "content": "Salut"},
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        for url, etag in etags.items():
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, url)
+
+        url = f"/api/projects/{self.project.id}/tasks/"
+        etag = self.client.get(url).headers["ETag"]
+        self.task.delete()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["results"], [])
+
+    def test_etag_depends_on_user_and_query(self):
+        url = f"/api/projects/{self.project.id}/tasks/"
+        etag = self.client.get(url).headers["ETag"]
+        filtered = self.client.get(url + "?status=todo", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(filtered.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=self.staff_user)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_no_validators_without_access(self):
+        self.client.force_authenticate(user=self.outsider)
+        resp = self.client.get(f"/api/projects/{self.project.id}/")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", resp.headers)
+
+
+class DashboardCacheTest(APITestCase):
+    """
+    Tableau de bord en cache par utilisateur :
+    - invalidé par les écritures (propriétaire et superviseur)
+    - copie périmée servie pendant un rafraîchissement ou si la base est verrouillée
+    """
+
+    url = "/api/dashboard/student"
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+        self.project = Project.objects.create(
+            title="Projet", owner=self.owner, supervisor=self.staff_user
+        )
+
+    def _total_tasks(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.url).json()["summary"]["total_tasks"]
+
+    def _create_task(self):
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                "/api/tasks/", {"project": self.project.id, "title": "Nouvelle"}
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_cached_until_write(self):
+        self.assertEqual(self._total_tasks(self.owner), 0)
+        self.assertEqual(self._total_tasks(self.staff_user), 0)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        self._create_task()
+        self.assertEqual(self._total_tasks(self.owner), 1)
+        self.assertEqual(self._total_tasks(self.staff_user), 1)
+
+    def test_previous_supervisor_is_invalidated(self):
+        other_staff = User.objects.create_user(
+            username="staff2", email="staff2@test.com", password="pass", is_staff=True
+        )
+        self.client.force_authenticate(user=self.staff_user)
+        self.assertEqual(self.client.get(self.url).json()["summary"]["total_projects"], 1)
+
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/projects/{self.project.id}/", {"supervisor": other_staff.id}
+            )
+        self.client.force_authenticate(user=self.staff_user)
+        self.assertEqual(self.client.get(self.url).json()["summary"]["total_projects"], 0)
+
+    def test_stale_copy_while_refreshing(self):
+        self._total_tasks(self.owner)
+        self._create_task()
+        # Un autre rafraîchissement est en cours : copie périmée, sans requête
+        cache.add(f"dashboard:{self.owner.id}:refresh", True)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._total_tasks(self.owner), 0)
+        cache.delete(f"dashboard:{self.owner.id}:refresh")
+        self.assertEqual(self._total_tasks(self.owner), 1)
+
+    def test_stale_copy_when_database_is_locked(self):
+        self._total_tasks(self.owner)
+        self._create_task()
+        with mock.patch(
+            "core.cache.build_dashboard", side_effect=OperationalError("database is locked")
+        ):
+            self.assertEqual(self._total_tasks(self.owner), 0)
+        self.assertEqual(self._total_tasks(self.owner), 1)
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+            with override_settings(CACHES=caches):
+                self.assertEqual(self._total_tasks(self.owner), 0)
+                with self.assertNumQueries(0):
+                    self.client.get(self.url)
+                self._create_task()
+                self.assertEqual(self._total_tasks(self.owner), 1)
+
+
+class ActivityBufferTest(APITestCase):
+    """
+    Journal d'activité en tampon :
+    - un seul INSERT pour toutes les entrées validées
+    - rien pour une transaction annulée
+    - tampon borné, mode synchrone
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+
+    def _log(self, description="x"):
+        log_activity(
+            self.project, self.owner, ActivityLog.ActionType.PROJECT_UPDATED, description
+        )
+
+    def _activity_inserts(self, queries):
+        return [
+            q for q in queries.captured_queries
+            if q["sql"].startswith('INSERT INTO "core_activitylog"')
+        ]
+
+    def test_single_bulk_insert_on_commit(self):
+        with CaptureQueriesContext(connection) as queries:
+            with activity_buffer():
+                with self.captureOnCommitCallbacks(execute=True):
+                    for index in range(5):
+                        self._log(f"e{index}")
+                self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(len(self._activity_inserts(queries)), 1)
+        self.assertEqual(ActivityLog.objects.count(), 5)
+        self.project.refresh_from_db()
+        self.assertIsNotNone(self.project.last_activity_at)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with activity_buffer():
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        self._log("annulée")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                self._log("validée")
+        self.assertEqual(
+            list(ActivityLog.objects.values_list("description", flat=True)), ["validée"]
+        )
+
+    def test_bounded_buffer(self):
+        with activity_buffer(max_size=2) as buffer:
+            with self.captureOnCommitCallbacks(execute=True):
+                for index in range(5):
+                    self._log(f"e{index}")
+                # Au-delà de la limite, écrit dans la transaction en cours
+                self.assertEqual(len(buffer.pending), 2)
+                self.assertEqual(ActivityLog.objects.count(), 3)
+            self.assertEqual(buffer.committed, [])
+        self.assertEqual(ActivityLog.objects.count(), 5)
+
+    def test_rolled_back_savepoint_frees_buffer(self):
+        with activity_buffer(max_size=2) as buffer:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        self._log("annulée 1")
+                        self._log("annulée 2")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                # Les entrées annulées ne comptent plus dans la limite
+                self._log("validée 1")
+                self._log("validée 2")
+                self.assertEqual(len(buffer.pending), 2)
+                self.assertFalse(ActivityLog.objects.exists())
+        self.assertEqual(
+            sorted(ActivityLog.objects.values_list("description", flat=True)),
+            ["validée 1", "validée 2"],
+        )
+
+    @override_settings(ACTIVITY_LOG_SYNC=True)
+    def test_synchronous_mode(self):
+        with activity_buffer() as buffer:
+            self.assertIsNone(buffer)
+            self._log()
+            self.assertEqual(ActivityLog.objects.count(), 1)
+
+    def test_request_writes_activity_once_committed(self):
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post("/api/tasks/", {"project": self.project.id, "title": "T"})
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            ActivityLog.objects.filter(action_type=ActivityLog.ActionType.TASK_CREATED).count(), 1
+        )
+
+    def test_flush_error_after_commit_is_logged_not_raised(self):
+        self.client.force_authenticate(user=self.owner)
+        locked = OperationalError("database is locked")
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=locked):
+            with self.assertLogs("core.activity", "ERROR") as logs:
+                with self.captureOnCommitCallbacks(execute=True):
+                    resp = self.client.patch(
+                        f"/api/projects/{self.project.id}/", {"title": "Nouveau"}
+                    )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn("1 entrée(s) non écrite(s)", logs.output[0])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, "Nouveau")
+        self.assertFalse(ActivityLog.objects.exists())
+
+        # Lot perdu : l'ETag du projet change quand même (last_activity_at
+        # mis à jour dans la transaction du commentaire)
+        url = f"/api/projects/{self.project.id}/comments/"
+        etag = self.client.get(url).headers["ETag"]
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=locked):
+            with self.assertLogs("core.activity", "ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    resp = self.client.post(url, {"project": self.project.id, "content": "Salut"})
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(ActivityLog.objects.exists())
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        # Hors requête, l'erreur remonte à l'appelant
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=locked):
+            with self.assertRaises(OperationalError):
+                with activity_buffer():
+                    with self.captureOnCommitCallbacks(execute=True):
+                        self._log()
+
+
+class BulkTaskOperationsTest(APITestCase):
+    """
+    POST /api/tasks/bulk/ :
+    - création / statut / priorité / suppression, compteurs et journal à jour
+    - tout ou rien, erreurs par opération
+    - nombre de requêtes indépendant du nombre d'opérations
+    """
+
+    url = "/api/tasks/bulk/"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        self.other_project = Project.objects.create(title="Autre", owner=self.outsider)
+        self.tasks = [
+            Task.objects.create(project=self.project, title=f"T{index}") for index in range(3)
+        ]
+        self.client.force_authenticate(user=self.owner)
+
+    def _post(self, operations):
+        return self.client.post(self.url, {"operations": operations}, format="json")
+
+    def test_mixed_operations(self):
+        first, second, third = self.tasks
+        resp = self._post(
+            [
+                {"op": "create", "project": self.project.id, "title": "Nouvelle"},
+                {"op": "create", "project": self.project.id, "title": "Bloquée", "status": "blocked"},
+                {"op": "status", "id": first.id, "status": "done"},
+                {"op": "status", "id": second.id, "status": "blocked"},
+                {"op": "priority", "id": second.id, "priority": 1},
+                {"op": "delete", "id": third.id},
+            ]
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = resp.json()["results"]
+        self.assertEqual(
+            [r["op"] for r in results],
+            ["create", "create", "status", "status", "priority", "delete"],
+        )
+
+        blocked = Task.objects.get(pk=results[1]["id"])
+        self.assertIsNotNone(blocked.blocked_since)
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.priority), ("blocked", 1))
+        self.assertIsNotNone(second.blocked_since)
+        self.assertFalse(Task.objects.filter(pk=third.id).exists())
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.tasks_total, self.project.tasks_done, self.project.tasks_blocked),
+            (4, 1, 2),
+        )
+        self.assertEqual(ActivityLog.objects.filter(project=self.project).count(), 5)
+
+        # Sortie de blocage : blocked_since remis à zéro
+        self._post([{"op": "status", "id": second.id, "status": "todo"}])
+        second.refresh_from_db()
+        self.assertIsNone(second.blocked_since)
+
+    def test_errors_are_reported_per_item_and_nothing_is_applied(self):
+        hidden = Task.objects.create(project=self.other_project, title="Cachée")
+        resp = self._post(
+            [
+                {"op": "status", "id": self.tasks[0].id, "status": "done"},
+                {"op": "status", "id": self.tasks[1].id, "status": "inconnu"},
+                {"op": "delete", "id": hidden.id},
+                {"op": "create", "project": self.other_project.id, "title": "X"},
+                {"op": "create", "project": self.project.id},
+                {"op": "rename", "id": self.tasks[2].id},
+            ]
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = resp.json()["errors"]
+        self.assertEqual([e["index"] for e in errors], [1, 2, 3, 4, 5])
+        self.assertIn("title", errors[3]["errors"])
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, "todo")
+        self.assertTrue(Task.objects.filter(pk=hidden.id).exists())
+        self.assertEqual(ActivityLog.objects.count(), 0)
+
+        resp = self.client.post(self.url, {"operations": []}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_then_delete_same_task(self):
+        first, second, _ = self.tasks
+        resp = self._post(
+            [
+                {"op": "status", "id": first.id, "status": "done"},
+                {"op": "priority", "id": second.id, "priority": 1},
+                {"op": "delete", "id": first.id},
+            ]
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse(Task.objects.filter(pk=first.id).exists())
+        # Aucune entrée de journal vers la tâche supprimée (FK vérifiée au COMMIT)
+        connection.check_constraints()
+        self.assertEqual(
+            list(ActivityLog.objects.values_list("task_id", flat=True)), [second.id]
+        )
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.tasks_total, self.project.tasks_done), (2, 0))
+
+    def test_query_count_independent_of_operation_count(self):
+        def operations(count):
+            return [
+                {"op": "create", "project": self.project.id, "title": f"N{index}"}
+                for index in range(count)
+            ] + [{"op": "status", "id": task.id, "status": "in_progress"} for task in self.tasks]
+
+        with CaptureQueriesContext(connection) as small:
+            self._post(operations(2))
+        with CaptureQueriesContext(connection) as large:
+            self._post(operations(50))
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class ImportTest(APITestCase):
+    """
+    Import CSV / NDJSON (POST /api/import/ et commande import_projects) :
+    - projets et tâches créés par lots, compteurs à jour
+    - une entrée de journal par projet
+    - tout ou rien, erreurs par ligne
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.existing = Project.objects.create(title="Existant", owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def _upload(self, name, content):
+        return self.client.post(
+            "/api/import/",
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_ndjson_import(self):
+        lines = [
+            '{"type": "project", "ref": "p1", "title": "Mémoire", "end_date": "2026-06-30"}',
+            '{"type": "task", "project_ref": "p1", "title": "Plan", "priority": 1}',
+            '{"type": "task", "project_ref": "p1", "title": "Sources", "status": "blocked"}',
+            "",
+            '{"type": "project", "ref": "p2", "title": "Stage"}',
+            f'{{"type": "task", "project": {self.existing.id}, "title": "Relecture"}}',
+        ]
+        resp = self._upload("import.ndjson", "\n".join(lines))
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json(), {"projects_created": 2, "tasks_created": 3})
+
+        memoire = Project.objects.get(title="Mémoire")
+        self.assertEqual(memoire.owner, self.owner)
+        self.assertEqual((memoire.tasks_total, memoire.tasks_blocked), (2, 1))
+        self.assertIsNotNone(memoire.tasks.get(title="Sources").blocked_since)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.tasks_total, 1)
+        self.assertEqual(ActivityLog.objects.filter(project=memoire).count(), 1)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+
+    def test_errors_cancel_the_import(self):
+        hidden = Project.objects.create(title="Caché", owner=self.outsider)
+        content = (
+            "type,ref,project_ref,project,title,status\n"
+            "project,p1,,,Mémoire,\n"
+            "task,,p1,,Plan,inconnu\n"
+            f"task,,,{hidden.id},Intrus,\n"
+            "task,,p9,,Orpheline,\n"
+            "task,,p1,,Correcte,\n"
+        )
+        resp = self._upload("import.csv", content)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e["line"] for e in resp.json()["errors"]], [3, 4, 5])
+        self.assertFalse(Project.objects.filter(title="Mémoire").exists())
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_project_without_tasks_refreshes_supervisor_dashboard(self):
+        cache.clear()
+        teacher = User.objects.create_user(
+            username="teacher", email="teacher@test.com", password="pass", is_staff=True
+        )
+        self.client.force_authenticate(user=teacher)
+        self.assertEqual(
+            self.client.get("/api/dashboard/student").json()["summary"]["total_projects"], 0
+        )
+
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self._upload(
+                "import.ndjson",
+                f'{{"type": "project", "title": "Sans tâche", "supervisor": {teacher.id}}}\n',
+            )
+        self.assertEqual(resp.json(), {"projects_created": 1, "tasks_created": 0})
+        self.client.force_authenticate(user=teacher)
+        self.assertEqual(
+            self.client.get("/api/dashboard/student").json()["summary"]["total_projects"], 1
+        )
+
+    def test_management_command_csv(self):
+        content = "type,ref,project_ref,title\nproject,p1,,Mémoire\n" + "".join(
+            f"task,,p1,Tâche {index}\n" for index in range(25)
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        out = StringIO()
+        call_command(
+            "import_projects", handle.name, owner=self.owner.email, chunk_size=10, stdout=out
+        )
+        self.assertIn("25 tâche(s)", out.getvalue())
+        project = Project.objects.get(title="Mémoire")
+        self.assertEqual(project.tasks_total, 25)
+        self.assertEqual(ActivityLog.objects.filter(project=project).count(), 1)
+
+    def test_bounded_refs_and_summary(self):
+        rows = []
+        for index in range(5):
+            rows.append({"type": "project", "ref": f"p{index}", "title": f"P{index}"})
+            rows += [{"type": "task", "project_ref": f"p{index}", "title": "T"}] * 2
+        rows = list(enumerate(rows, start=1))
+        importer = ProjectImporter(self.owner, chunk_size=2, ref_window=2)
+        with mock.patch.object(importer, "write_summary", wraps=importer.write_summary) as summary:
+            result = importer.run(iter(rows))
+        self.assertEqual(result, {"projects_created": 5, "tasks_created": 10})
+        # Récapitulatif écrit en cours d'import, au plus chunk_size projets à la fois
+        self.assertGreater(summary.call_count, 2)
+        self.assertEqual(importer.summary, {})
+        self.assertEqual(list(importer.refs), ["p3", "p4"])
+        for project in Project.objects.filter(title__startswith="P"):
+            self.assertEqual(project.tasks_total, 2)
+            descriptions = ActivityLog.objects.filter(project=project).values_list(
+                "description", flat=True
+            )
+            self.assertEqual(
+                list(descriptions), [f"Projet « {project.title} » importé (2 tâche(s))"]
+            )
+
+        # Référence sortie de la fenêtre : erreur de ligne, rien d'inséré
+        rows = [
+            (1, {"type": "project", "ref": "a", "title": "A"}),
+            (2, {"type": "project", "ref": "b", "title": "B"}),
+            (3, {"type": "project", "ref": "c", "title": "C"}),
+            (4, {"type": "task", "project_ref": "a", "title": "T"}),
+        ]
+        with self.assertRaises(ImportFailed) as failed:
+            ProjectImporter(self.owner, chunk_size=2, ref_window=2).run(iter(rows))
+        self.assertEqual([e["line"] for e in failed.exception.errors], [4])
+        self.assertFalse(Project.objects.filter(title="A").exists())
+
+    def test_management_command_rejects_owner_as_supervisor(self):
+        teacher = User.objects.create_user(
+            username="teacher", email="teacher@test.com", password="pass", is_staff=True
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as handle:
+            handle.write(f'{{"type": "project", "title": "Auto", "supervisor": {teacher.id}}}\n')
+        self.addCleanup(os.remove, handle.name)
+        err = StringIO()
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_projects", handle.name, owner=teacher.email, stdout=StringIO(), stderr=err
+            )
+        self.assertIn("ligne 1", err.getvalue())
+        self.assertIn("supervisor", err.getvalue())
+        self.assertFalse(Project.objects.filter(title="Auto").exists())
+
+
+class ExportTest(APITestCase):
+    """Export en flux du journal et des tâches (NDJSON / CSV)."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        for index in range(3):
+            Task.objects.create(project=self.project, title=f"T{index}", priority=index + 1)
+            ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.TASK_CREATED,
+                description=f"Tâche « T{index} » créée",
+                metadata={"task_id": index},
+            )
+        self.client.force_authenticate(user=self.owner)
+
+    def _content(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        return b"".join(resp.streaming_content).decode()
+
+    def test_activity_ndjson(self):
+        lines = self._content(
+            f"/api/projects/{self.project.id}/activity/export.ndjson"
+        ).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [r["description"] for r in rows], [f"Tâche « T{i} » créée" for i in range(3)]
+        )
+        self.assertEqual(rows[0]["actor__email"], "owner@test.com")
+        self.assertEqual(rows[2]["metadata"], {"task_id": 2})
+
+    def test_tasks_csv(self):
+        content = self._content(f"/api/projects/{self.project.id}/tasks/export.csv")
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([r["title"] for r in rows], ["T0", "T1", "T2"])
+        self.assertEqual(rows[1]["priority"], "2")
+        self.assertEqual(rows[0]["due_date"], "")
+
+    def test_constant_query_count_and_access(self):
+        with self.assertNumQueries(2):
+            self._content(f"/api/projects/{self.project.id}/tasks/export.ndjson")
+        resp = self.client.get(f"/api/projects/{self.project.id}/tasks/export.xml")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.outsider)
+        resp = self.client.get(f"/api/projects/{self.project.id}/activity/export.csv")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_streamed_under_asgi(self):
+        from core.export import task_rows
+
+        pulled = []
+
+        def counted_rows(project_id):
+            for row in task_rows(project_id):
+                pulled.append(row["id"])
+                yield row
+
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.owner)}"}
+        url = f"/api/projects/{self.project.id}/tasks/export.ndjson"
+        with mock.patch("core.views.task_rows", counted_rows), mock.patch(
+            "core.export.ROWS_PER_WRITE", 1
+        ):
+            resp = await self.async_client.get(url, headers=headers)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            # Un flux synchrone serait lu en entier par le handler ASGI avant l'envoi
+            self.assertTrue(resp.is_async)
+            chunks = aiter(resp.streaming_content)
+            first = await anext(chunks)
+            self.assertEqual(json.loads(first)["title"], "T0")
+            self.assertEqual(len(pulled), 1)
+            rest = [chunk async for chunk in chunks]
+        self.assertEqual(len(rest), 2)
+        self.assertEqual(len(pulled), 3)
+
+
+class EventStreamTest(APITestCase):
+    """
+    Flux SSE /api/events/ :
+    - compteur de demandes en attente et journal poussés aux bons utilisateurs
+    - reprise par Last-Event-ID, reset si impossible
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", email="staff@test.com", password="pass", is_staff=True
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+
+    def test_resume_from_last_event_id(self):
+        events = EventBroker(backlog=3)
+        for index in range(5):
+            events.publish("activity", {"n": index}, [self.owner.id])
+        events.publish("activity", {"n": "autre"}, [self.staff_user.id])
+        resumed = events.since(f"{events.boot}-3", self.owner.id)
+        self.assertEqual([e.data["n"] for e in resumed], [3, 4])
+        # Sorti de la mémoire tampon, ou autre démarrage : reprise impossible
+        self.assertIsNone(events.since(f"{events.boot}-1", self.owner.id))
+        self.assertIsNone(events.since("autre-5", self.owner.id))
+
+    def test_writes_publish_after_commit(self):
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/projects/{self.project.id}/supervision-requests/",
+                {"requested_supervisor": self.staff_user.id},
+            )
+        kinds = {event.kind: event for event in list(broker.backlog)[-2:]}
+        self.assertEqual(kinds["pending_count"].data, {"count": 1})
+        self.assertEqual(kinds["pending_count"].user_ids, {self.staff_user.id})
+        self.assertEqual(kinds["activity"].data["project"], self.project.id)
+        self.assertEqual(kinds["activity"].user_ids, {self.owner.id})
+
+    def test_requires_asgi(self):
+        resp = self.client.get("/api/events/")
+        self.assertEqual(resp.status_code, 501)
+
+    def test_stream_token(self):
+        self.client.force_authenticate(user=self.owner)
+        resp = self.client.post("/api/events/token/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["expires_in"], 60)
+        token = resp.json()["token"]
+        self.assertEqual(StreamToken(token)["user_id"], str(self.owner.id))
+
+        # Jeton de flux refusé comme jeton d'accès
+        self.client.force_authenticate(user=None)
+        resp = self.client.get("/api/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_stream(self):
+        token = str(StreamToken.for_user(self.staff_user))
+        resp = await self.async_client.get(f"/api/events/?token={token}")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        chunks = aiter(resp.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 5000\n\n")
+        initial = (await anext(chunks)).decode()
+        self.assertIn("event: pending_count", initial)
+        self.assertIn('"count": 0', initial)
+
+        broker.publish("activity", {"description": "hors sujet"}, [self.owner.id])
+        event = broker.publish("activity", {"description": "pour moi"}, [self.staff_user.id])
+        received = (await asyncio.wait_for(anext(chunks), 2)).decode()
+        self.assertIn(f"id: {broker.event_id(event)}", received)
+        self.assertIn("pour moi", received)
+        await chunks.aclose()
+
+        resumed = await self.async_client.get(
+            f"/api/events/?token={token}", headers={"Last-Event-ID": "inconnu-1"}
+        )
+        chunks = aiter(resumed.streaming_content)
+        await anext(chunks)
+        self.assertIn("event: reset", (await anext(chunks)).decode())
+        await chunks.aclose()
+
+        expired = StreamToken.for_user(self.staff_user)
+        expired.set_exp(lifetime=-timedelta(seconds=1))
+        for rejected in ("invalide", AccessToken.for_user(self.staff_user), expired):
+            denied = await self.async_client.get(f"/api/events/?token={rejected}")
+            self.assertEqual(denied.status_code, 401)
+
+
+class AsyncViewsTest(APITransactionTestCase):
+    """
+    Lectures async /api/async/ : mêmes réponses que les vues DRF (GET
+    conditionnel, négociation, permissions), lectures indépendantes en
+    parallèle ; chaîne de middlewares non adaptée sous ASGI.
+    (TransactionTestCase : les lectures passent par d'autres connexions.)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        for index in range(3):
+            Task.objects.create(project=self.project, title=f"Tâche {index}")
+            Comment.objects.create(project=self.project, author=self.owner, content=f"c{index}")
+        log_activity(
+            self.project, self.owner, ActivityLog.ActionType.PROJECT_UPDATED, "Modifié"
+        )
+        SupervisionRequest.objects.create(project=self.project, requested_supervisor=self.owner)
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.owner)}"}
+
+    def _sync(self, url, user=None):
+        self.client.force_authenticate(user=user or self.owner)
+        return self.client.get(url)
+
+    async def _async(self, url, user_headers=None):
+        return await self.async_client.get(url, headers=user_headers or self.headers)
+
+    async def test_same_payload_as_sync_views(self):
+        for sync_url, async_url in [
+            (f"/api/projects/{self.project.id}/bundle/?tasks_limit=2",
+             f"/api/async/projects/{self.project.id}/bundle/?tasks_limit=2"),
+            ("/api/projects/", "/api/async/projects/"),
+        ]:
+            expected = await asyncio.to_thread(self._sync, sync_url)
+            resp = await self._async(async_url)
+            self.assertEqual(resp.status_code, 200, async_url)
+            self.assertEqual(resp.content, expected.content, async_url)
+
+        expected = (await asyncio.to_thread(self._sync, "/api/dashboard/student")).json()
+        data = (await self._async("/api/async/dashboard/student")).json()
+        self.assertEqual(data.pop("pending_supervision_requests"), 1)
+        self.assertEqual(data, expected)
+
+    async def test_conditional_get_and_negotiation(self):
+        url = f"/api/async/projects/{self.project.id}/bundle/"
+        resp = await self._async(url)
+        self.assertEqual(resp["Cache-Control"], "private, no-cache")
+        resp = await self._async(url, {**self.headers, "If-None-Match": resp["ETag"]})
+        self.assertEqual(resp.status_code, 304)
+        # Validateurs changés : réponse complète
+        await Task.objects.acreate(project=self.project, title="Nouvelle")
+        resp = await self._async(url, {**self.headers, "If-None-Match": resp["ETag"]})
+        self.assertEqual(resp.status_code, 200)
+
+        if find_spec("msgpack"):
+            import msgpack
+
+            resp = await self._async(url, {**self.headers, "Accept": "application/msgpack"})
+            self.assertEqual(resp["Content-Type"], "application/msgpack")
+            self.assertEqual(msgpack.unpackb(resp.content)["project"]["title"], "Projet")
+        resp = await self._async(url, {**self.headers, "Accept": "application/xml"})
+        self.assertEqual(resp.status_code, 406)
+
+    async def test_errors(self):
+        resp = await self.async_client.get("/api/async/projects/")
+        self.assertEqual(resp.status_code, 401)
+        # Jeton d'accès dans l'URL : refusé hors du flux
+        resp = await self.async_client.get(
+            f"/api/async/projects/?token={AccessToken.for_user(self.owner)}"
+        )
+        self.assertEqual(resp.status_code, 401)
+        other = {"Authorization": f"Bearer {AccessToken.for_user(self.other)}"}
+        bundle = f"projects/{self.project.id}/bundle/"
+        resp = await self._async(f"/api/async/{bundle}", other)
+        expected = await asyncio.to_thread(self._sync, f"/api/{bundle}", self.other)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json(), expected.json())
+        resp = await self._async(f"/api/async/{bundle}?tasks_limit=abc")
+        self.assertEqual(resp.status_code, 400)
+        # Limite invalide sur un projet invisible : 404, pas 400
+        resp = await self._async(f"/api/async/{bundle}?tasks_limit=abc", other)
+        self.assertEqual(resp.status_code, 404)
+        expected = await asyncio.to_thread(
+            self._sync, f"/api/{bundle}?tasks_limit=abc", self.other
+        )
+        self.assertEqual(expected.status_code, 404)
+        resp = await self.async_client.post("/api/async/projects/", headers=self.headers)
+        self.assertEqual(resp.status_code, 405)
+
+    async def test_independent_reads_run_concurrently(self):
+        import threading
+
+        from core import async_views
+
+        # Chaque lecture attend l'autre : lancées l'une après l'autre, la barrière expire
+        barrier = threading.Barrier(2, timeout=5)
+
+        def waiting(func):
+            def read(*args):
+                barrier.wait()
+                return func(*args)
+
+            return read
+
+        with mock.patch.object(
+            async_views, "cached_dashboard", waiting(async_views.cached_dashboard)
+        ), mock.patch.object(async_views, "pending_count", waiting(async_views.pending_count)):
+            resp = await self._async("/api/async/dashboard/student")
+        self.assertEqual(resp.status_code, 200)
+
+    @override_settings(DEBUG=True)
+    def test_middleware_chain_not_adapted_under_asgi(self):
+        from django.core.handlers.asgi import ASGIHandler
+
+        # "Asynchronous handler adapted for middleware ..." si un middleware est synchrone
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    async def test_sync_view_activity_buffered_under_asgi(self):
+        resp = await self.async_client.patch(
+            f"/api/projects/{self.project.id}/",
+            {"title": "Renommé"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(
+            await ActivityLog.objects.filter(description="Projet « Renommé » modifié").aexists()
+        )
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    """Profils gradely.database : réglages SQLite par connexion, pool PostgreSQL."""
+
+    databases = {"default"}
+
+    def test_sqlite_connection_is_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_profiles_from_environment(self):
+        basic = database_config({"DB_PROFILE": "sqlite-basic"}, base_dir=Path("/tmp"))
+        self.assertNotIn("OPTIONS", basic)
+
+        postgres = database_config({"DB_PROFILE": "postgres", "POSTGRES_HOST": "db"})
+        self.assertEqual(postgres["HOST"], "db")
+        self.assertTrue(postgres["CONN_HEALTH_CHECKS"])
+        self.assertGreater(postgres["CONN_MAX_AGE"], 0)
+
+        pooled = database_config(
+            {"DB_PROFILE": "postgres", "DB_POOL": "1", "DB_POOL_MAX_SIZE": "20"}
+        )
+        self.assertEqual(pooled["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertEqual(pooled["CONN_MAX_AGE"], 0)
+
+        with self.assertRaises(ImproperlyConfigured):
+            database_config({"DB_PROFILE": "mysql"})
+        with self.assertRaises(ImproperlyConfigured):
+            database_config({"SQLITE_BUSY_TIMEOUT": "long"}, base_dir=Path("/tmp"))
+
+
+class ProjectMembershipTest(APITestCase):
+    """core.membership : une requête par lot de projets, réponses mémorisées."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.supervisor = User.objects.create_user(
+            username="sup", email="sup@test.com", password="pass", is_staff=True
+        )
+        self.owned = Project.objects.create(
+            title="Mien", owner=self.owner, supervisor=self.supervisor
+        )
+        self.other = Project.objects.create(title="Autre", owner=self.supervisor)
+
+    def test_batch_and_memoized(self):
+        membership = ProjectMembership(self.owner)
+        with self.assertNumQueries(1):
+            members = membership.member_projects([self.owned.id, self.other.id, 999])
+        self.assertEqual(members, {self.owned.id})
+        with self.assertNumQueries(0):
+            self.assertTrue(membership.is_owner(self.owned.id))
+            self.assertFalse(membership.is_member(self.other.id))
+            self.assertFalse(membership.exists(999))
+        self.assertEqual(ProjectMembership(self.supervisor).role(self.owned.id), "supervisor")
+
+    def test_task_permission_uses_loaded_project(self):
+        task = Task.objects.create(project=self.owned, title="Tâche")
+        self.client.force_authenticate(user=self.supervisor)
+        with self.assertNumQueries(1):
+            resp = self.client.get(f"/api/tasks/{task.id}/")
+        self.assertEqual(resp.status_code, 200)
+
+    def test_nested_lists_hidden_from_non_members(self):
+        self.client.force_authenticate(user=self.owner)
+        for url in (
+            f"/api/projects/{self.other.id}/comments/",
+            f"/api/projects/{self.other.id}/activity/",
+            f"/api/projects/{self.other.id}/supervision-requests/",
+        ):
+            resp = self.client.get(url)
+            data = resp.json()
+            self.assertEqual(data["results"] if isinstance(data, dict) else data, [], url)
+        resp = self.client.post(
+            f"/api/projects/{self.other.id}/comments/",
+            {"project": self.other.id, "content": "Intrus"},
+        )
+        self.assertEqual(resp.status_code, 403)
+
+
+class ActivityRetentionTest(APITestCase):
+    """
+    Archivage du journal (core.retention) :
+    - entrées anciennes déplacées par lots, avec leur id
+    - liste paginée et export continuent dans l'archive
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        now = timezone.now()
+        for index in range(12):
+            entry = ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.TASK_UPDATED,
+                description=f"Entrée {index}",
+                metadata={"n": index},
+            )
+            # 8 entrées de plus d'un an, 4 récentes
+            age = timedelta(days=400 - index) if index < 8 else timedelta(days=12 - index)
+            ActivityLog.objects.filter(pk=entry.pk).update(created_at=now - age)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_archive_in_chunks(self):
+        ids = list(ActivityLog.objects.order_by("id").values_list("id", flat=True))
+        out = StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("archive_activity", "--chunk-size", "3", stdout=out)
+        deletes = [q for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)  # 3 lots de 3 au plus
+        self.assertIn("8 entrée(s)", out.getvalue())
+        self.assertEqual(
+            list(ArchivedActivityLog.objects.order_by("id").values_list("id", flat=True)), ids[:8]
+        )
+        self.assertEqual(ActivityLog.objects.count(), 4)
+        self.assertEqual(ArchivedActivityLog.objects.get(pk=ids[0]).metadata, {"n": 0})
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN est propre à SQLite")
+    def test_chunk_query_walks_created_index(self):
+        from core.retention import archive_chunk, retention_cutoff
+
+        with CaptureQueriesContext(connection) as ctx:
+            archive_chunk(retention_cutoff(), chunk_size=3)
+        select = next(q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT"))
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + select)
+            plan = " | ".join(row[3] for row in cursor.fetchall())
+        # Ni parcours de la table ni tri : le lot de fin ne lit rien de plus
+        self.assertIn("activity_created_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_list_and_export_read_archive(self):
+        expected = [f"Entrée {index}" for index in reversed(range(12))]
+        call_command("archive_activity", stdout=StringIO())
+
+        descriptions = []
+        url = f"/api/projects/{self.project.id}/activity/?page_size=5"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            descriptions += [row["description"] for row in resp.json()["results"]]
+            url = resp.json()["next"]
+        self.assertEqual(descriptions, expected)
+
+        resp = self.client.get(f"/api/projects/{self.project.id}/activity/export.ndjson")
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["description"] for line in lines], expected[::-1])
+
+
+class TaskHistoryTest(APITestCase):
+    """Référence typée ActivityLog.task, reprise des anciennes entrées, /api/tasks/<id>/history/."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_history_endpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task_id = self.client.post(
+                "/api/tasks/", {"project": self.project.id, "title": "A"}
+            ).json()["id"]
+            self.client.post("/api/tasks/", {"project": self.project.id, "title": "B"})
+            self.client.patch(f"/api/tasks/{task_id}/", {"status": "done"})
+
+        # Tâche, entrées récentes, entrées archivées
+        with self.assertNumQueries(3):
+            resp = self.client.get(f"/api/tasks/{task_id}/history/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = resp.json()["results"]
+        self.assertEqual(
+            [entry["action_type"] for entry in results],
+            [ActivityLog.ActionType.TASK_UPDATED, ActivityLog.ActionType.TASK_CREATED],
+        )
+        self.assertEqual({entry["task"] for entry in results}, {task_id})
+        self.assertEqual(results[0]["metadata"], {"task_id": task_id})
+
+        self.client.force_authenticate(user=self.outsider)
+        resp = self.client.get(f"/api/tasks/{task_id}/history/")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_backfill_from_metadata(self):
+        from django.apps import apps
+
+        task = Task.objects.create(project=self.project, title="A")
+        request = SupervisionRequest.objects.create(
+            project=self.project, requested_supervisor=self.outsider
+        )
+        entries = [
+            ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                action_type=ActivityLog.ActionType.TASK_UPDATED,
+                description="Ancienne entrée",
+                metadata=metadata,
+            )
+            for metadata in (
+                {"task_id": task.id},
+                {"supervision_request_id": request.id},
+                {"task_id": 99999},
+                {},
+            )
+        ]
+        migration = importlib.import_module("core.migrations.0016_activity_task_reference")
+        migration.backfill_references(apps, mock.Mock(connection=connection))
+
+        refs = [
+            ActivityLog.objects.values_list("task_id", "supervision_request_id").get(pk=e.pk)
+            for e in entries
+        ]
+        self.assertEqual(refs, [(task.id, None), (None, request.id), (None, None), (None, None)])
+
+
+class SearchTest(APITestCase):
+    """
+    GET /api/search/ (core.search) :
+    - préfixes, sans accents, projets / tâches / commentaires
+    - uniquement les projets accessibles (owner ou superviseur)
+    - index à jour après création, modification, suppression et bulk
+    - reconstruction complète
+    """
+
+    url = "/api/search/"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.supervisor = User.objects.create_user(
+            username="prof", email="prof@test.com", password="pass", is_staff=True
+        )
+        self.outsider = User.objects.create_user(
+            username="outsider", email="outsider@test.com", password="pass"
+        )
+        self.project = Project.objects.create(
+            title="Rapport d'étape",
+            description="Analyse des données",
+            owner=self.owner,
+            supervisor=self.supervisor,
+        )
+        self.task = Task.objects.create(
+            project=self.project, title="Écrire l'introduction", description="Première étape"
+        )
+        self.comment = Comment.objects.create(
+            project=self.project, author=self.owner, content="Bonne étape, continuer l'analyse"
+        )
+        Project.objects.create(title="Étape secrète", owner=self.outsider)
+        self.client.force_authenticate(user=self.owner)
+
+    def _search(self, q, **params):
+        resp = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [(r["type"], r["id"]) for r in resp.json()["results"]]
+
+    def test_prefix_and_accents(self):
+        self.assertEqual(
+            sorted(self._search("ETAP")),
+            [
+                ("comment", self.comment.id),
+                ("project", self.project.id),
+                ("task", self.task.id),
+            ],
+        )
+        self.assertEqual(self._search("ecrire intro"), [("task", self.task.id)])
+        self.assertEqual(self._search("analy", type="comment"), [("comment", self.comment.id)])
+        self.assertEqual(len(self._search("étape", limit=1)), 1)
+
+    def test_access_filter(self):
+        self.client.force_authenticate(user=self.supervisor)
+        self.assertEqual(len(self._search("etape")), 3)
+        self.client.force_authenticate(user=self.outsider)
+        results = self._search("etape")
+        self.assertEqual([kind for kind, _ in results], ["project"])
+        self.assertNotIn(self.project.id, [object_id for _, object_id in results])
+
+    def test_incremental_updates(self):
+        self.task.title = "Relire le plan"
+        self.task.save()
+        self.assertEqual(self._search("relire"), [("task", self.task.id)])
+        self.assertEqual(self._search("introduction"), [])
+
+        self.comment.delete()
+        self.assertEqual(self._search("continuer"), [])
+
+        resp = self.client.post(
+            "/api/tasks/bulk/",
+            {"operations": [{"op": "create", "project": self.project.id, "title": "Bibliographie"}]},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._search("biblio"), [("task", resp.json()["results"][0]["id"])])
+
+        self.project.delete()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM core_search WHERE project_id = %s", [self.project.id])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_save_without_indexed_change_does_not_reindex(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.patch(f"/api/tasks/{self.task.id}/", {"status": "done"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries.captured_queries if "core_search" in q["sql"]])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "Conclusion"})
+        self.assertTrue([q for q in queries.captured_queries if "core_search" in q["sql"]])
+        self.assertEqual(self._search("conclusion"), [("task", self.task.id)])
+
+        # Valeurs chargées suivies après refresh_from_db
+        task = Task.objects.get(pk=self.task.pk)
+        other = Task.objects.get(pk=self.task.pk)
+        other.title = "Annexes"
+        other.save()
+        task.refresh_from_db()
+        task.title = "Conclusion"
+        task.save()
+        self.assertEqual(self._search("conclusion"), [("task", self.task.id)])
+
+    def test_project_delete_clears_index_in_one_query(self):
+        def project_with(tasks, comments):
+            project = Project.objects.create(title="Gros projet", owner=self.owner)
+            created = Task.objects.bulk_create(
+                Task(project=project, title=f"Tâche {index}") for index in range(tasks)
+            )
+            created += Comment.objects.bulk_create(
+                Comment(project=project, author=self.owner, content=f"Avis {index}")
+                for index in range(comments)
+            )
+            index_objects(created)
+            return project
+
+        for tasks, comments in ((2, 1), (200, 50)):
+            project = project_with(tasks, comments)
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.client.delete(f"/api/projects/{project.id}/")
+            self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+            search_queries = [q for q in queries.captured_queries if "core_search" in q["sql"]]
+            self.assertEqual(len(search_queries), 1)
+            # Requêtes groupées (Django supprime par lots de 100 ids)
+            self.assertLessEqual(len(queries.captured_queries), 15)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM core_search WHERE project_id = %s", [project.id])
+                self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(len(self._search("etape")), 3)
+
+    def test_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM core_search")
+        self.assertEqual(self._search("etape"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", "--chunk-size", "2", stdout=out)
+        self.assertIn("4 document(s)", out.getvalue())
+        self.assertEqual(len(self._search("etape")), 3)
+
+    def test_invalid_params(self):
+        for params in ({}, {"q": "  "}, {"q": "x", "type": "user"}, {"q": "x", "limit": "a"}):
+            resp = self.client.get(self.url, params)
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._search("\"*'"), [])
+
+
+class RowSerializerTest(APITestCase):
+    """
+    Listes en lignes values() (core.rows) : corps identique octet pour octet à
+    celui des serializers DRF, dates à la microseconde, champs nuls et
+    direction des demandes compris.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.supervisor = User.objects.create_user(
+            username="prof", email="prof@test.com", password="pass", is_staff=True
+        )
+        self.project = Project.objects.create(
+            title="Projet « été »", owner=self.owner, supervisor=self.supervisor
+        )
+        self.task = Task.objects.create(project=self.project, title="A")
+        self.request = SupervisionRequest.objects.create(
+            project=self.project, requested_supervisor=self.supervisor, message="Bonjour"
+        )
+        for index, metadata in enumerate(({"task_id": self.task.id, "note": "é"}, {})):
+            ActivityLog.objects.create(
+                project=self.project,
+                actor=self.owner,
+                task=self.task if metadata else None,
+                supervision_request=None if metadata else self.request,
+                action_type=ActivityLog.ActionType.TASK_UPDATED,
+                description=f"Entrée {index}",
+                metadata=metadata,
+            )
+        ArchivedActivityLog.objects.create(
+            id=1000,
+            project=self.project,
+            actor=self.owner,
+            action_type=ActivityLog.ActionType.PROJECT_CREATED,
+            description="Archivée",
+            created_at=timezone.now() - timedelta(days=400),
+        )
+        Comment.objects.create(project=self.project, author=self.supervisor, content="Très bien")
+
+    def _assert_same(self, url, serializer_class, queryset, user, paginated=True):
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        self.client.force_authenticate(user=user)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        request = Request(APIRequestFactory().get(url))
+        request.user = user
+        data = serializer_class(queryset, many=True, context={"request": request}).data
+        if paginated:
+            data = {"next": None, "results": data}
+        self.assertEqual(resp.content, JSONRenderer().render(data))
+
+    def test_same_output_as_serializers(self):
+        from itertools import chain
+
+        activity = chain(
+            ActivityLog.objects.filter(project=self.project).order_by("-created_at", "-id"),
+            ArchivedActivityLog.objects.filter(project=self.project),
+        )
+        self._assert_same(
+            f"/api/projects/{self.project.id}/activity/",
+            ActivityLogSerializer,
+            list(activity),
+            self.owner,
+        )
+        self._assert_same(
+            f"/api/tasks/{self.task.id}/history/",
+            ActivityLogSerializer,
+            ActivityLog.objects.filter(task=self.task),
+            self.owner,
+        )
+        self._assert_same(
+            f"/api/projects/{self.project.id}/comments/",
+            CommentSerializer,
+            Comment.objects.filter(project=self.project),
+            self.owner,
+        )
+        self.request.status = SupervisionRequest.Status.DECLINED
+        self.request.responded_at = timezone.now()
+        self.request.save()
+        for user in (self.owner, self.supervisor):
+            self._assert_same(
+                "/api/supervision-requests/",
+                SupervisionRequestSerializer,
+                SupervisionRequest.objects.all(),
+                user,
+            )
+        self._assert_same(
+            f"/api/projects/{self.project.id}/supervision-requests/",
+            SupervisionRequestSerializer,
+            SupervisionRequest.objects.all(),
+            self.owner,
+            paginated=False,
+        )
+
+    def test_one_query_per_list(self):
+        self.client.force_authenticate(user=self.owner)
+        # Accès au projet, puis les lignes avec emails et titre joints
+        with self.assertNumQueries(2):
+            resp = self.client.get(f"/api/projects/{self.project.id}/supervision-requests/")
+        self.assertEqual(resp.json()[0]["owner_email"], "owner@test.com")
+        with self.assertNumQueries(1):
+            self.client.get("/api/supervision-requests/")
+
+
+class RendererTest(APITestCase):
+    """
+    core.renderers : JSON par orjson identique octet pour octet à JSONRenderer,
+    parser JSON strict, MessagePack négocié par Accept (si installé).
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet « été »", owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_same_bytes_as_drf(self):
+        from decimal import Decimal
+
+        from django.utils.translation import gettext_lazy
+        from rest_framework.exceptions import ErrorDetail
+        from rest_framework.renderers import JSONRenderer
+
+        from core.renderers import ORJSONRenderer
+
+        data = {
+            "created_at": timezone.now().replace(microsecond=123456),
+            "naive": timezone.now().replace(tzinfo=None),
+            "due_date": date(2026, 1, 31),
+            "grade": Decimal("15.50"),
+            "label": gettext_lazy("Projet"),
+            "error": ErrorDetail("Invalide", code="invalid"),
+            "text": "ligne\u2028suivante\u2029é",
+            1: [None, True, 1.5, (1, 2)],
+            "projects": ProjectSerializer([self.project], many=True).data,
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = ORJSONRenderer().render(data, renderer_context={"indent": 4})
+        self.assertEqual(indented, JSONRenderer().render(data, renderer_context={"indent": 4}))
+
+        resp = self.client.get("/api/projects/")
+        self.assertEqual(resp["Content-Type"], "application/json")
+        self.assertEqual(resp.content, JSONRenderer().render(resp.data))
+
+    def test_parser(self):
+        from io import BytesIO
+
+        from rest_framework.exceptions import ParseError
+
+        from core.renderers import ORJSONParser
+
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"title":"été"}'.encode())), {"title": "été"})
+        latin1 = BytesIO('{"title":"été"}'.encode("latin-1"))
+        self.assertEqual(
+            parser.parse(latin1, parser_context={"encoding": "latin-1"}), {"title": "été"}
+        )
+        for body in (b"{", b'{"a": NaN}', b"\xff"):
+            with self.assertRaises(ParseError):
+                parser.parse(BytesIO(body))
+
+        resp = self.client.post("/api/tasks/", b"{", content_type="application/json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(find_spec("msgpack"), "msgpack non installé")
+    def test_msgpack(self):
+        import msgpack
+
+        Task.objects.create(project=self.project, title="A", due_date=date(2026, 1, 31))
+        resp = self.client.get("/api/tasks/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(resp["Content-Type"], "application/msgpack")
+        body = msgpack.unpackb(resp.content, raw=False, timestamp=3)
+        self.assertEqual(body["results"][0]["title"], "A")
+        self.assertEqual(body["results"][0]["due_date"], "2026-01-31")
+
+        resp = self.client.post(
+            "/api/tasks/",
+            msgpack.packb({"project": self.project.id, "title": "B"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json()["title"], "B")
+
+
+@override_settings(COMPRESSION_MIN_SIZE=500)
+class CompressionTest(APITestCase):
+    """
+    core.middleware.CompressionMiddleware : seuil, Accept-Encoding, flux
+    compressés morceau par morceau, Vary et ETag faible avec GET conditionnel.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@test.com", password="pass"
+        )
+        self.project = Project.objects.create(title="Projet", owner=self.owner)
+        Task.objects.bulk_create(
+            Task(project=self.project, title=f"Tâche {i}", description="Relire le chapitre")
+            for i in range(20)
+        )
+        self.client.force_authenticate(user=self.owner)
+
+    def test_gzip_above_threshold(self):
+        import gzip
+
+        plain = self.client.get("/api/tasks/")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        resp = self.client.get("/api/tasks/", HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0.8")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(int(resp["Content-Length"]), len(resp.content))
+        self.assertLess(len(resp.content), len(plain.content))
+        self.assertEqual(gzip.decompress(resp.content), plain.content)
+
+        small = self.client.get("/api/me/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(small.has_header("Content-Encoding"))
+        # Sous le seuil aussi : un cache ne doit pas resservir cette variante
+        self.assertIn("Accept-Encoding", small["Vary"])
+
+        refused = self.client.get("/api/tasks/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(refused.has_header("Content-Encoding"))
+
+    def test_streaming_chunks(self):
+        import zlib
+
+        url = f"/api/projects/{self.project.id}/tasks/export.ndjson"
+        plain = b"".join(self.client.get(url).streaming_content)
+        with mock.patch("core.export.ROWS_PER_WRITE", 5):
+            resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(resp["Content-Encoding"], "gzip")
+            self.assertFalse(resp.has_header("Content-Length"))
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            chunks = [decompressor.decompress(chunk) for chunk in resp.streaming_content]
+        # Chaque morceau compressé se décompresse sans attendre la fin du flux
+        self.assertTrue(chunks[0].endswith(b"\n"))
+        self.assertEqual(b"".join(chunks), plain)
+
+    def test_weak_etag_conditional_get(self):
+        url = f"/api/projects/{self.project.id}/bundle/"
+        resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        etag = resp["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("Accept-Encoding", resp["Vary"])
+
+        resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        # La 304 porte le validateur de la 200 compressée
+        self.assertEqual(resp["ETag"], etag)
+        self.assertIn("Accept-Encoding", resp["Vary"])
+
+        # Sans encodage accepté : ETag fort, sur la 200 comme sur la 304
+        plain = self.client.get(url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(plain["ETag"], etag[2:])
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=plain["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["ETag"], plain["ETag"])
+
+    def test_weak_etag_below_threshold(self):
+        # Corps sous le seuil, donc non compressé : même ETag faible que la 304
+        with self.settings(COMPRESSION_MIN_SIZE=10**7):
+            url = f"/api/projects/{self.project.id}/bundle/"
+            resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+            self.assertFalse(resp.has_header("Content-Encoding"))
+            etag = resp["ETag"]
+            self.assertTrue(etag.startswith('W/"'))
+            resp = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(resp["ETag"], etag)
+
+    def test_html_with_csrf_token_not_compressed(self):
+        resp = self.client.get("/admin/login/", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(resp.content), 500)
+        self.assertIn(b"csrfmiddlewaretoken", resp.content)
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    def test_encoding_choice(self):
+        from django.http import StreamingHttpResponse
+        from django.test import RequestFactory
+
+        from core import middleware
+
+        self.assertEqual(
+            middleware.accepted_encodings("gzip;q=0.5, br;q=0, deflate"), {"gzip", "deflate"}
+        )
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(middleware.choose_encoding("br, gzip"), "gzip")
+            self.assertEqual(middleware.choose_encoding("*"), "gzip")
+            self.assertIsNone(middleware.choose_encoding("br, identity"))
+
+        # Server-Sent Events : jamais compressés
+        events = StreamingHttpResponse(iter([b"data: 1\n\n"]), content_type="text/event-stream")
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = middleware.CompressionMiddleware(lambda request: events)(request)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @skipUnless(find_spec("brotli"), "brotli non installé")
+    def test_brotli(self):
+        import brotli
+
+        plain = self.client.get("/api/tasks/")
+        resp = self.client.get("/api/tasks/", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(resp["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(resp.content), plain.content)
+
+
+class SeedScaleTest(APITestCase):
+    """
+    Jeu de données synthétique (core.seed, commande seed_scale) : tous les
+    statuts de tâche, compteurs cohérents, dates passées, index de recherche
+    rempli.
+    """
+
+    def _seed(self, *args):
+        out = StringIO()
+        call_command(
+            "seed_scale",
+            "--students", "4",
+            "--supervisors", "2",
+            "--projects-per-student", "2",
+            "--tasks-per-project", "15",
+            "--comments-per-project", "3",
+            "--activity-per-project", "5",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_seed(self):
+        output = self._seed()
+        self.assertIn("120 tasks", output)
+        self.assertEqual(User.objects.filter(is_staff=True).count(), 2)
+        self.assertEqual(
+            set(Task.objects.values_list("status", flat=True)), set(Task.Status.values)
+        )
+        self.assertEqual(Comment.objects.count(), 24)
+        self.assertEqual(ActivityLog.objects.count(), 40)
+
+        for project in Project.objects.with_task_counts():
+            self.assertEqual(project.tasks_total, project.annotated_tasks_total)
+            self.assertEqual(project.tasks_done, project.annotated_tasks_done)
+            if project.supervisor_id:
+                self.assertTrue(
+                    project.supervision_requests.filter(
+                        status=SupervisionRequest.Status.ACCEPTED
+                    ).exists()
+                )
+
+        now = timezone.now()
+        for model in (Project, Task, Comment, ActivityLog, SupervisionRequest):
+            self.assertFalse(model.objects.filter(created_at__gt=now).exists(), model)
+        self.assertFalse(Task.objects.filter(updated_at__lt=F("created_at")).exists())
+
+        student = User.objects.get(username="seed-student-0")
+        self.client.force_authenticate(student)
+        resp = self.client.get("/api/search/", {"q": "relire"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.json()["results"])
+
+    def test_same_seed_same_data_and_prefix_reused(self):
+        self._seed("--prefix", "a")
+        self._seed("--prefix", "b")
+        titles = {
+            prefix: list(
+                Task.objects.filter(project__owner__username__startswith=f"{prefix}-")
+                .order_by("id")
+                .values_list("title", "status", "priority")
+            )
+            for prefix in ("a", "b")
+        }
+        self.assertEqual(titles["a"], titles["b"])
+
+        with self.assertRaises(CommandError):
+            self._seed("--prefix", "a")
+        with self.assertRaises(CommandError):
+            self._seed("--prefix", "c", "--students", "-1")
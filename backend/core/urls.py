@@ -1,8 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     current_user,
+    events_token,
+    import_data,
+    project_activity_export,
+    project_tasks_export,
+    search,
     staff_users,
     ProjectActivityViewSet,
     ProjectCommentViewSet,
@@ -19,17 +25,48 @@ router.register(r"tasks", TaskViewSet, basename="tasks")
 
 urlpatterns = [
     path("me/", current_user, name="current-user"),
+    path("events/", async_views.events_stream, name="events"),
+    path("events/token/", events_token, name="events-token"),
+    # Lectures async (à servir par gradely.asgi), mêmes réponses que leurs équivalents DRF
+    path(
+        "async/dashboard/student",
+        async_views.StudentDashboardView.as_view(),
+        name="async-dashboard",
+    ),
+    path("async/projects/", async_views.ProjectListView.as_view(), name="async-project-list"),
+    path(
+        "async/projects/<int:pk>/bundle/",
+        async_views.ProjectBundleView.as_view(),
+        name="async-project-bundle",
+    ),
     path("users/staff/", staff_users, name="staff-users"),
+    path("import/", import_data, name="import"),
+    path("search/", search, name="search"),
     path(
         "projects/<int:project_pk>/activity/",
         ProjectActivityViewSet.as_view({"get": "list"}),
         name="project-activity-list",
     ),
+    path(
+        "projects/<int:project_pk>/activity/export.<str:fmt>",
+        project_activity_export,
+        name="project-activity-export",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/export.<str:fmt>",
+        project_tasks_export,
+        name="project-tasks-export",
+    ),
     path(
         "projects/<int:project_pk>/comments/",
         ProjectCommentViewSet.as_view({"get": "list", "post": "create"}),
         name="project-comments-list",
     ),
+    path(
+        "projects/<int:project_pk>/tasks/",
+        TaskViewSet.as_view({"get": "list"}),
+        name="project-tasks-list",
+    ),
     path(
         "projects/<int:project_pk>/supervision-requests/",
         ProjectSupervisionRequestViewSet.as_view(
@@ -7,16 +7,42 @@ Structure :
 - student_dashboard : endpoint agrégé pour le tableau de bord étudiant
 """
 
-from datetime import date, timedelta
-
-from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import ActivityLog, Comment, Project, SupervisionRequest, Task
+from .bulk import MAX_OPERATIONS, BulkOperationError, apply_task_operations
+from .cache import bump_dashboard_version, cached_dashboard
+from .conditional import ProjectConditionalGetMixin
+from .events import StreamToken, publish_pending_count
+from .export import ACTIVITY_FIELDS, TASK_FIELDS, activity_rows, streaming_export, task_rows
+from .filters import TaskFilterBackend
+from .importer import FORMATS, ImportFailed, guess_format, import_projects
+from .membership import request_membership
+from .models import (
+    ActivityLog,
+    ArchivedActivityLog,
+    Comment,
+    Project,
+    SupervisionRequest,
+    Task,
+)
+from .pagination import (
+    ActivityKeysetPagination,
+    CreatedAtKeysetPagination,
+    UpdatedAtKeysetPagination,
+)
+from .rows import ActivityLogRows, CommentRows, RowListMixin, SupervisionRequestRows
+from .search import DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT
+from .search import KINDS as SEARCH_KINDS
+from .search import search as search_index
 from .services import log_activity
 from .permissions import IsProjectMember, IsProjectOwnerOrSupervisor
 from .serializers import (
@@ -27,33 +53,38 @@ from .serializers import (
     TaskSerializer,
 )
 
-# Constantes pour le dashboard (évite les typos)
-PROJECT_ACTIVE = "active"
-TASK_TODO = "todo"
-TASK_IN_PROGRESS = "in_progress"
-TASK_DONE = "done"
-TASK_BLOCKED = "blocked"
+
+def accessible_projects(user):
+    """Projets dont `user` est owner ou supervisor, derniers modifiés d'abord."""
+    return (
+        Project.objects.filter(Q(owner=user) | Q(supervisor=user))
+        .select_related("owner", "supervisor")
+        .order_by("-updated_at")
+    )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ProjectConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les projets.
 
     Queryset : projets où l'utilisateur est owner OU supervisor.
     Création : owner = request.user automatiquement.
+    Détail et bundle : GET conditionnel (ETag / Last-Modified, voir core.conditional).
     """
 
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsProjectOwnerOrSupervisor]
+    conditional_project_kwarg = "pk"
 
     def get_queryset(self):
-        """Retourne les projets accessibles : ceux dont l'user est owner ou supervisor."""
-        user = self.request.user
-        return (
-            Project.objects.filter(Q(owner=user) | Q(supervisor=user))
-            .select_related("owner", "supervisor")
-            .order_by("-updated_at")
-        )
+        """
+        Retourne les projets accessibles : ceux dont l'user est owner ou supervisor.
+        progress_percent lit les compteurs stockés sur Project : ni jointure ni requête en plus.
+        """
+        return accessible_projects(self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().retrieve, *args, **kwargs)
 
     def perform_create(self, serializer):
         """À la création, owner est forcé à request.user."""
@@ -66,6 +97,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         )
 
     def perform_update(self, serializer):
+        previous_supervisor_id = serializer.instance.supervisor_id
         project = serializer.save()
         log_activity(
             project,
@@ -73,138 +105,345 @@ class ProjectViewSet(viewsets.ModelViewSet):
             ActivityLog.ActionType.PROJECT_UPDATED,
             f"Projet « {project.title} » modifié",
         )
-
-
-class ProjectActivityViewSet(viewsets.ReadOnlyModelViewSet):
+        # L'ancien superviseur ne voit plus le projet dans son tableau de bord
+        bump_dashboard_version(previous_supervisor_id)
+
+    def perform_destroy(self, instance):
+        owner_id, supervisor_id = instance.owner_id, instance.supervisor_id
+        instance.delete()
+        bump_dashboard_version(owner_id, supervisor_id)
+
+    @action(detail=True, methods=["get"])
+    def bundle(self, request, pk=None):
+        return self.conditional_get(request, self._bundle, pk=pk)
+
+    def _bundle(self, request, pk=None):
+        """
+        Tout ce qu'affiche la page projet en un seul aller-retour :
+        projet, tâches, derniers commentaires, dernière activité, demandes de supervision.
+        GET /api/projects/<id>/bundle/?tasks_limit=&comments_limit=&activity_limit=
+
+        Accès vérifié une fois sur le projet ; chaque section est préchargée par
+        une requête (préchargement tronqué), soit 5 requêtes quelle que soit la taille,
+        plus celle des validateurs du GET conditionnel.
+        tasks / comments / activity renvoient un curseur pour continuer avec la
+        liste paginée correspondante (<section>_cursor, null si tout est renvoyé).
+        """
+        from rest_framework.exceptions import ValidationError
+
+        try:
+            limits = bundle_limits(request.query_params)
+        except ValidationError:
+            # Projet invisible : 404, une 400 confirmerait qu'il existe
+            get_object_or_404(self.get_queryset(), pk=pk)
+            raise
+        # Une ligne de plus que la limite pour savoir s'il reste une page
+        prefetches = [
+            Prefetch(
+                relation, queryset=queryset[: limits[section] + 1], to_attr=f"bundle_{section}"
+            )
+            for section, (relation, queryset) in bundle_querysets().items()
+        ]
+        project = get_object_or_404(self.get_queryset().prefetch_related(*prefetches), pk=pk)
+        self.check_object_permissions(request, project)
+        rows = {section: getattr(project, f"bundle_{section}") for section in BUNDLE_LIMITS}
+        return Response(bundle_data(project, rows, limits, self.get_serializer_context()))
+
+
+# Sections du bundle : (paramètre de limite, défaut, maximum)
+BUNDLE_LIMITS = {
+    "tasks": ("tasks_limit", 200, 1000),
+    "comments": ("comments_limit", 20, 100),
+    "activity": ("activity_limit", 20, 100),
+    "supervision_requests": ("supervision_requests_limit", 20, 100),
+}
+
+# Sérialisation et pagination de suite de chaque section
+BUNDLE_SECTIONS = {
+    "tasks": (TaskSerializer, UpdatedAtKeysetPagination),
+    "comments": (CommentSerializer, CreatedAtKeysetPagination),
+    "activity": (ActivityLogSerializer, CreatedAtKeysetPagination),
+    "supervision_requests": (SupervisionRequestSerializer, None),
+}
+
+
+def bundle_limits(params):
+    """Limite de chaque section d'après ?<section>_limit=, bornée au maximum."""
+    from rest_framework.exceptions import ValidationError
+
+    limits = {}
+    for section, (param, default, maximum) in BUNDLE_LIMITS.items():
+        try:
+            value = int(params.get(param, default))
+        except ValueError:
+            raise ValidationError({param: "Entier attendu."})
+        limits[section] = max(0, min(value, maximum))
+    return limits
+
+
+def bundle_querysets():
+    """(relation sur Project, queryset trié non tronqué) de chaque section."""
+    return {
+        "tasks": ("tasks", Task.objects.order_by("-updated_at", "-id")),
+        "comments": (
+            "comments",
+            Comment.objects.select_related("author").order_by("-created_at", "-id"),
+        ),
+        "activity": (
+            "activity_logs",
+            ActivityLog.objects.select_related("actor").order_by("-created_at", "-id"),
+        ),
+        "supervision_requests": (
+            "supervision_requests",
+            SupervisionRequest.objects.select_related(
+                "project", "project__owner", "requested_supervisor"
+            ).order_by("-created_at", "-id"),
+        ),
+    }
+
+
+def bundle_data(project, rows, limits, context):
     """
-    Journal d'activité d'un projet (lecture seule).
-    GET /api/projects/<project_pk>/activity/
+    Corps de réponse du bundle à partir des lignes de chaque section
+    (limite + 1 lignes au plus, la dernière servant à savoir s'il en reste).
+    """
+    data = {"project": ProjectSerializer(project, context=context).data}
+    for section, (serializer_class, pagination_class) in BUNDLE_SECTIONS.items():
+        section_rows = rows[section]
+        limit = limits[section]
+        cursor = None
+        if len(section_rows) > limit:
+            section_rows = section_rows[:limit]
+            if section_rows and pagination_class:
+                paginator = pagination_class()
+                cursor = paginator.encode_cursor(paginator.get_position(section_rows[-1]))
+        data[section] = serializer_class(section_rows, many=True, context=context).data
+        if pagination_class:
+            data[f"{section}_cursor"] = cursor
+    return data
+
+
+class ProjectActivityViewSet(
+    RowListMixin, ProjectConditionalGetMixin, viewsets.ReadOnlyModelViewSet
+):
+    """
+    Journal d'activité d'un projet (lecture seule), paginé par curseur,
+    entrées archivées comprises au-delà des entrées récentes.
+    GET /api/projects/<project_pk>/activity/ (GET conditionnel, lignes values(), voir core.rows)
     """
 
     serializer_class = ActivityLogSerializer
+    row_serializer_class = ActivityLogRows
     permission_classes = [IsAuthenticated]
+    pagination_class = ActivityKeysetPagination
 
     def get_queryset(self):
         project_pk = self.kwargs.get("project_pk")
-        project = Project.objects.filter(pk=project_pk).first()
-        if not project:
+        if not request_membership(self.request).is_member(project_pk):
             return ActivityLog.objects.none()
-        user = self.request.user
-        if project.owner_id != user.id and project.supervisor_id != user.id:
-            return ActivityLog.objects.none()
-        return ActivityLog.objects.filter(project=project).select_related("actor")
+        return ActivityLog.objects.filter(project_id=project_pk).select_related("actor")
+
+    def get_archive_queryset(self):
+        """Entrées archivées (core.retention), lues après les entrées récentes, en lignes values()."""
+        project_pk = self.kwargs.get("project_pk")
+        if not request_membership(self.request).is_member(project_pk):
+            queryset = ArchivedActivityLog.objects.none()
+        else:
+            queryset = ArchivedActivityLog.objects.filter(project_id=project_pk)
+        return self.get_row_serializer().rows(queryset)
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(request, self.list_rows, *args, **kwargs)
 
-class ProjectCommentViewSet(viewsets.ModelViewSet):
+
+class ProjectCommentViewSet(RowListMixin, ProjectConditionalGetMixin, viewsets.ModelViewSet):
     """
-    Commentaires d'un projet.
-    GET, POST /api/projects/<project_pk>/comments/
+    Commentaires d'un projet (liste paginée par curseur, lignes values(), voir core.rows).
+    GET, POST /api/projects/<project_pk>/comments/ (GET conditionnel)
     """
 
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRows
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
     http_method_names = ["get", "post", "head", "options"]
 
     def get_queryset(self):
         project_pk = self.kwargs.get("project_pk")
-        project = Project.objects.filter(pk=project_pk).first()
-        if not project:
-            return Comment.objects.none()
-        user = self.request.user
-        if project.owner_id != user.id and project.supervisor_id != user.id:
+        if not request_membership(self.request).is_member(project_pk):
             return Comment.objects.none()
-        return Comment.objects.filter(project=project).select_related("author")
+        return Comment.objects.filter(project_id=project_pk).select_related("author")
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(request, self.list_rows, *args, **kwargs)
 
     def perform_create(self, serializer):
-        project = Project.objects.get(pk=self.kwargs["project_pk"])
+        # Projet de l'URL ; celui du corps est déjà chargé dans le cas courant
+        project = serializer.validated_data["project"]
+        if project.pk != self.kwargs["project_pk"]:
+            project = get_object_or_404(Project, pk=self.kwargs["project_pk"])
         user = self.request.user
-        if project.owner_id != user.id and project.supervisor_id != user.id:
+        if not request_membership(self.request).remember(project).is_member(project.pk):
             from rest_framework.exceptions import PermissionDenied
 
             raise PermissionDenied("Accès refusé à ce projet.")
-        serializer.save(project=project, author=user)
-        log_activity(
-            project,
-            user,
-            ActivityLog.ActionType.COMMENT_ADDED,
-            f"{user.email} a ajouté un commentaire",
-        )
+        # Commentaire et last_activity_at du projet (ETag) dans la même transaction
+        with transaction.atomic():
+            serializer.save(project=project, author=user)
+            log_activity(
+                project,
+                user,
+                ActivityLog.ActionType.COMMENT_ADDED,
+                f"{user.email} a ajouté un commentaire",
+            )
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ProjectConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet pour les tâches.
 
     Queryset : tâches des projets où l'utilisateur est owner ou supervisor.
+    Liste paginée par curseur (dernières modifications d'abord), filtrable
+    par projet, statut, priorité et échéance (voir core.filters).
+    GET /api/projects/<project_pk>/tasks/ : tâches d'un seul projet.
+    POST /api/tasks/bulk/ : opérations en lot (voir core.bulk).
+    GET /api/tasks/<id>/history/ : historique de la tâche (journal d'activité).
+    Liste limitée à un projet (route imbriquée ou ?project=) : GET conditionnel.
     Création : vérification que le projet appartient à l'user (owner ou supervisor).
     """
 
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsProjectMember]
+    pagination_class = UpdatedAtKeysetPagination
+    filter_backends = [TaskFilterBackend]
 
     def get_queryset(self):
         """Retourne les tâches des projets accessibles à l'utilisateur."""
         user = self.request.user
-        return (
-            Task.objects.filter(
-                Q(project__owner=user) | Q(project__supervisor=user)
-            )
-            .select_related("project")
-            .order_by("-updated_at")
+        queryset = Task.objects.filter(
+            Q(project__owner=user) | Q(project__supervisor=user)
         )
+        project_pk = self.kwargs.get("project_pk")
+        if project_pk is not None:
+            queryset = queryset.filter(project_id=project_pk)
+        return queryset.select_related("project").order_by("-updated_at")
+
+    def get_conditional_project_id(self):
+        project_pk = super().get_conditional_project_id()
+        if project_pk is None:
+            # ?project= invalide : pas de validateur, TaskFilterBackend renverra 400
+            project_pk = self.request.query_params.get("project")
+            if not project_pk or not project_pk.isdigit():
+                return None
+        return project_pk
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().list, *args, **kwargs)
 
     def perform_create(self, serializer):
         """Vérifie que l'utilisateur a accès au projet avant d'ajouter la tâche."""
         project = serializer.validated_data["project"]
         user = self.request.user
-        if project.owner_id != user.id and project.supervisor_id != user.id:
+        if not request_membership(self.request).remember(project).is_member(project.pk):
             from rest_framework.exceptions import PermissionDenied
 
             raise PermissionDenied("Tu ne peux pas ajouter une tâche à ce projet.")
-        task = serializer.save()
-        log_activity(
-            project,
-            user,
-            ActivityLog.ActionType.TASK_CREATED,
-            f"Tâche « {task.title} » créée",
-            {"task_id": task.id},
-        )
+        # Tâche, compteurs du projet et journal dans la même transaction
+        with transaction.atomic():
+            task = serializer.save()
+            log_activity(
+                project,
+                user,
+                ActivityLog.ActionType.TASK_CREATED,
+                f"Tâche « {task.title} » créée",
+                task=task,
+            )
 
     def perform_update(self, serializer):
-        task = serializer.save()
-        log_activity(
-            task.project,
-            self.request.user,
-            ActivityLog.ActionType.TASK_UPDATED,
-            f"Tâche « {task.title} » modifiée",
-            {"task_id": task.id},
+        with transaction.atomic():
+            task = serializer.save()
+            log_activity(
+                task.project,
+                self.request.user,
+                ActivityLog.ActionType.TASK_UPDATED,
+                f"Tâche « {task.title} » modifiée",
+                task=task,
+            )
+
+    def perform_destroy(self, instance):
+        project = instance.project
+        instance.delete()
+        bump_dashboard_version(project.owner_id, project.supervisor_id)
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk=None):
+        """
+        Historique de la tâche : entrées du journal qui la référencent (index
+        task, created_at, id), archivées comprises, paginées par curseur.
+        GET /api/tasks/<id>/history/
+        """
+        task = self.get_object()
+        serializer = ActivityLogRows(context=self.get_serializer_context())
+        paginator = ActivityKeysetPagination(
+            archive_queryset=serializer.rows(ArchivedActivityLog.objects.filter(task=task))
+        )
+        entries = paginator.paginate_queryset(
+            serializer.rows(ActivityLog.objects.filter(task=task)), request, view=self
         )
+        return paginator.get_paginated_response(serializer.data(entries))
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Création, changement de statut, de priorité et suppression de tâches en
+        une requête, tout ou rien. 400 avec les erreurs par opération sinon.
+        """
+        from rest_framework.exceptions import ValidationError
+
+        operations = request.data.get("operations") if hasattr(request.data, "get") else None
+        if not isinstance(operations, list) or not operations:
+            raise ValidationError({"operations": "Liste d'opérations attendue."})
+        if len(operations) > MAX_OPERATIONS:
+            raise ValidationError(
+                {"operations": f"{MAX_OPERATIONS} opérations maximum par requête."}
+            )
+        try:
+            results = apply_task_operations(
+                request.user, operations, request_membership(request)
+            )
+        except BulkOperationError as exc:
+            return Response({"errors": exc.errors}, status=400)
+        return Response({"results": results})
 
 
-class SupervisionRequestViewSet(viewsets.GenericViewSet):
+class SupervisionRequestViewSet(RowListMixin, viewsets.GenericViewSet):
     """
     Demandes de supervision.
-    GET /api/supervision-requests/ : liste des demandes (envoyées par moi ou reçues par moi).
+    GET /api/supervision-requests/ : liste paginée des demandes (envoyées par moi ou reçues
+    par moi), en lignes values() (voir core.rows).
     PATCH /api/supervision-requests/<id>/ : accepter ou refuser (uniquement le prof destinataire).
     """
 
     serializer_class = SupervisionRequestSerializer
+    row_serializer_class = SupervisionRequestRows
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
+        # Sous-requête plutôt que jointure dans le OR : les deux branches portent
+        # sur core_supervisionrequest et chacune utilise son index.
+        owned_projects = Project.objects.filter(owner=user).values("pk")
         return (
             SupervisionRequest.objects.filter(
-                Q(project__owner=user) | Q(requested_supervisor=user)
+                Q(project__in=owned_projects) | Q(requested_supervisor=user)
             )
             .select_related("project", "project__owner", "requested_supervisor")
             .order_by("-created_at")
         )
 
     def list(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_rows(request)
 
     def retrieve(self, request, pk=None):
         req = self.get_queryset().filter(pk=pk).first()
@@ -234,27 +473,30 @@ class SupervisionRequestViewSet(viewsets.GenericViewSet):
         req.status = status
         req.response_message = response_message
         req.responded_at = timezone.now()
-        req.save()
-
-        if status == SupervisionRequest.Status.ACCEPTED:
-            project = req.project
-            project.supervisor_id = req.requested_supervisor_id
-            project.save(update_fields=["supervisor_id", "updated_at"])
-            log_activity(
-                project,
-                request.user,
-                ActivityLog.ActionType.SUPERVISION_REQUEST_ACCEPTED,
-                f"Demande de supervision acceptée par {request.user.email}",
-                {"supervision_request_id": req.id},
-            )
-        else:
-            log_activity(
-                req.project,
-                request.user,
-                ActivityLog.ActionType.SUPERVISION_REQUEST_DECLINED,
-                f"Demande de supervision refusée par {request.user.email}",
-                {"supervision_request_id": req.id},
-            )
+        with transaction.atomic():
+            req.save()
+            publish_pending_count(req.requested_supervisor_id)
+
+            if status == SupervisionRequest.Status.ACCEPTED:
+                project = req.project
+                bump_dashboard_version(project.supervisor_id)
+                project.supervisor_id = req.requested_supervisor_id
+                project.save(update_fields=["supervisor_id", "updated_at"])
+                log_activity(
+                    project,
+                    request.user,
+                    ActivityLog.ActionType.SUPERVISION_REQUEST_ACCEPTED,
+                    f"Demande de supervision acceptée par {request.user.email}",
+                    supervision_request=req,
+                )
+            else:
+                log_activity(
+                    req.project,
+                    request.user,
+                    ActivityLog.ActionType.SUPERVISION_REQUEST_DECLINED,
+                    f"Demande de supervision refusée par {request.user.email}",
+                    supervision_request=req,
+                )
 
         serializer = self.get_serializer(req)
         return Response(serializer.data)
@@ -269,23 +511,21 @@ class SupervisionRequestViewSet(viewsets.GenericViewSet):
         return Response({"count": count})
 
 
-class ProjectSupervisionRequestViewSet(viewsets.GenericViewSet):
+class ProjectSupervisionRequestViewSet(RowListMixin, viewsets.GenericViewSet):
     """
     Demandes de supervision pour un projet.
-    GET /api/projects/<project_pk>/supervision-requests/ : liste des demandes du projet.
+    GET /api/projects/<project_pk>/supervision-requests/ : liste des demandes du projet
+    (lignes values(), voir core.rows).
     POST /api/projects/<project_pk>/supervision-requests/ : envoyer une demande (owner only).
     """
 
     serializer_class = SupervisionRequestSerializer
+    row_serializer_class = SupervisionRequestRows
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         project_pk = self.kwargs.get("project_pk")
-        project = Project.objects.filter(pk=project_pk).first()
-        if not project:
-            return SupervisionRequest.objects.none()
-        user = self.request.user
-        if project.owner_id != user.id and project.supervisor_id != user.id:
+        if not request_membership(self.request).is_member(project_pk):
             return SupervisionRequest.objects.none()
         return (
             SupervisionRequest.objects.filter(project_id=project_pk)
@@ -294,9 +534,7 @@ class ProjectSupervisionRequestViewSet(viewsets.GenericViewSet):
         )
 
     def list(self, request, project_pk=None):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_rows(request, project_pk=project_pk)
 
     def create(self, request, project_pk=None):
         from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -305,7 +543,7 @@ class ProjectSupervisionRequestViewSet(viewsets.GenericViewSet):
         if not project:
             from rest_framework.exceptions import NotFound
             raise NotFound("Projet introuvable.")
-        if project.owner_id != request.user.id:
+        if not request_membership(request).remember(project).is_owner(project.pk):
             raise PermissionDenied("Seul le propriétaire du projet peut demander une supervision.")
 
         serializer = self.get_serializer(data=request.data)
@@ -335,19 +573,21 @@ class ProjectSupervisionRequestViewSet(viewsets.GenericViewSet):
                 {"requested_supervisor": "Une demande en attente existe déjà pour ce superviseur."}
             )
 
-        req = SupervisionRequest.objects.create(
-            project=project,
-            requested_supervisor_id=requested_supervisor_id,
-            message=message,
-            status=SupervisionRequest.Status.PENDING,
-        )
-        log_activity(
-            project,
-            request.user,
-            ActivityLog.ActionType.SUPERVISION_REQUEST_SENT,
-            f"Demande de supervision envoyée à {req.requested_supervisor.email}",
-            {"supervision_request_id": req.id},
-        )
+        with transaction.atomic():
+            req = SupervisionRequest.objects.create(
+                project=project,
+                requested_supervisor_id=requested_supervisor_id,
+                message=message,
+                status=SupervisionRequest.Status.PENDING,
+            )
+            publish_pending_count(requested_supervisor_id)
+            log_activity(
+                project,
+                request.user,
+                ActivityLog.ActionType.SUPERVISION_REQUEST_SENT,
+                f"Demande de supervision envoyée à {req.requested_supervisor.email}",
+                supervision_request=req,
+            )
         serializer = self.get_serializer(req)
         return Response(serializer.data, status=201)
 
@@ -364,6 +604,17 @@ def current_user(request):
     })
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def events_token(request):
+    """
+    Jeton d'ouverture du flux temps réel (GET /api/events/?token=...), valable
+    une minute par défaut : le jeton d'accès ne passe jamais dans l'URL.
+    """
+    token = StreamToken.for_user(request.user)
+    return Response({"token": str(token), "expires_in": int(token.lifetime.total_seconds())})
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def staff_users(request):
@@ -380,124 +631,95 @@ def student_dashboard(request):
     """
     Tableau de bord : résumé des projets (owner ou superviseur), tâches et nudges.
     Inclut les projets dont l'utilisateur est propriétaire ou superviseur.
+    Calculé par core.dashboard en une requête groupée, mis en cache par
+    utilisateur (core.cache).
     """
-    user = request.user
-    today = date.today()
+    return Response(cached_dashboard(request.user))
 
-    # Projets dont l'utilisateur est propriétaire ou superviseur
-    projects = (
-        Project.objects.filter(Q(owner=user) | Q(supervisor=user))
-        .order_by("-updated_at")
-    )
-    tasks = Task.objects.filter(Q(project__owner=user) | Q(project__supervisor=user))
-
-    total_tasks = tasks.count()
-    overdue_tasks = tasks.filter(due_date__lt=today).exclude(status=TASK_DONE).count()
-    blocked_tasks = tasks.filter(status=TASK_BLOCKED).count()
-
-    # Nudges : suggestions d'action pour l'étudiant
-    nudges = []
-
-    # Nudge 1 : tâches bloquées depuis >= 5 jours
-    five_days_ago = timezone.now() - timedelta(days=5)
-    blocked_old = tasks.filter(
-        status=TASK_BLOCKED,
-        blocked_since__isnull=False,
-        blocked_since__lte=five_days_ago,
-    ).count()
-    if blocked_old > 0:
-        nudges.append(
-            {
-                "type": "blocked_stale",
-                "title": "Tâches bloquées trop longtemps",
-                "message": f"{blocked_old} tâche(s) bloquée(s) depuis 5+ jours.",
-                "severity": "warning",
-            }
-        )
 
-    # Nudge 2 : tâches en retard
-    if overdue_tasks > 0:
-        nudges.append(
-            {
-                "type": "overdue",
-                "title": "Tâches en retard",
-                "message": f"{overdue_tasks} tâche(s) en retard.",
-                "severity": "danger",
-            }
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Recherche plein texte (voir core.search) dans les projets accessibles.
+    GET /api/search/?q=<texte>[&type=project|task|comment][&limit=<n>]
+    """
+    from rest_framework.exceptions import ValidationError
+
+    text = request.query_params.get("q", "").strip()
+    if not text:
+        raise ValidationError({"q": "Texte de recherche requis."})
+    kind = request.query_params.get("type") or None
+    if kind is not None and kind not in SEARCH_KINDS:
+        raise ValidationError({"type": "project, task ou comment attendu."})
+    try:
+        limit = int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        raise ValidationError({"limit": "Entier attendu."})
+    if limit < 1:
+        raise ValidationError({"limit": "Entier positif attendu."})
+    return Response({"results": search_index(request.user, text, kind=kind, limit=limit)})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def import_data(request):
+    """
+    Import de projets et de tâches depuis un fichier CSV ou NDJSON (voir core.importer).
+    POST /api/import/ (multipart) : file=<fichier>, format=csv|ndjson (sinon d'après l'extension).
+    Lu en flux ; 201 avec le nombre de projets / tâches créés, 400 avec les erreurs par ligne.
+    """
+    import codecs
+
+    from rest_framework.exceptions import ValidationError
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        raise ValidationError({"file": "Fichier requis."})
+    fmt = request.data.get("format") or guess_format(upload.name)
+    if fmt not in FORMATS:
+        raise ValidationError({"format": "csv ou ndjson attendu."})
+    try:
+        summary = import_projects(
+            codecs.iterdecode(upload, "utf-8-sig"), fmt, request.user, request=request
         )
+    except ImportFailed as exc:
+        return Response({"errors": exc.errors}, status=400)
+    except UnicodeDecodeError:
+        raise ValidationError({"file": "Fichier UTF-8 attendu."})
+    return Response(summary, status=201)
+
+
+def _export(request, project_pk, fmt, rows, fields, name):
+    from rest_framework.exceptions import NotFound
+
+    if fmt not in ("csv", "ndjson") or not request_membership(request).is_member(project_pk):
+        raise NotFound("Projet introuvable.")
+    return streaming_export(
+        rows(project_pk),
+        fields,
+        fmt,
+        f"projet-{project_pk}-{name}",
+        asynchronous=isinstance(request._request, ASGIRequest),
+    )
 
-    # Nudge 3 : trop de tâches en parallèle
-    in_progress_count = tasks.filter(status=TASK_IN_PROGRESS).count()
-    if in_progress_count >= 4:
-        nudges.append(
-            {
-                "type": "too_many_in_progress",
-                "title": "Trop de tâches en parallèle",
-                "message": f"{in_progress_count} tâches en cours.",
-                "severity": "warning",
-            }
-        )
 
-    # Nudge 4 : priorités élevées non commencées
-    high_priority_todo = tasks.filter(status=TASK_TODO, priority__lte=2).count()
-    if high_priority_todo > 0:
-        nudges.append(
-            {
-                "type": "high_priority_todo",
-                "title": "Priorités élevées non commencées",
-                "message": f"{high_priority_todo} tâche(s) prioritaire(s) non commencée(s).",
-                "severity": "danger",
-            }
-        )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def project_activity_export(request, project_pk, fmt):
+    """
+    Journal d'activité complet d'un projet, en flux (voir core.export).
+    GET /api/projects/<project_pk>/activity/export.ndjson | export.csv
+    """
+    return _export(request, project_pk, fmt, activity_rows, ACTIVITY_FIELDS, "activite")
 
-    # Nudge 5 : risque de retard (deadline proche + progression faible)
-    urgent_projects = []
-    for p in projects:
-        if p.end_date:
-            days_left = (p.end_date - today).days
-            if 0 <= days_left <= 10 and p.progress_percent < 60:
-                urgent_projects.append((p.id, p.title, days_left, p.progress_percent))
-    if urgent_projects:
-        urgent_projects = urgent_projects[:3]
-        msg_parts = [f"{t} ({d} j, {pr}%)" for (_, t, d, pr) in urgent_projects]
-        nudges.append(
-            {
-                "type": "deadline_risk",
-                "title": "Risque de retard sur échéance",
-                "message": "Projets à risque: " + " | ".join(msg_parts),
-                "severity": "danger",
-            }
-        )
 
-    return Response(
-        {
-            "summary": {
-                "total_projects": projects.count(),
-                "active_projects": projects.filter(status=PROJECT_ACTIVE).count(),
-                "total_tasks": total_tasks,
-                "overdue_tasks": overdue_tasks,
-                "blocked_tasks": blocked_tasks,
-                "in_progress_tasks": in_progress_count,
-                "high_priority_todo": high_priority_todo,
-            },
-            "projects": [
-                {
-                    "id": p.id,
-                    "title": p.title,
-                    "status": p.status,
-                    "start_date": p.start_date,
-                    "end_date": p.end_date,
-                    "progress": p.progress_percent,
-                    "tasks_total": p.tasks.count(),
-                    "tasks_done": p.tasks.filter(status=TASK_DONE).count(),
-                    "tasks_overdue": p.tasks.filter(due_date__lt=today)
-                    .exclude(status=TASK_DONE)
-                    .count(),
-                    "tasks_blocked": p.tasks.filter(status=TASK_BLOCKED).count(),
-                    "last_activity_at": p.updated_at,
-                }
-                for p in projects
-            ],
-            "nudges": nudges,
-        }
-    )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def project_tasks_export(request, project_pk, fmt):
+    """
+    Toutes les tâches d'un projet, en flux (voir core.export).
+    GET /api/projects/<project_pk>/tasks/export.ndjson | export.csv
+    """
+    return _export(request, project_pk, fmt, task_rows, TASK_FIELDS, "taches")
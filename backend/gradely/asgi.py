@@ -3,6 +3,10 @@ ASGI config for gradely project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Required for the Server-Sent Events stream (/api/events/, core.events), which
+returns 501 under WSGI, and serves the async reads under /api/async/
+(core.async_views). Example: uvicorn gradely.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -0,0 +1,112 @@
+"""
+Profils de base de données, choisis par variables d'environnement.
+
+DB_PROFILE :
+- "sqlite" (défaut) : fichier SQLite réglé pour les écritures concurrentes.
+  Sur chaque connexion : journal WAL (lecteurs et écrivain ne se bloquent
+  plus), synchronous=NORMAL (sûr en WAL, un fsync par checkpoint et non par
+  commit), mmap_size, cache_size ; attente de SQLITE_BUSY_TIMEOUT secondes
+  sur un verrou au lieu d'échouer ("database is locked"), et transactions
+  BEGIN IMMEDIATE pour que le verrou d'écriture soit pris dès le début
+  (sinon une lecture promue en écriture échoue sans attendre).
+- "sqlite-basic" : SQLite sans réglage (ancien comportement, comparaison).
+- "postgres" : PostgreSQL (psycopg 3). Pool de connexions si DB_POOL=1
+  (psycopg[pool]), sinon connexions persistantes (DB_CONN_MAX_AGE) vérifiées
+  avant réutilisation.
+
+Variables :
+  SQLITE_PATH, SQLITE_MMAP_SIZE (octets), SQLITE_CACHE_SIZE (Kio),
+  SQLITE_BUSY_TIMEOUT (secondes)
+  POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT
+  DB_CONN_MAX_AGE (secondes), DB_POOL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ("sqlite", "sqlite-basic", "postgres")
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_CACHE_SIZE = 64 * 1024
+SQLITE_BUSY_TIMEOUT = 20
+
+
+def _int(env, name, default):
+    value = env.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} doit être un entier (reçu {value!r}).")
+
+
+def _flag(env, name):
+    return env.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def sqlite_pragmas(mmap_size=SQLITE_MMAP_SIZE, cache_size=SQLITE_CACHE_SIZE):
+    """Script exécuté à l'ouverture de chaque connexion SQLite."""
+    return (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        f"PRAGMA mmap_size={mmap_size};"
+        # Négatif : taille en Kio plutôt qu'en pages
+        f"PRAGMA cache_size=-{cache_size};"
+    )
+
+
+def sqlite_config(env, base_dir, tuned=True):
+    config = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env.get("SQLITE_PATH") or base_dir / "db.sqlite3",
+    }
+    if tuned:
+        config["OPTIONS"] = {
+            "init_command": sqlite_pragmas(
+                _int(env, "SQLITE_MMAP_SIZE", SQLITE_MMAP_SIZE),
+                _int(env, "SQLITE_CACHE_SIZE", SQLITE_CACHE_SIZE),
+            ),
+            "timeout": _int(env, "SQLITE_BUSY_TIMEOUT", SQLITE_BUSY_TIMEOUT),
+            "transaction_mode": "IMMEDIATE",
+        }
+    return config
+
+
+def postgres_config(env):
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.get("POSTGRES_DB", "gradely"),
+        "USER": env.get("POSTGRES_USER", "gradely"),
+        "PASSWORD": env.get("POSTGRES_PASSWORD", ""),
+        "HOST": env.get("POSTGRES_HOST", "localhost"),
+        "PORT": env.get("POSTGRES_PORT", "5432"),
+        "OPTIONS": {},
+    }
+    if _flag(env, "DB_POOL"):
+        # Le pool remplace les connexions persistantes (incompatibles avec lui)
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = {
+            "min_size": _int(env, "DB_POOL_MIN_SIZE", 2),
+            "max_size": _int(env, "DB_POOL_MAX_SIZE", 10),
+        }
+    else:
+        config["CONN_MAX_AGE"] = _int(env, "DB_CONN_MAX_AGE", 60)
+        config["CONN_HEALTH_CHECKS"] = True
+    return config
+
+
+def database_config(env=None, base_dir=None):
+    """Entrée DATABASES["default"] du profil DB_PROFILE."""
+    env = os.environ if env is None else env
+    profile = env.get("DB_PROFILE", "sqlite")
+    if profile == "sqlite":
+        return sqlite_config(env, base_dir)
+    if profile == "sqlite-basic":
+        return sqlite_config(env, base_dir, tuned=False)
+    if profile == "postgres":
+        return postgres_config(env)
+    raise ImproperlyConfigured(
+        f"DB_PROFILE inconnu : {profile!r} (attendu : {', '.join(PROFILES)})."
+    )
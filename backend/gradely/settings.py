@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
+from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -50,12 +55,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Avant les middlewares qui lisent le corps : compresse en dernier
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ActivityBufferMiddleware",
 ]
 
 ROOT_URLCONF = "gradely.urls"
@@ -80,15 +88,45 @@ WSGI_APPLICATION = "gradely.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# Profil choisi par DB_PROFILE (sqlite, sqlite-basic, postgres) : voir gradely.database
 
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(base_dir=BASE_DIR),
 }
 
 
+# Cache (tableau de bord par utilisateur, voir core.cache) : mémoire locale
+# par défaut, fichiers si DJANGO_CACHE_DIR est défini (partagé entre workers).
+if os.environ.get("DJANGO_CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["DJANGO_CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+DASHBOARD_CACHE_TIMEOUT = 300  # secondes
+DASHBOARD_STALE_TIMEOUT = 3600
+
+# Journal d'activité (core.activity) : écrit en lot au commit ; True pour
+# revenir à un INSERT immédiat par entrée.
+ACTIVITY_LOG_SYNC = False
+ACTIVITY_LOG_BUFFER_SIZE = 500
+# Entrées plus anciennes déplacées vers l'archive (commande archive_activity)
+ACTIVITY_LOG_RETENTION_DAYS = 365
+
+# Flux temps réel (core.events, /api/events/ sous ASGI)
+EVENTS_HEARTBEAT = 15  # secondes entre deux commentaires de maintien
+EVENTS_BACKLOG = 1000  # événements gardés pour la reprise (Last-Event-ID)
+EVENTS_TOKEN_LIFETIME = timedelta(minutes=1)  # jeton d'ouverture du flux (?token=)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -135,17 +173,40 @@ AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # JSON par orjson (mêmes octets que DRF) ; MessagePack si installé, via Accept
+    # (voir core.renderers)
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        *(("core.renderers.MessagePackRenderer",) if find_spec("msgpack") else ()),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.renderers.ORJSONParser",
+        *(("core.renderers.MessagePackParser",) if find_spec("msgpack") else ()),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 # SimpleJWT : durée de vie des tokens (évite "Given token not valid for any token type")
-from datetime import timedelta
-
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),  # 1 h (défaut SimpleJWT = 5 min)
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
+
+# Compression des réponses (core.middleware.CompressionMiddleware) : taille
+# minimale du corps, en octets
+COMPRESSION_MIN_SIZE = 1024
+
+# Authentification (accounts.authentication) : jetons vérifiés gardés en
+# mémoire, utilisateur lu dans le cache (invalidé à chaque User.save)
+JWT_TOKEN_CACHE_SIZE = 1024
+# None : cache des utilisateurs seulement si CACHES est partagé entre workers
+# (DJANGO_CACHE_DIR), une invalidation devant atteindre tous les processus
+AUTH_USER_CACHE = None
+AUTH_USER_CACHE_TIMEOUT = 60  # secondes
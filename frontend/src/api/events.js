@@ -0,0 +1,94 @@
+/**
+ * Événements temps réel (Server-Sent Events) : GET /api/events/
+ * - une seule connexion EventSource partagée par toute l'application
+ * - subscribe(type, handler) : "pending_count", "activity" ou "reset"
+ *   ("reset" : reprise impossible, recharger les données affichées)
+ * - EventSource ne peut pas envoyer d'en-tête Authorization : jeton de flux
+ *   d'une minute (POST /api/events/token/) en paramètre, jamais le jeton d'accès
+ * - reconnexion avec le dernier id reçu (reprise sans perte côté serveur) ;
+ *   si le serveur ne fournit pas le flux (WSGI), nouvelles tentatives espacées
+ */
+
+import api from "./axios.js";
+import { getAccessToken } from "./auth.js";
+
+const EVENT_TYPES = ["pending_count", "activity", "reset"];
+const MIN_RETRY_MS = 5000;
+const MAX_RETRY_MS = 5 * 60 * 1000;
+
+const listeners = new Map();
+let source = null;
+let lastEventId = null;
+let retryTimer = null;
+let retryDelay = MIN_RETRY_MS;
+let connecting = false;
+
+function dispatch(type, event) {
+  if (event.lastEventId) lastEventId = event.lastEventId;
+  let data = null;
+  try {
+    data = JSON.parse(event.data);
+  } catch {
+    return;
+  }
+  listeners.get(type)?.forEach((handler) => handler(data));
+}
+
+function scheduleRetry() {
+  retryTimer = setTimeout(connect, retryDelay);
+  retryDelay = Math.min(retryDelay * 2, MAX_RETRY_MS);
+}
+
+async function connect() {
+  retryTimer = null;
+  if (!getAccessToken()) return;
+  let token;
+  connecting = true;
+  try {
+    ({ data: { token } } = await api.post("/api/events/token/"));
+  } catch {
+    if (hasListeners()) scheduleRetry();
+    return;
+  } finally {
+    connecting = false;
+  }
+  // Désabonné pendant la demande de jeton
+  if (!hasListeners()) return;
+  const params = new URLSearchParams({ token });
+  if (lastEventId) params.set("last_event_id", lastEventId);
+  source = new EventSource(`${api.defaults.baseURL}/api/events/?${params}`);
+  source.onopen = () => {
+    retryDelay = MIN_RETRY_MS;
+  };
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => dispatch(type, event));
+  });
+  source.onerror = () => {
+    // Fermée définitivement (jeton de flux expiré, 501...) : on rouvre avec un nouveau jeton
+    if (source?.readyState === EventSource.CLOSED) {
+      source = null;
+      scheduleRetry();
+    }
+  };
+}
+
+function disconnect() {
+  if (retryTimer) clearTimeout(retryTimer);
+  retryTimer = null;
+  source?.close();
+  source = null;
+}
+
+function hasListeners() {
+  return [...listeners.values()].some((set) => set.size > 0);
+}
+
+export function subscribe(type, handler) {
+  if (!listeners.has(type)) listeners.set(type, new Set());
+  listeners.get(type).add(handler);
+  if (!source && !retryTimer && !connecting) connect();
+  return () => {
+    listeners.get(type)?.delete(handler);
+    if (!hasListeners()) disconnect();
+  };
+}
@@ -0,0 +1,39 @@
+/**
+ * Listes paginées par curseur : l'API renvoie { next, results }.
+ * - fetchPage : une page (cursor = null pour la première)
+ * - fetchAllPages : suit les curseurs jusqu'à la fin (listes courtes uniquement),
+ *   éventuellement à partir d'un curseur déjà obtenu (ex. bundle du projet)
+ * Le curseur est extrait de l'URL "next" pour rester sur le même baseURL / proxy.
+ */
+
+import api from "./axios.js";
+
+function cursorFromNext(next) {
+  if (!next) return null;
+  try {
+    return new URL(next, window.location.origin).searchParams.get("cursor");
+  } catch {
+    return null;
+  }
+}
+
+export async function fetchPage(url, { cursor = null, params = {} } = {}) {
+  const { data } = await api.get(url, {
+    params: cursor ? { ...params, cursor } : params,
+  });
+  return {
+    results: Array.isArray(data?.results) ? data.results : [],
+    nextCursor: cursorFromNext(data?.next),
+  };
+}
+
+export async function fetchAllPages(url, { cursor: startCursor = null, params = {} } = {}) {
+  const items = [];
+  let cursor = startCursor;
+  do {
+    const page = await fetchPage(url, { cursor, params });
+    items.push(...page.results);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+}
@@ -1,10 +1,12 @@
 /**
  * Liste du journal d'activité d'un projet.
+ * Paginée : onLoadMore charge la page suivante tant que hasMore est vrai.
  */
 
 import { Activity } from "lucide-react";
 import Card from "./Card.jsx";
 import EmptyStateCard from "./ui/EmptyStateCard.jsx";
+import LoadMoreButton from "./ui/LoadMoreButton.jsx";
 
 const ACTION_LABELS = {
   project_created: "Projet créé",
@@ -39,7 +41,15 @@ function getActorRole(actorId, ownerId, supervisorId) {
   return null;
 }
 
-export default function ActivityFeed({ items, loading, ownerId, supervisorId }) {
+export default function ActivityFeed({
+  items,
+  loading,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
+  ownerId,
+  supervisorId,
+}) {
   if (loading) {
     return (
       <div className="text-graphite-500 text-sm py-4">Chargement...</div>
@@ -94,6 +104,7 @@ export default function ActivityFeed({ items, loading, ownerId, supervisorId })
           </div>
         );
       })}
+      <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={onLoadMore} />
     </div>
   );
 }
@@ -1,10 +1,12 @@
 /**
  * Liste des commentaires + formulaire d'ajout.
+ * Paginée : onLoadMore charge la page suivante tant que hasMore est vrai.
  */
 
 import { useState } from "react";
 import Card from "./Card.jsx";
 import EmptyStateCard from "./ui/EmptyStateCard.jsx";
+import LoadMoreButton from "./ui/LoadMoreButton.jsx";
 import { desola } from "../assets/images/index.js";
 
 function formatDate(iso) {
@@ -31,6 +33,9 @@ export default function CommentList({
   loading,
   onAdd,
   onRefresh,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
   ownerId,
   supervisorId,
 }) {
@@ -110,6 +115,7 @@ export default function CommentList({
             );
           })
         )}
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={onLoadMore} />
       </div>
     </div>
   );
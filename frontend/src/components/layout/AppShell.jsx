@@ -8,6 +8,7 @@ import { LayoutDashboard, FolderPlus, Bell, LogOut } from "lucide-react";
 import { useState, useEffect } from "react";
 import api from "../../api/axios.js";
 import { logout } from "../../api/auth.js";
+import { subscribe } from "../../api/events.js";
 import Logo from "../ui/Logo.jsx";
 
 export default function AppShell({ children }) {
@@ -26,6 +27,12 @@ export default function AppShell({ children }) {
     }).catch(() => setUser(null));
   }, []);
 
+  // Mises à jour du compteur poussées par le serveur (SSE) au lieu d'un re-fetch
+  useEffect(() => {
+    if (!user?.is_staff) return undefined;
+    return subscribe("pending_count", (data) => setPendingSupervisionCount(data?.count ?? 0));
+  }, [user?.is_staff]);
+
   const navItems = [
     { to: "/dashboard", icon: LayoutDashboard, label: "Dashboard" },
     { to: "/projects/new", icon: FolderPlus, label: "Nouveau projet" },
@@ -0,0 +1,17 @@
+/**
+ * Bouton « Charger plus » pour les listes paginées par curseur.
+ * N'affiche rien s'il n'y a plus de page à charger.
+ */
+
+import Button from "./Button.jsx";
+
+export default function LoadMoreButton({ hasMore, loading = false, onClick, className = "" }) {
+  if (!hasMore) return null;
+  return (
+    <div className={`flex justify-center ${className}`}>
+      <Button variant="secondary" onClick={onClick} disabled={loading}>
+        {loading ? "Chargement..." : "Charger plus"}
+      </Button>
+    </div>
+  );
+}
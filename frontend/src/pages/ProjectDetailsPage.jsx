@@ -9,6 +9,8 @@ import { Link, useNavigate, useParams } from "react-router-dom";
 import { ArrowLeft, ClipboardList, MessageSquare, Activity } from "lucide-react";
 import api from "../api/axios.js";
 import { logout } from "../api/auth.js";
+import { subscribe } from "../api/events.js";
+import { fetchAllPages, fetchPage } from "../api/pagination.js";
 import Card from "../components/Card.jsx";
 import Badge from "../components/ui/Badge.jsx";
 import SectionTitle from "../components/ui/SectionTitle.jsx";
@@ -43,7 +45,10 @@ export default function ProjectDetailsPage() {
   const [tasks, setTasks] = useState([]);
   const [currentUser, setCurrentUser] = useState(null);
   const [comments, setComments] = useState([]);
+  const [commentsCursor, setCommentsCursor] = useState(null);
   const [activity, setActivity] = useState([]);
+  const [activityCursor, setActivityCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [activeTab, setActiveTab] = useState("overview");
@@ -76,8 +81,10 @@ export default function ProjectDetailsPage() {
 
   async function fetchTasks() {
     try {
-      const { data } = await api.get("/api/tasks/");
-      setTasks(data.filter((t) => t.project === parseInt(id)));
+      const data = await fetchAllPages(`/api/projects/${id}/tasks/`, {
+        params: { page_size: 200 },
+      });
+      setTasks(data);
     } catch {
       setTasks([]);
     }
@@ -94,19 +101,47 @@ export default function ProjectDetailsPage() {
 
   async function fetchComments() {
     try {
-      const { data } = await api.get(`/api/projects/${id}/comments/`);
-      setComments(data);
+      const page = await fetchPage(`/api/projects/${id}/comments/`);
+      setComments(page.results);
+      setCommentsCursor(page.nextCursor);
     } catch {
       setComments([]);
+      setCommentsCursor(null);
     }
   }
 
   async function fetchActivity() {
     try {
-      const { data } = await api.get(`/api/projects/${id}/activity/`);
-      setActivity(data);
+      const page = await fetchPage(`/api/projects/${id}/activity/`);
+      setActivity(page.results);
+      setActivityCursor(page.nextCursor);
     } catch {
       setActivity([]);
+      setActivityCursor(null);
+    }
+  }
+
+  async function loadMoreComments() {
+    if (!commentsCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(`/api/projects/${id}/comments/`, { cursor: commentsCursor });
+      setComments((prev) => [...prev, ...page.results]);
+      setCommentsCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
+  async function loadMoreActivity() {
+    if (!activityCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(`/api/projects/${id}/activity/`, { cursor: activityCursor });
+      setActivity((prev) => [...prev, ...page.results]);
+      setActivityCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(false);
     }
   }
 
@@ -119,17 +154,42 @@ export default function ProjectDetailsPage() {
     }
   }
 
+  // Chargement initial : un seul aller-retour (GET /api/projects/<id>/bundle/)
+  async function fetchBundle() {
+    try {
+      const { data } = await api.get(`/api/projects/${id}/bundle/`);
+      setProject(data.project);
+      setComments(data.comments);
+      setCommentsCursor(data.comments_cursor);
+      setActivity(data.activity);
+      setActivityCursor(data.activity_cursor);
+      setSupervisionRequests(data.supervision_requests);
+      if (data.tasks_cursor) {
+        const rest = await fetchAllPages(`/api/projects/${id}/tasks/`, {
+          cursor: data.tasks_cursor,
+          params: { page_size: 200 },
+        });
+        setTasks([...data.tasks, ...rest]);
+      } else {
+        setTasks(data.tasks);
+      }
+    } catch (err) {
+      if (err.response?.status === 401) {
+        logout();
+        navigate("/login", { replace: true });
+      } else if (err.response?.status === 404) {
+        setError("Projet introuvable.");
+      } else {
+        setError("Erreur lors du chargement.");
+      }
+      setProject(null);
+    }
+  }
+
   async function fetchAll() {
     setLoading(true);
     setError("");
-    await Promise.all([
-      fetchProject(),
-      fetchTasks(),
-      fetchCurrentUser(),
-      fetchComments(),
-      fetchActivity(),
-      fetchSupervisionRequests(),
-    ]);
+    await Promise.all([fetchBundle(), fetchCurrentUser()]);
     setLoading(false);
   }
 
@@ -137,6 +197,21 @@ export default function ProjectDetailsPage() {
     if (id) fetchAll();
   }, [id]);
 
+  // Nouvelles entrées du journal poussées par le serveur (SSE)
+  useEffect(() => {
+    if (!id) return undefined;
+    const projectId = parseInt(id, 10);
+    const unsubscribeActivity = subscribe("activity", (entry) => {
+      if (entry?.project !== projectId) return;
+      setActivity((prev) => (prev.some((a) => a.id === entry.id) ? prev : [entry, ...prev]));
+    });
+    const unsubscribeReset = subscribe("reset", () => fetchBundle());
+    return () => {
+      unsubscribeActivity();
+      unsubscribeReset();
+    };
+  }, [id]);
+
   async function handleAddComment(content) {
     await api.post(`/api/projects/${id}/comments/`, { content });
     showSuccess("Commentaire ajouté.");
@@ -422,6 +497,9 @@ export default function ProjectDetailsPage() {
             loading={false}
             onAdd={handleAddComment}
             onRefresh={fetchComments}
+            hasMore={!!commentsCursor}
+            loadingMore={loadingMore}
+            onLoadMore={loadMoreComments}
             ownerId={ownerId}
             supervisorId={supervisorId}
           />
@@ -431,6 +509,9 @@ export default function ProjectDetailsPage() {
           <ActivityFeed
             items={activity}
             loading={false}
+            hasMore={!!activityCursor}
+            loadingMore={loadingMore}
+            onLoadMore={loadMoreActivity}
             ownerId={ownerId}
             supervisorId={supervisorId}
           />
@@ -7,7 +7,9 @@ import { useEffect, useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import api from "../api/axios.js";
 import { logout } from "../api/auth.js";
+import { fetchPage } from "../api/pagination.js";
 import Card from "../components/Card.jsx";
+import LoadMoreButton from "../components/ui/LoadMoreButton.jsx";
 
 const STATUS_LABELS = {
   pending: "En attente",
@@ -17,7 +19,9 @@ const STATUS_LABELS = {
 
 export default function SupervisionRequestsPage() {
   const [requests, setRequests] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
   const [respondingId, setRespondingId] = useState(null);
   const [declineMessage, setDeclineMessage] = useState("");
@@ -29,8 +33,9 @@ export default function SupervisionRequestsPage() {
     setLoading(true);
     setError("");
     try {
-      const { data } = await api.get("/api/supervision-requests/");
-      setRequests(Array.isArray(data) ? data : []);
+      const page = await fetchPage("/api/supervision-requests/");
+      setRequests(page.results);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       if (err.response?.status === 401) {
         logout();
@@ -39,11 +44,26 @@ export default function SupervisionRequestsPage() {
         setError("Impossible de charger les demandes.");
       }
       setRequests([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   }
 
+  async function loadMoreRequests() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage("/api/supervision-requests/", { cursor: nextCursor });
+      setRequests((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch {
+      setError("Impossible de charger les demandes.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   useEffect(() => {
     fetchRequests();
   }, []);
@@ -216,6 +236,12 @@ export default function SupervisionRequestsPage() {
                 </p>
               </Card>
             )}
+
+            <LoadMoreButton
+              hasMore={!!nextCursor}
+              loading={loadingMore}
+              onClick={loadMoreRequests}
+            />
           </div>
         )}
       </main>